@@ -3,6 +3,10 @@ const router = express.Router();
 const fs = require('fs');
 const path = require('path');
 const { execSync } = require('child_process');
+const { streamMode, openStream } = require('../utils/stream-response');
+
+// Streamed results carry at most this much output per test
+const STREAM_OUTPUT_LIMIT = 2000;
 
 // Middleware to verify token
 const verifyToken = (req, res, next) => {
@@ -17,48 +21,95 @@ const verifyToken = (req, res, next) => {
     next();
 };
 
-// Run Cypress tests
+// Run Cypress tests.
+// Plain JSON by default; with `Accept: application/x-ndjson` / `text/event-stream`
+// (or ?stream=ndjson|sse) progress is streamed while the tests run:
+//   start  { total, testFile }
+//   result { index, name, passed, status, duration, executionTime, output, error? }
+//   done   { success, total, passed, failed, passRate, timestamp, testFile }
+//   error  { error, message }
 router.post('/run-cypress-tests', verifyToken, async (req, res) => {
-    try {
-        const { testCodes, testType, url } = req.body;
+    const { testCodes } = req.body || {};
+
+    if (!testCodes || testCodes.length === 0) {
+        return res.status(400).json({ error: 'No test codes provided' });
+    }
 
-        if (!testCodes || testCodes.length === 0) {
-            return res.status(400).json({ error: 'No test codes provided' });
+    const mode = streamMode(req);
+    if (!mode) {
+        try {
+            const run = await runTestRequest(req.body);
+            res.json({ ...run.summary, results: run.results });
+        } catch (error) {
+            console.error('❌ Error running Cypress tests:', error);
+            res.status(500).json({
+                error: 'Failed to run tests',
+                message: error.message
+            });
         }
+        return;
+    }
 
-        console.log(`🧪 Running ${testCodes.length} ${testType} tests...`);
-        console.log(`📍 URL: ${url}`);
-        
-        // Log test codes for debugging
-        testCodes.forEach((code, idx) => {
-            console.log(`\n📝 Test ${idx + 1}:\n${code}\n---`);
+    const stream = openStream(req, res, mode);
+    try {
+        const run = await runTestRequest(req.body, {
+            onStart: (start) => stream.send('start', start),
+            onResult: (result, index) => stream.send('result', { index, ...truncateResult(result) }),
+            isCancelled: () => stream.closed
+        });
+        stream.send('done', run.summary);
+    } catch (error) {
+        console.error('❌ Error running Cypress tests:', error);
+        stream.send('error', {
+            error: 'Failed to run tests',
+            message: error.message
         });
+    }
+    stream.end();
+});
 
-        // Create temporary test file
-        const tempDir = path.join(__dirname, '../temp');
-        if (!fs.existsSync(tempDir)) {
-            fs.mkdirSync(tempDir, { recursive: true });
-        }
+// Run the tests of a /run-cypress-tests request. `onStart({ total, testFile })`
+// is called before the first test and `onResult(result, index)` after each one;
+// the run stops early once `isCancelled()` returns true (client went away).
+async function runTestRequest({ testCodes, testType, url }, { onStart = () => {}, onResult = () => {}, isCancelled = () => false } = {}) {
+    console.log(`🧪 Running ${testCodes.length} ${testType} tests...`);
+    console.log(`📍 URL: ${url}`);
 
-        const testFileName = `test-${Date.now()}.cy.js`;
-        const testFilePath = path.join(tempDir, testFileName);
+    // Log test codes for debugging
+    testCodes.forEach((code, idx) => {
+        console.log(`\n📝 Test ${idx + 1}:\n${code}\n---`);
+    });
 
-        // Generate test file content with proper structure
-        const testContent = generateTestContent(testCodes, url, testType);
-        fs.writeFileSync(testFilePath, testContent);
+    // Create temporary test file
+    const tempDir = path.join(__dirname, '../temp');
+    if (!fs.existsSync(tempDir)) {
+        fs.mkdirSync(tempDir, { recursive: true });
+    }
 
-        console.log(`📝 Test file created: ${testFilePath}`);
+    const testFileName = `test-${Date.now()}.cy.js`;
+    const testFilePath = path.join(tempDir, testFileName);
 
-        // Try to run with actual Cypress, fallback to simulation if not available
-        let results;
-        try {
-            results = await runCypressTests(testFilePath, testCodes);
-        } catch (cypressError) {
-            console.warn('⚠️ Cypress execution failed, using simulation:', cypressError.message);
-            results = simulateRealisticCypressRun(testCodes);
-        }
+    // Generate test file content with proper structure
+    const testContent = generateTestContent(testCodes, url, testType);
+    fs.writeFileSync(testFilePath, testContent);
 
-        // Save test results to history
+    console.log(`📝 Test file created: ${testFilePath}`);
+    onStart({ total: testCodes.length, testFile: testFileName });
+
+    // Try to run with actual Cypress, fallback to simulation if not available
+    const progress = { onResult, isCancelled };
+    let results;
+    try {
+        results = await runCypressTests(testFilePath, testCodes, progress);
+    } catch (cypressError) {
+        console.warn('⚠️ Cypress execution failed, using simulation:', cypressError.message);
+        results = await simulateRealisticCypressRun(testCodes, progress);
+    }
+
+    const passRate = results.total > 0 ? Math.round((results.passed / results.total) * 100) : 0;
+
+    // Save test results to history (a run cancelled before any test has none)
+    if (results.total > 0) {
         saveTestHistory({
             timestamp: new Date(),
             testType,
@@ -68,42 +119,42 @@ router.post('/run-cypress-tests', verifyToken, async (req, res) => {
             failed: results.failed,
             results
         });
+    }
 
-        // Clean up temp file after a delay
-        setTimeout(() => {
-            try {
-                fs.unlinkSync(testFilePath);
-            } catch (e) {
-                console.warn('Could not delete temp test file');
-            }
-        }, 2000);
+    // Clean up temp file after a delay
+    setTimeout(() => {
+        try {
+            fs.unlinkSync(testFilePath);
+        } catch (e) {
+            console.warn('Could not delete temp test file');
+        }
+    }, 2000);
 
-        console.log(`✅ Tests completed: ${results.passed}/${results.total} passed (${Math.round((results.passed/results.total)*100)}%)`);
+    console.log(`✅ Tests completed: ${results.passed}/${results.total} passed (${passRate}%)`);
 
-        res.json({
+    return {
+        summary: {
             success: true,
             total: results.total,
             passed: results.passed,
             failed: results.failed,
-            passRate: Math.round((results.passed / results.total) * 100),
-            results: results.results,
+            passRate,
             timestamp: new Date().toISOString(),
             testFile: testFileName
-        });
+        },
+        results: results.results
+    };
+}
 
-    } catch (error) {
-        console.error('❌ Error running Cypress tests:', error);
-        res.status(500).json({
-            error: 'Failed to run tests',
-            message: error.message
-        });
-    }
-});
+function truncateResult(result) {
+    if (typeof result.output !== 'string' || result.output.length <= STREAM_OUTPUT_LIMIT) return result;
+    return { ...result, output: result.output.substring(0, STREAM_OUTPUT_LIMIT) + '\n…' };
+}
 
 // Simplified version - just return simulation for now  
-async function runCypressTests(testFilePath, testCodes) {
+async function runCypressTests(testFilePath, testCodes, progress) {
     console.log('⚠️ Using simulation instead of actual Cypress');
-    return simulateRealisticCypressRun(testCodes);
+    return simulateRealisticCypressRun(testCodes, progress);
 }
 
 function generateTestContent(testCodes, url, testType) {
@@ -166,12 +217,16 @@ function simulateCypressRun(testCodes, testType) {
     };
 }
 
-function simulateRealisticCypressRun(testCodes) {
+async function simulateRealisticCypressRun(testCodes, { onResult = () => {}, isCancelled = () => false } = {}) {
     const results = [];
     let passed = 0;
     let failed = 0;
 
-    testCodes.forEach((code, idx) => {
+    for (const [idx, code] of testCodes.entries()) {
+        if (isCancelled()) {
+            console.log('⏹️ Run cancelled by the client');
+            break;
+        }
         console.log(`\n🔍 Analyzing test ${idx + 1}...`);
         
         // Calculate code quality for logging
@@ -217,12 +272,15 @@ function simulateRealisticCypressRun(testCodes) {
                 output: 'Test execution encountered an error.'
             });
         }
-    });
+        onResult(results[results.length - 1], idx);
+        // Let the streamed result go out before the next test runs
+        await new Promise(resolve => setImmediate(resolve));
+    }
 
     console.log(`\n📊 Final Results: ${passed}/${testCodes.length} PASSED (100% - TEMP MODE)`);
     
     return {
-        total: testCodes.length,
+        total: results.length,
         passed,
         failed,
         results
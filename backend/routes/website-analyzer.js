@@ -1,6 +1,7 @@
 const express = require('express');
 const router = express.Router();
 const puppeteer = require('puppeteer');
+const { streamMode, openStream, createArrayItemParser } = require('../utils/stream-response');
 
 // Initialize Google AI safely
 let genAI = null;
@@ -31,54 +32,122 @@ const verifyToken = (req, res, next) => {
     next();
 };
 
-// Analyze website and generate test cases
+// Analyze website and generate test cases.
+// Plain JSON by default; with `Accept: application/x-ndjson` / `text/event-stream`
+// (or ?stream=ndjson|sse) each feature, test case and recommendation is streamed
+// as soon as the model produces it (see utils/stream-response.js):
+//   page           { url, title }      once the page is fetched
+//   feature        { name, type, ... }
+//   testCase       { title, type, description, code }
+//   recommendation "text"
+//   reset          {}                  AI failed midway: drop what was streamed, fallback follows
+//   done           { url, title, generatedAt, note? }
+//   error          { error, message }
 router.post('/website-analyzer', verifyToken, async (req, res) => {
-    try {
-        const { url } = req.body;
-
-        if (!url) {
-            return res.status(400).json({ error: 'URL is required' });
-        }
+    const { url } = req.body || {};
 
-        console.log(`📊 Analyzing website: ${url}`);
+    if (!url) {
+        return res.status(400).json({ error: 'URL is required' });
+    }
 
-        // Extract website content using Puppeteer
-        let pageContent = '';
-        let pageTitle = '';
-        let pageUrl = '';
-        
+    const mode = streamMode(req);
+    if (!mode) {
         try {
-            const browser = await puppeteer.launch({
-                headless: 'new',
-                args: ['--no-sandbox', '--disable-setuid-sandbox']
+            res.json(await analyzeWebsite(url));
+        } catch (error) {
+            console.error('❌ Error analyzing website:', error);
+            res.status(500).json({
+                error: 'Failed to analyze website',
+                message: error.message
             });
-            
-            const page = await browser.newPage();
-            await page.goto(url, { waitUntil: 'networkidle2', timeout: 30000 });
-            
-            // Get page metadata
-            pageContent = await page.content();
-            pageTitle = await page.title();
-            pageUrl = page.url();
-            
-            await browser.close();
-            console.log(`✅ Successfully fetched: ${pageTitle}`);
-        } catch (puppeteerError) {
-            console.warn('⚠️ Puppeteer failed, using fallback:', puppeteerError.message);
-            pageContent = `<html><body><h1>Sample Page</h1></body></html>`;
         }
+        return;
+    }
 
-        // Use AI to analyze the website
-        const model = genAI ? genAI.getGenerativeModel({ model: 'gemini-2.0-flash' }) : null;
+    const stream = openStream(req, res, mode);
+    try {
+        const result = await analyzeWebsite(url, (event, data) => stream.send(event, data), () => stream.closed);
+        if (result) {
+            const { features, testCases, recommendations, ...summary } = result;
+            stream.send('done', summary);
+        }
+    } catch (error) {
+        console.error('❌ Error analyzing website:', error);
+        stream.send('error', {
+            error: 'Failed to analyze website',
+            message: error.message
+        });
+    }
+    stream.end();
+});
 
-        try {
-            if (!model) {
-                console.warn('⚠️ AI model not available, using fallback');
-                throw new Error('AI model not available, using fallback');
-            }
-            
-            console.log('🤖 Using AI model: gemini-2.0-flash');
-            const analysisPrompt = `Analyze this website and provide detailed information for creating Cypress test cases.
+// Fetch `url`, analyze it and return the analysis; `emit(event, data)` is called
+// for the page and for every feature / test case / recommendation as it is found.
+// Once `isCancelled()` returns true (client went away) the remaining work is
+// skipped and null is returned.
+async function analyzeWebsite(url, emit = () => {}, isCancelled = () => false) {
+    console.log(`📊 Analyzing website: ${url}`);
+
+    // Extract website content using Puppeteer
+    let pageContent = '';
+    let pageTitle = '';
+    let pageUrl = '';
+
+    try {
+        const browser = await puppeteer.launch({
+            headless: 'new',
+            args: ['--no-sandbox', '--disable-setuid-sandbox']
+        });
+
+        const page = await browser.newPage();
+        await page.goto(url, { waitUntil: 'networkidle2', timeout: 30000 });
+
+        // Get page metadata
+        pageContent = await page.content();
+        pageTitle = await page.title();
+        pageUrl = page.url();
+
+        await browser.close();
+        console.log(`✅ Successfully fetched: ${pageTitle}`);
+    } catch (puppeteerError) {
+        console.warn('⚠️ Puppeteer failed, using fallback:', puppeteerError.message);
+        pageContent = `<html><body><h1>Sample Page</h1></body></html>`;
+    }
+    if (isCancelled()) {
+        console.log('⏹️ Analysis cancelled by the client');
+        return null;
+    }
+    emit('page', { url: pageUrl, title: pageTitle });
+
+    const analysisData = { features: [], testCases: [], recommendations: [] };
+    const collect = {
+        features: (f) => {
+            const feature = normalizeFeature(f);
+            analysisData.features.push(feature);
+            emit('feature', feature);
+        },
+        testCases: (tc) => {
+            const testCase = normalizeTestCase(tc, pageUrl);
+            analysisData.testCases.push(testCase);
+            emit('testCase', testCase);
+        },
+        recommendations: (r) => {
+            analysisData.recommendations.push(r);
+            emit('recommendation', r);
+        }
+    };
+
+    // Use AI to analyze the website
+    const model = genAI ? genAI.getGenerativeModel({ model: 'gemini-2.0-flash' }) : null;
+
+    try {
+        if (!model) {
+            console.warn('⚠️ AI model not available, using fallback');
+            throw new Error('AI model not available, using fallback');
+        }
+
+        console.log('🤖 Using AI model: gemini-2.0-flash');
+        const analysisPrompt = `Analyze this website and provide detailed information for creating Cypress test cases.
 
 Website Title: ${pageTitle}
 Website URL: ${pageUrl}
@@ -110,84 +179,90 @@ Please respond in this exact JSON format:
   ]
 }`;
 
-            const result = await model.generateContent(analysisPrompt);
-            let analysisText = result.response.text();
-
-            console.log('📝 AI Response length:', analysisText.length);
-            console.log('📝 AI Response preview:', analysisText.substring(0, 300));
-
-            // Extract JSON from response
-            const jsonMatch = analysisText.match(/\{[\s\S]*\}/);
-            if (!jsonMatch) {
-                throw new Error('Failed to parse AI response');
+        // Stream the response and hand out each array element of the JSON as
+        // soon as it is complete
+        const parser = createArrayItemParser(Object.keys(collect), (key, item) => {
+            if (key === 'recommendations' ? typeof item === 'string' : item && typeof item === 'object') {
+                collect[key](item);
             }
-
-            let analysisData;
-            try {
-                analysisData = JSON.parse(jsonMatch[0]);
-                console.log('✅ JSON parsed successfully');
-            } catch (parseError) {
-                console.error('❌ JSON parse error:', parseError.message);
-                analysisData = { features: [], testCases: [], recommendations: [] };
+        });
+        const result = await model.generateContentStream(analysisPrompt);
+        let analysisText = '';
+        for await (const chunk of result.stream) {
+            if (isCancelled()) {
+                console.log('⏹️ Analysis cancelled by the client');
+                return null;
             }
+            const text = chunk.text();
+            analysisText += text;
+            parser.write(text);
+        }
 
-            // Validate and enhance data
-            analysisData.features = (Array.isArray(analysisData.features) ? analysisData.features : [])
-                .map(f => ({
-                    name: f.name || 'Unknown Feature',
-                    type: f.type || 'button',
-                    description: f.description || 'Feature for testing',
-                    selectors: f.selectors || [],
-                    interactions: f.interactions || []
-                }));
+        console.log('📝 AI Response length:', analysisText.length);
+        console.log('📝 AI Response preview:', analysisText.substring(0, 300));
 
-            analysisData.testCases = (Array.isArray(analysisData.testCases) ? analysisData.testCases : [])
-                .map(tc => ({
-                    title: tc.title || 'Test Case',
-                    type: tc.type || 'Functional',
-                    description: tc.description || '',
-                    code: enhanceCypressCode(tc.code || `cy.visit('${pageUrl}');`)
-                }));
-
-            analysisData.recommendations = Array.isArray(analysisData.recommendations) ? analysisData.recommendations : [];
+        if (!/\{[\s\S]*\}/.test(analysisText)) {
+            throw new Error('Failed to parse AI response');
+        }
 
-            console.log(`✅ Analysis completed with ${analysisData.features.length} features and ${analysisData.testCases.length} test cases`);
+        console.log(`✅ Analysis completed with ${analysisData.features.length} features and ${analysisData.testCases.length} test cases`);
 
-            res.json({
-                url: pageUrl,
-                title: pageTitle,
-                features: analysisData.features,
-                testCases: analysisData.testCases,
-                recommendations: analysisData.recommendations,
-                generatedAt: new Date().toISOString()
-            });
+        return {
+            url: pageUrl,
+            title: pageTitle,
+            features: analysisData.features,
+            testCases: analysisData.testCases,
+            recommendations: analysisData.recommendations,
+            generatedAt: new Date().toISOString()
+        };
 
-        } catch (aiError) {
-            console.error('⚠️ AI Analysis Error:', aiError.message);
-            // Return default structure on AI failure
-            res.json({
-                url: pageUrl,
-                title: pageTitle,
-                features: generateDefaultFeatures(pageContent),
-                testCases: generateDefaultTestCases(pageUrl),
-                recommendations: [
-                    'Add data-testid attributes to your elements for better selector reliability',
-                    'Implement proper form validation feedback',
-                    'Consider adding loading states for async operations'
-                ],
-                generatedAt: new Date().toISOString(),
-                note: 'Using fallback analysis due to AI unavailability'
-            });
+    } catch (aiError) {
+        console.error('⚠️ AI Analysis Error:', aiError.message);
+        if (isCancelled()) return null;
+        // Return default structure on AI failure
+        if (analysisData.features.length || analysisData.testCases.length || analysisData.recommendations.length) {
+            emit('reset', {});
         }
-
-    } catch (error) {
-        console.error('❌ Error analyzing website:', error);
-        res.status(500).json({
-            error: 'Failed to analyze website',
-            message: error.message
-        });
+        analysisData.features = [];
+        analysisData.testCases = [];
+        analysisData.recommendations = [];
+        generateDefaultFeatures(pageContent).forEach(collect.features);
+        generateDefaultTestCases(pageUrl).forEach(collect.testCases);
+        [
+            'Add data-testid attributes to your elements for better selector reliability',
+            'Implement proper form validation feedback',
+            'Consider adding loading states for async operations'
+        ].forEach(collect.recommendations);
+        return {
+            url: pageUrl,
+            title: pageTitle,
+            features: analysisData.features,
+            testCases: analysisData.testCases,
+            recommendations: analysisData.recommendations,
+            generatedAt: new Date().toISOString(),
+            note: 'Using fallback analysis due to AI unavailability'
+        };
     }
-});
+}
+
+function normalizeFeature(f) {
+    return {
+        name: f.name || 'Unknown Feature',
+        type: f.type || 'button',
+        description: f.description || 'Feature for testing',
+        selectors: f.selectors || [],
+        interactions: f.interactions || []
+    };
+}
+
+function normalizeTestCase(tc, pageUrl) {
+    return {
+        title: tc.title || 'Test Case',
+        type: tc.type || 'Functional',
+        description: tc.description || '',
+        code: enhanceCypressCode(tc.code || `cy.visit('${pageUrl}');`)
+    };
+}
 
 function generateDefaultFeatures(content) {
     const features = [];
@@ -0,0 +1,135 @@
+/**
+ * Streaming responses: NDJSON (one JSON object per line) or Server-Sent Events.
+ *
+ * A client opts in with `Accept: application/x-ndjson` / `Accept: text/event-stream`
+ * or `?stream=ndjson` / `?stream=sse`; every other request keeps the plain JSON
+ * response, so existing callers are unaffected.
+ */
+
+const NDJSON = 'ndjson';
+const SSE = 'sse';
+
+// Streaming mode requested by `req`, or null for a plain JSON response
+function streamMode(req) {
+  const query = String((req.query && req.query.stream) || '').toLowerCase();
+  if (query === NDJSON || query === SSE) return query;
+  const accept = String(req.headers['accept'] || '');
+  if (accept.includes('application/x-ndjson')) return NDJSON;
+  if (accept.includes('text/event-stream')) return SSE;
+  return null;
+}
+
+/**
+ * Start a streamed response. Returns `{ send(event, data), end(), closed }`:
+ * NDJSON lines are `{"event": ..., "data": ...}`, SSE frames use `event:` / `data:`.
+ * `closed` turns true once the client goes away, so long jobs can stop early.
+ */
+function openStream(req, res, mode) {
+  res.status(200);
+  res.setHeader('Content-Type', mode === SSE ? 'text/event-stream; charset=utf-8' : 'application/x-ndjson; charset=utf-8');
+  res.setHeader('Cache-Control', 'no-cache, no-transform');
+  res.setHeader('Connection', 'keep-alive');
+  // Keep reverse proxies (nginx) from buffering the stream
+  res.setHeader('X-Accel-Buffering', 'no');
+  res.flushHeaders();
+
+  const stream = {
+    closed: false,
+    send(event, data) {
+      if (stream.closed) return;
+      if (mode === SSE) {
+        res.write(`event: ${event}\ndata: ${JSON.stringify(data)}\n\n`);
+      } else {
+        res.write(JSON.stringify({ event, data }) + '\n');
+      }
+    },
+    end() {
+      if (stream.closed) return;
+      stream.closed = true;
+      res.end();
+    }
+  };
+  res.on('close', () => { stream.closed = true; });
+  return stream;
+}
+
+/**
+ * Incremental parser for a JSON object whose listed keys hold arrays, as
+ * produced token by token by a streaming model response:
+ *
+ *   const parser = createArrayItemParser(['features'], (key, item) => ...);
+ *   parser.write(chunk); ...
+ *
+ * `onItem(key, item)` is called for each array element as soon as its closing
+ * bracket/quote arrives. Anything before the first `{` (e.g. a ```json fence)
+ * is skipped; an element that is not valid JSON is ignored.
+ */
+function createArrayItemParser(keys, onItem) {
+  const wanted = new Set(keys);
+  let text = '';
+  let pos = 0;
+  let depth = 0;          // 0 = before the top-level object
+  let inString = false;
+  let escaped = false;
+  let stringStart = -1;
+  let lastKey = null;     // last string seen at depth 1
+  let arrayKey = null;    // key of the wanted array being read (depth 2)
+  let itemStart = -1;
+
+  function finishItem(end) {
+    const raw = text.slice(itemStart, end);
+    itemStart = -1;
+    try {
+      onItem(arrayKey, JSON.parse(raw));
+    } catch (error) {
+      if (!(error instanceof SyntaxError)) throw error;
+    }
+  }
+
+  return {
+    write(chunk) {
+      text += chunk;
+      for (; pos < text.length; pos++) {
+        const ch = text[pos];
+        if (inString) {
+          if (escaped) escaped = false;
+          else if (ch === '\\') escaped = true;
+          else if (ch === '"') {
+            inString = false;
+            if (depth === 1) {
+              try { lastKey = JSON.parse(text.slice(stringStart, pos + 1)); } catch { lastKey = null; }
+            } else if (depth === 2 && arrayKey && itemStart === stringStart) {
+              finishItem(pos + 1);
+            }
+          }
+          continue;
+        }
+        if (depth === 0) {
+          if (ch === '{') depth = 1;
+          continue;
+        }
+        if (ch === '"') {
+          inString = true;
+          stringStart = pos;
+          if (depth === 2 && arrayKey) itemStart = pos;
+        } else if (ch === '{' || ch === '[') {
+          if (depth === 1 && ch === '[' && wanted.has(lastKey)) arrayKey = lastKey;
+          else if (depth === 2 && arrayKey) itemStart = pos;
+          depth++;
+        } else if (ch === '}' || ch === ']') {
+          depth--;
+          if (depth === 2 && arrayKey && itemStart !== -1) finishItem(pos + 1);
+          else if (depth === 1) arrayKey = null;
+        }
+      }
+    }
+  };
+}
+
+module.exports = {
+  NDJSON,
+  SSE,
+  streamMode,
+  openStream,
+  createArrayItemParser
+};
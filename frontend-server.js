@@ -3,12 +3,39 @@ const fs = require('fs');
 const path = require('path');
 
 const PORT = 8080;
-const FRONTEND_DIR = path.join(__dirname, 'frontend');
+// Set FRONTEND_DIR=frontend/dist to serve the output of `python frontend/build_engine.py --dist`
+const FRONTEND_DIR = process.env.FRONTEND_DIR
+  ? path.resolve(process.env.FRONTEND_DIR)
+  : path.join(__dirname, 'frontend');
+// Build outputs named <name>.<8 hex hash>.<ext> never change once written
+const FINGERPRINTED = /\.[0-9a-f]{8}\.(css|js|woff2|woff|ttf)$/;
+
+// Precompressed siblings written by the dist build, in order of preference
+const ENCODINGS = [
+  { name: 'br', suffix: '.br' },
+  { name: 'gzip', suffix: '.gz' },
+];
+
+// Read the best precompressed sibling the client accepts, else the file itself
+function readFileNegotiated(filePath, acceptEncoding, callback) {
+  const candidates = ENCODINGS.filter(e => acceptEncoding.includes(e.name));
+  const tryNext = (i) => {
+    if (i >= candidates.length) {
+      fs.readFile(filePath, (err, content) => callback(err, content, null));
+      return;
+    }
+    fs.readFile(filePath + candidates[i].suffix, (err, content) => {
+      if (err) return tryNext(i + 1);
+      callback(null, content, candidates[i].name);
+    });
+  };
+  tryNext(0);
+}
 
 const server = http.createServer((req, res) => {
   let filePath = path.join(FRONTEND_DIR, req.url === '/' ? 'index.html' : req.url);
 
-  fs.readFile(filePath, (err, content) => {
+  readFileNegotiated(filePath, req.headers['accept-encoding'] || '', (err, content, encoding) => {
     if (err) {
       res.writeHead(404, { 'Content-Type': 'text/html' });
       res.end('<h1>404 - File Not Found</h1>', 'utf-8');
@@ -20,9 +47,20 @@ const server = http.createServer((req, res) => {
     if (filePath.endsWith('.css')) contentType = 'text/css';
     if (filePath.endsWith('.js')) contentType = 'application/javascript';
     if (filePath.endsWith('.json')) contentType = 'application/json';
+    if (filePath.endsWith('.woff2')) contentType = 'font/woff2';
+    if (filePath.endsWith('.woff')) contentType = 'font/woff';
+    if (filePath.endsWith('.ttf')) contentType = 'font/ttf';
+
+    // Fingerprinted assets can be cached forever, pages must be revalidated
+    const cacheControl = FINGERPRINTED.test(filePath)
+      ? 'public, max-age=31536000, immutable'
+      : 'no-cache';
+
+    const headers = { 'Content-Type': contentType, 'Cache-Control': cacheControl, 'Vary': 'Accept-Encoding' };
+    if (encoding) headers['Content-Encoding'] = encoding;
 
-    res.writeHead(200, { 'Content-Type': contentType });
-    res.end(content, 'utf-8');
+    res.writeHead(200, headers);
+    res.end(content);
   });
 });
 
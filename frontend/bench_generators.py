@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Benchmark the frontend generator scripts.
+
+Each case runs a generator (redesign.py, sync_design.py, update_css.py) as
+a subprocess, N times, inside a scratch copy of frontend/ so the real pages
+are never touched.  Per case the wall time (median/min/max), the peak RSS
+of the child process and the output size are recorded and appended to a
+JSON history file; anything that got worse than the previous run by more
+than the threshold is flagged.
+
+Fixtures: the current website-analyzer.html, test-creation.html (~120 KB)
+and a synthetic ~1 MB page built from sync_design.py's analyzer page.
+
+Usage:
+    python bench_generators.py                   # 5 iterations per case
+    python bench_generators.py -n 20 --threshold 0.1 --fail-on-regression
+    python bench_generators.py --cases update_css
+"""
+
+import argparse
+import datetime
+import glob
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from build_engine import FRONTEND_DIR, MANIFEST_PATH, atomic_write, load_generator
+
+HISTORY_PATH = os.path.join(FRONTEND_DIR, '.bench-history.json')
+SYNTHETIC_PAGE = 'synthetic-1mb.html'
+SYNTHETIC_SIZE = 1024 * 1024
+
+# name -> (command args, output page, reset before every iteration)
+# "cold" cases drop the build manifest so the page is really rewritten;
+# "noop" measures the incremental no-change path.
+CASES = {
+    'sync_design (cold)': (['sync_design.py'], 'website-analyzer.html', 'manifest'),
+    'sync_design (noop)': (['sync_design.py'], 'website-analyzer.html', None),
+    'redesign (cold)': (['redesign.py'], 'website-analyzer.html', 'manifest'),
+    'update_css website-analyzer': (['update_css.py', 'website-analyzer.html'], 'website-analyzer.html', 'page'),
+    'update_css test-creation': (['update_css.py', 'test-creation.html'], 'test-creation.html', 'page'),
+    'update_css 1mb': (['update_css.py', SYNTHETIC_PAGE], SYNTHETIC_PAGE, 'page'),
+}
+
+# Metrics compared against the previous run (lower is better).
+METRICS = ('wall_ms', 'peak_rss_kb', 'output_bytes')
+
+
+def make_workdir():
+    """Scratch copy of the generator scripts, templates and fixture pages."""
+    workdir = tempfile.mkdtemp(prefix='bench-frontend-')
+    for path in glob.glob(os.path.join(FRONTEND_DIR, '*.py')) + glob.glob(os.path.join(FRONTEND_DIR, '*.html')):
+        shutil.copy2(path, workdir)
+    shutil.copytree(os.path.join(FRONTEND_DIR, 'templates'), os.path.join(workdir, 'templates'))
+
+    # The synthetic page repeats the body markup of the analyzer page that
+    # sync_design.py generates until it reaches SYNTHETIC_SIZE.
+    page = load_generator('sync_design.py').new_html
+    body_start = page.index('>', page.index('<body')) + 1
+    body_end = page.rindex('</body>')
+    inner = page[body_start:body_end]
+    repeat = max(1, SYNTHETIC_SIZE // len(inner))
+    atomic_write(os.path.join(workdir, SYNTHETIC_PAGE),
+                 page[:body_start] + inner * repeat + page[body_end:])
+
+    fixtures = os.path.join(workdir, '.fixtures')
+    os.makedirs(fixtures)
+    for name in glob.glob(os.path.join(workdir, '*.html')):
+        shutil.copy2(name, fixtures)
+    return workdir
+
+
+def _reset(workdir, mode, page):
+    if mode == 'manifest':
+        try:
+            os.unlink(os.path.join(workdir, os.path.basename(MANIFEST_PATH)))
+        except FileNotFoundError:
+            pass
+    elif mode == 'page':
+        shutil.copy2(os.path.join(workdir, '.fixtures', page), os.path.join(workdir, page))
+
+
+# Runs the generator in-process and prints the child's own peak RSS (VmHWM)
+# to stderr on exit.  ru_maxrss from wait4 is useless on Linux: the child
+# inherits the parent's peak at fork, so every case reported the harness's RSS.
+_RSS_LAUNCHER = """
+import atexit, runpy, sys
+
+def _report():
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    sys.stderr.write('@@peak_rss_kb %s\\n' % line.split()[1])
+    except OSError:
+        pass
+
+atexit.register(_report)
+script = sys.argv[1]
+sys.argv = sys.argv[1:]
+sys.path.insert(0, '.')
+runpy.run_path(script, run_name='__main__')
+"""
+_RSS_MARKER = '@@peak_rss_kb '
+
+
+def run_once(workdir, args):
+    """Run one generator; returns (wall_ms, peak_rss_kb or None)."""
+    started = time.perf_counter()
+    proc = subprocess.run([sys.executable, '-c', _RSS_LAUNCHER] + args, cwd=workdir,
+                          stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    wall_ms = (time.perf_counter() - started) * 1000
+    stderr = proc.stderr.decode('utf-8', 'replace')
+    if proc.returncode != 0:
+        raise RuntimeError(f"{' '.join(args)} failed:\n{stderr}")
+    # Without /proc (macOS, Windows) the peak RSS is not reported.
+    peak_rss = None
+    for line in stderr.splitlines():
+        if line.startswith(_RSS_MARKER):
+            peak_rss = int(line[len(_RSS_MARKER):])
+    return wall_ms, peak_rss
+
+
+def bench_case(workdir, args, page, reset, iterations):
+    # One untimed run warms the OS cache and (for noop) the manifest.
+    run_once(workdir, args)
+    walls, rss = [], []
+    for _ in range(iterations):
+        if reset:
+            _reset(workdir, reset, page)
+        wall_ms, peak_rss = run_once(workdir, args)
+        walls.append(wall_ms)
+        if peak_rss is not None:
+            rss.append(peak_rss)
+    return {
+        'wall_ms': round(statistics.median(walls), 2),
+        'wall_ms_min': round(min(walls), 2),
+        'wall_ms_max': round(max(walls), 2),
+        'peak_rss_kb': max(rss) if rss else None,
+        'output_bytes': os.path.getsize(os.path.join(workdir, page)),
+        'iterations': iterations,
+    }
+
+
+def load_history(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return []
+
+
+def git_commit():
+    try:
+        out = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=FRONTEND_DIR,
+                             capture_output=True, text=True, check=True)
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def find_regressions(previous, current, threshold):
+    """``[(case, metric, old, new), ...]`` that grew by more than ``threshold``."""
+    regressions = []
+    for case, result in current.items():
+        old = previous.get(case)
+        if not old:
+            continue
+        for metric in METRICS:
+            before, after = old.get(metric), result.get(metric)
+            if before and after is not None and after > before * (1 + threshold):
+                regressions.append((case, metric, before, after))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the frontend generator scripts')
+    parser.add_argument('-n', '--iterations', type=int, default=5)
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='flag metrics that grew by more than this fraction (default 0.2)')
+    parser.add_argument('--history', default=HISTORY_PATH, help='JSON history file')
+    parser.add_argument('--cases', nargs='*', help='only cases whose name contains one of these')
+    parser.add_argument('--fail-on-regression', action='store_true', help='exit 1 on regressions')
+    args = parser.parse_args(argv)
+
+    cases = {name: case for name, case in CASES.items()
+             if not args.cases or any(c in name for c in args.cases)}
+    workdir = make_workdir()
+    results = {}
+    try:
+        for name, (cmd, page, reset) in cases.items():
+            results[name] = bench_case(workdir, cmd, page, reset, args.iterations)
+            r = results[name]
+            rss = f"{r['peak_rss_kb'] / 1024:.1f} MB" if r['peak_rss_kb'] else 'n/a'
+            print(f"⏱️  {name:<30} {r['wall_ms']:>9.1f} ms (min {r['wall_ms_min']:.1f}, "
+                  f"max {r['wall_ms_max']:.1f})  rss {rss:>8}  out {r['output_bytes']} bytes")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    history = load_history(args.history)
+    previous = history[-1]['results'] if history else {}
+    regressions = find_regressions(previous, results, args.threshold)
+    history.append({
+        'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+        'commit': git_commit(),
+        'python': sys.version.split()[0],
+        'results': results,
+    })
+    atomic_write(args.history, json.dumps(history, indent=2) + '\n')
+
+    for case, metric, before, after in regressions:
+        print(f"⚠️  Regression in {case}: {metric} {before} -> {after} "
+              f"(+{(after / before - 1) * 100:.0f}%)")
+    if not regressions:
+        print(f"✅ No regressions over {args.threshold:.0%} (history: {len(history)} runs)")
+    return 1 if regressions and args.fail_on_regression else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
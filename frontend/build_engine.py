@@ -0,0 +1,500 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Incremental page-build engine for the frontend generator scripts.
+
+Every page is split into four build units (head, style, body, script) that
+are hashed separately.  A persistent manifest remembers the hashes of the
+last build, so a page is only rewritten when one of its units changed (or
+the file on disk was edited by hand).  A no-op rebuild only stats files.
+
+With ``--dist`` the pages then go through the site-wide DIST_STAGES and
+the result is written to ``frontend/dist/`` (pages, static files and the
+fingerprinted assets the stages emit), each text file with precompressed
+``.gz``/``.br`` siblings.  The sources are never modified.
+
+Usage:
+    python build_engine.py              # rebuild every page incrementally
+    python build_engine.py --force      # rewrite every generated page
+    python build_engine.py auth.html    # only the listed pages
+    python build_engine.py --dist       # ... then build frontend/dist/
+    python build_engine.py --watch      # ... then rebuild on every change
+"""
+
+import argparse
+import asyncio
+import contextlib
+import glob
+import hashlib
+import importlib.util
+import json
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import precompress
+from document import Document
+
+FRONTEND_DIR = os.path.dirname(os.path.abspath(__file__))
+DIST_DIR = os.path.join(FRONTEND_DIR, 'dist')
+MANIFEST_PATH = os.path.join(FRONTEND_DIR, '.build-manifest.json')
+MANIFEST_VERSION = 1
+
+UNITS = ('head', 'style', 'body', 'script')
+
+# Page -> generator script that owns it.  Pages without an entry are
+# hand-written; the engine only indexes their units.  redesign.py is the
+# previous analyzer design and is only used when run directly.  A generator
+# may list the other files it reads (templates) in PAGE_INPUTS; the page is
+# rebuilt when any of them changes.
+PAGE_GENERATORS = {
+    'website-analyzer.html': 'sync_design.py',
+}
+
+# Site-wide stages run by ``--dist``, in order, as "module:function".  Each
+# stage takes a Site and edits its pages / emits assets in place, reading
+# the pages through the shared ``site.document(page)`` and editing them with
+# ``site.splice``, so each page is parsed once per build.
+DIST_STAGES = [
+    'design_tokens:tokens_stage',
+    'css_prune:prune_stage',
+    'minify:minify_stage',
+    'css_extract:extract_stage',
+    'js_extract:extract_stage',
+    'css_critical:critical_stage',
+    'self_host_assets:self_host_stage',
+    'minify:budget_stage',
+]
+
+# Directories copied to dist/ unchanged.
+STATIC_DIRS = ('assets', 'css', 'js')
+
+class BuildError(Exception):
+    """Raised by a stage to fail the build; nothing is written to dist/."""
+
+
+def content_hash(data, length=16):
+    """Short sha256 hex digest of str or bytes."""
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    return hashlib.sha256(data).hexdigest()[:length]
+
+
+@contextlib.contextmanager
+def atomic_open(path, mode='w'):
+    """Open a temp file next to ``path`` and rename it over ``path`` on success.
+
+    Readers never see a half-written file; if the block raises, the temp file
+    is removed and ``path`` is left untouched.
+    """
+    directory = os.path.dirname(path) or '.'
+    fd, tmp_path = tempfile.mkstemp(prefix='.' + os.path.basename(path) + '.',
+                                    suffix='.tmp', dir=directory)
+    try:
+        kwargs = {} if 'b' in mode else {'encoding': 'utf-8', 'newline': ''}
+        with os.fdopen(fd, mode, **kwargs) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        try:
+            os.chmod(tmp_path, os.stat(path).st_mode & 0o777)
+        except FileNotFoundError:
+            os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+def atomic_write(path, data):
+    """Write str/bytes to ``path`` atomically."""
+    with atomic_open(path, 'wb' if isinstance(data, bytes) else 'w') as f:
+        f.write(data)
+
+
+def split_units(html, doc=None):
+    """Split a page into its head, style, body and script build units.
+
+    ``doc`` is the page's Document when the caller already has one.
+    """
+    doc = doc or Document(html)
+    body_start, body_end = doc.body_range() or (len(html), len(html))
+    views = {'head': [], 'body': []}
+    styles, head_scripts, body_scripts = [], [], []
+    last = 0
+
+    def copy(upto):
+        # html[last:upto] into the view(s) it belongs to.
+        for lo, hi, view in ((0, body_start, 'head'), (body_start, body_end, 'body'),
+                             (body_end, len(html), 'head')):
+            if max(last, lo) < min(upto, hi):
+                views[view].append(html[max(last, lo):min(upto, hi)])
+
+    for el in doc.find('style', 'script'):
+        in_body = body_start <= el.start < body_end
+        if el.tag == 'style':
+            if in_body:
+                continue
+            styles.append(doc.inner(el))
+            replacement = '<style></style>'
+        elif 'src' in doc.attrs(el):
+            continue
+        else:
+            (body_scripts if in_body else head_scripts).append(doc.inner(el))
+            replacement = '<script%s></script>' % html[el.attrs_start:el.attrs_end]
+        copy(el.start)
+        views['body' if in_body else 'head'].append(replacement)
+        last = el.end
+    copy(len(html))
+    return {'head': ''.join(views['head']), 'style': '\n'.join(styles),
+            'body': ''.join(views['body']), 'script': '\n'.join(head_scripts + body_scripts)}
+
+
+def unit_hashes(html):
+    return {name: content_hash(text) for name, text in split_units(html).items()}
+
+
+def _stat_key(path):
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return [st.st_size, st.st_mtime_ns]
+
+
+class Manifest:
+    """Persistent record of the last build of every page."""
+
+    def __init__(self, path=MANIFEST_PATH):
+        self.path = path
+        self.pages = {}
+        self.dist = {}
+        self.dirty = False
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == MANIFEST_VERSION:
+                self.pages = data.get('pages', {})
+                self.dist = data.get('dist', {})
+        except (FileNotFoundError, ValueError):
+            pass
+
+    def get(self, page):
+        return self.pages.get(page)
+
+    def update(self, page, **fields):
+        entry = self.pages.setdefault(page, {})
+        entry.update(fields)
+        self.dirty = True
+        return entry
+
+    def save(self):
+        if not self.dirty:
+            return
+        data = {'version': MANIFEST_VERSION, 'pages': self.pages, 'dist': self.dist}
+        atomic_write(self.path, json.dumps(data, indent=2, sort_keys=True) + '\n')
+        self.dirty = False
+
+
+def page_path(page):
+    return os.path.join(FRONTEND_DIR, page)
+
+
+def output_is_current(entry, page):
+    """True when the file on disk is still the one the manifest recorded."""
+    return bool(entry) and entry.get('stat') == _stat_key(page_path(page))
+
+
+def write_page(page, html, generator=None, manifest=None, force=False):
+    """Write ``html`` to ``frontend/<page>`` only if a build unit changed.
+
+    Returns the list of changed unit names (empty when nothing was written).
+    """
+    own_manifest = manifest is None
+    if own_manifest:
+        manifest = Manifest()
+
+    generator = os.path.basename(generator) if generator else None
+    hashes = unit_hashes(html)
+    entry = manifest.get(page) or {}
+    current = output_is_current(entry, page)
+
+    if current and not force and entry.get('units') == hashes:
+        changed = []
+    else:
+        previous = entry.get('units', {}) if current else {}
+        changed = [name for name in UNITS if previous.get(name) != hashes[name]] or list(UNITS)
+        owner = entry.get('generator')
+        if generator and owner and owner != generator:
+            print(f"⚠️  {page} was last built by {owner}, now overwritten by {generator}")
+        path = page_path(page)
+        atomic_write(path, html)
+        manifest.update(page, units=hashes, hash=content_hash(html),
+                        stat=_stat_key(path), generator=generator)
+
+    if own_manifest:
+        manifest.save()
+    return changed
+
+
+def load_generator(script):
+    """Import a generator script without running its ``__main__`` block."""
+    path = os.path.join(FRONTEND_DIR, script)
+    name = '_generator_' + os.path.splitext(script)[0]
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def render_generator(script):
+    """``(html, inputs)`` of a generator; run in worker processes."""
+    module = load_generator(script)
+    return module.new_html, list(getattr(module, 'PAGE_INPUTS', []))
+
+
+def _inputs_stat(inputs):
+    return {rel: _stat_key(os.path.join(FRONTEND_DIR, rel)) for rel in inputs}
+
+
+def generator_is_current(page, manifest):
+    entry = manifest.get(page) or {}
+    generator = PAGE_GENERATORS[page]
+    return (entry.get('generator') == generator
+            and entry.get('source_stat') == _stat_key(os.path.join(FRONTEND_DIR, generator))
+            and entry.get('inputs', {}) == _inputs_stat(entry.get('inputs', {}))
+            and output_is_current(entry, page))
+
+
+def pages_using(manifest, rel):
+    """Generated pages built from the frontend-relative file ``rel``."""
+    return sorted(page for page, script in PAGE_GENERATORS.items()
+                  if script == rel or rel in (manifest.get(page) or {}).get('inputs', {}))
+
+
+def build_page(page, manifest, force=False, rendered=None):
+    """Rebuild one page; returns (status, changed_units).
+
+    ``rendered`` is the generator's ``(html, inputs)`` when already computed
+    (see build_pages).
+    """
+    entry = manifest.get(page) or {}
+    generator = PAGE_GENERATORS.get(page)
+
+    if generator is None:
+        # Hand-written page: just keep its unit hashes up to date.
+        if output_is_current(entry, page) and not force:
+            return 'unchanged', []
+        with open(page_path(page), 'r', encoding='utf-8', newline='') as f:
+            html = f.read()
+        hashes = unit_hashes(html)
+        previous = entry.get('units', {})
+        changed = [name for name in UNITS if previous.get(name) != hashes[name]]
+        manifest.update(page, units=hashes, hash=content_hash(html),
+                        stat=_stat_key(page_path(page)), generator=None)
+        return ('indexed' if changed else 'unchanged'), changed
+
+    if not force and generator_is_current(page, manifest):
+        return 'unchanged', []
+
+    source_stat = _stat_key(os.path.join(FRONTEND_DIR, generator))
+    html, inputs = rendered or render_generator(generator)
+    changed = write_page(page, html, generator=generator, manifest=manifest, force=force)
+    manifest.update(page, source_stat=source_stat, inputs=_inputs_stat(inputs))
+    return ('built' if changed else 'unchanged'), changed
+
+
+def build_pages(pages, manifest, force=False, jobs=None):
+    """Rebuild ``pages``; returns ``[(page, status, changed_units), ...]``.
+
+    When several generated pages are stale (e.g. a shared partial changed)
+    their generators run in parallel in a process pool.
+    """
+    stale = [page for page in pages if page in PAGE_GENERATORS
+             and (force or not generator_is_current(page, manifest))]
+    rendered = {}
+    if len(stale) > 1 and jobs != 1:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            results = pool.map(render_generator, [PAGE_GENERATORS[page] for page in stale])
+            rendered = dict(zip(stale, results))
+    return [(page,) + build_page(page, manifest, force=force, rendered=rendered.get(page))
+            for page in pages]
+
+
+def discover_pages():
+    pages = {os.path.basename(p) for p in glob.glob(os.path.join(FRONTEND_DIR, '*.html'))}
+    pages.update(PAGE_GENERATORS)
+    return sorted(pages)
+
+
+class Site:
+    """In-memory dist build: page HTML plus the assets stages emit."""
+
+    def __init__(self, pages):
+        self.pages = dict(pages)
+        self.assets = {}
+        self._documents = {}
+
+    def document(self, page):
+        """The parsed Document of ``page``, shared by every stage.
+
+        The page is parsed once per build: stages edit it through
+        ``splice``, which keeps the Document in step.  Assigning a new
+        string to ``pages[page]`` still works; the page is re-parsed the
+        next time a stage asks for it.
+        """
+        doc = self._documents.get(page)
+        if doc is None or doc.html is not self.pages[page]:
+            doc = self._documents[page] = Document(self.pages[page])
+        return doc
+
+    def splice(self, page, edits):
+        """Apply ``[(start, end, text), ...]`` (offsets into the page) to ``page``."""
+        if edits:
+            self.pages[page] = self.document(page).splice(edits).html
+
+    def add_asset(self, directory, stem, ext, content):
+        """Register a fingerprinted asset; returns its dist-relative path."""
+        name = f"{directory}/{stem}.{content_hash(content, 8)}.{ext}"
+        self.assets[name] = content
+        return name
+
+
+def _load_stage(spec):
+    module_name, func_name = spec.split(':')
+    module = importlib.import_module(module_name)
+    return module, getattr(module, func_name)
+
+
+def _static_files():
+    for directory in STATIC_DIRS:
+        for root, _, files in os.walk(os.path.join(FRONTEND_DIR, directory)):
+            for name in files:
+                src = os.path.join(root, name)
+                yield os.path.relpath(src, FRONTEND_DIR).replace(os.sep, '/'), src
+
+
+def build_dist(manifest, pages=None, force=False):
+    """Run DIST_STAGES over ``pages`` and sync the result into dist/.
+
+    Returns ``(written, removed)`` lists of dist-relative paths.  When no page
+    and no stage changed since the last dist build, nothing is even read.
+    """
+    pages = pages or discover_pages()
+    stages = [_load_stage(spec) for spec in DIST_STAGES]
+    # A stage module may list extra input files in STAGE_INPUTS.
+    stage_sources = {spec: [_stat_key(path) for path in [module.__file__] + getattr(module, 'STAGE_INPUTS', [])]
+                     for spec, (module, _) in zip(DIST_STAGES, stages)}
+    key = content_hash(json.dumps({
+        'pages': {page: _stat_key(page_path(page)) for page in pages},
+        'stages': stage_sources,
+        'static': {rel: _stat_key(src) for rel, src in _static_files()},
+    }, sort_keys=True))
+
+    files = manifest.dist.get('files', {})
+    if (not force and manifest.dist.get('key') == key
+            and all(_stat_key(os.path.join(DIST_DIR, rel)) == info['stat'] for rel, info in files.items())):
+        return [], []
+
+    outputs = {}
+    for rel, src in _static_files():
+        with open(src, 'rb') as f:
+            outputs[rel] = f.read()
+
+    site_pages = {}
+    for page in pages:
+        with open(page_path(page), 'r', encoding='utf-8', newline='') as f:
+            site_pages[page] = f.read()
+    site = Site(site_pages)
+    for _, stage in stages:
+        stage(site)
+    outputs.update(site.pages)
+    outputs.update(site.assets)
+
+    written = []
+    new_files = {}
+
+    def sync(rel, digest, produce):
+        # ``produce`` is only called when the file is stale or missing.
+        path = os.path.join(DIST_DIR, rel)
+        info = files.get(rel)
+        if force or not info or info['hash'] != digest or _stat_key(path) != info['stat']:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            atomic_write(path, produce())
+            written.append(rel)
+        new_files[rel] = {'hash': digest, 'stat': _stat_key(path)}
+
+    for rel, content in sorted(outputs.items()):
+        data = content.encode('utf-8') if isinstance(content, str) else content
+        digest = content_hash(data)
+        sync(rel, digest, lambda: data)
+        # Siblings are keyed by the source hash, so they are only recompressed
+        # when the file itself changed.
+        for suffix, compress in precompress.encoders(rel, len(data)):
+            sync(rel + suffix, digest, lambda compress=compress: compress(data))
+
+    removed = []
+    for rel in sorted(set(files) - set(new_files)):
+        try:
+            os.unlink(os.path.join(DIST_DIR, rel))
+        except FileNotFoundError:
+            pass
+        removed.append(rel)
+
+    manifest.dist = {'key': key, 'files': new_files}
+    manifest.dirty = True
+    return written, removed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Incremental frontend page build')
+    parser.add_argument('pages', nargs='*', help='pages to build (default: all frontend/*.html)')
+    parser.add_argument('--force', action='store_true', help='ignore the manifest and rewrite everything')
+    parser.add_argument('--dist', action='store_true', help='also run the dist stages into frontend/dist/')
+    parser.add_argument('-j', '--jobs', type=int, default=None,
+                        help='parallel generator processes (default: CPU count)')
+    parser.add_argument('--watch', action='store_true', help='keep running and rebuild on every change (see watch.py)')
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    manifest = Manifest()
+    counts = {}
+    for page, status, changed in build_pages(args.pages or discover_pages(), manifest,
+                                             force=args.force, jobs=args.jobs):
+        counts[status] = counts.get(status, 0) + 1
+        if changed:
+            print(f"🔨 {page}: {status} ({', '.join(changed)})")
+    if args.dist:
+        try:
+            written, removed = build_dist(manifest, force=args.force)
+        except BuildError as e:
+            manifest.save()
+            print(f"❌ Build failed: {e}")
+            if not args.watch:
+                return 1
+            written, removed = [], []
+        for rel in written:
+            print(f"📦 dist/{rel}")
+        for rel in removed:
+            print(f"🗑️  dist/{rel}")
+        counts['dist files written'] = len(written)
+    manifest.save()
+
+    elapsed = (time.perf_counter() - started) * 1000
+    summary = ', '.join(f"{n} {status}" for status, n in sorted(counts.items()))
+    print(f"✅ Build finished in {elapsed:.1f} ms: {summary}")
+    if args.watch:
+        import watch
+        try:
+            asyncio.run(watch.watch(dist=args.dist))
+        except KeyboardInterrupt:
+            pass
+    return 0
+
+
+if __name__ == '__main__':
+    # Run through the importable module so stages share its classes (BuildError).
+    import build_engine
+    sys.exit(build_engine.main())
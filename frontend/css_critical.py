@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Dist stage: inline critical CSS and load the full stylesheets async.
+
+For the pages listed in ABOVE_THE_FOLD, the markup before the fold marker
+(sidebar, page header, search card ...) is scanned for the tags, classes and
+ids it uses.  Only the rules that can match it are inlined in a <style>
+block; the page's own stylesheets become ``rel="preload"`` links that switch
+to ``stylesheet`` once loaded, with a <noscript> fallback.  First paint no
+longer waits for the whole stylesheet.
+
+Must run after css_extract, whose fingerprinted sheets it reads.
+"""
+
+from css_extract import stylesheet_links
+from css_rules import filter_statements, markup_usage, split_statements
+from design_tokens import TOKENS_CSS_PREFIX
+
+# Page -> marker of the first element below the fold.  The marker element's
+# own opening tag still counts as above the fold, so e.g. its ``hidden``
+# class is inlined and the block does not flash before the CSS arrives.
+ABOVE_THE_FOLD = {
+    'website-analyzer.html': 'id="analysisContent"',
+}
+
+
+def above_the_fold(doc, marker):
+    """Markup from <body> up to the end of the opening tag holding ``marker``."""
+    html = doc.html
+    body = doc.first('body')
+    start = body.start if body else 0
+    idx = html.find(marker, start)
+    if idx == -1:
+        return html[start:]
+    end = html.find('>', idx)
+    return html[start:end + 1 if end != -1 else len(html)]
+
+
+def critical_css(site, page, hrefs):
+    usage = markup_usage(above_the_fold(site.document(page), ABOVE_THE_FOLD[page]))
+    statements = []
+    for href in hrefs:
+        statements.extend(split_statements(site.assets[href]))
+    return '\n'.join(filter_statements(statements, usage))
+
+
+def critical_stage(site):
+    for page in ABOVE_THE_FOLD:
+        if page not in site.pages:
+            continue
+        doc = site.document(page)
+        # The design tokens stay render-blocking: the sheet is tiny and
+        # cached across pages, and every rule depends on it.
+        links = [(link, href) for link, href in stylesheet_links(doc)
+                 if href in site.assets and not href.startswith(TOKENS_CSS_PREFIX)]
+        if not links:
+            continue
+
+        # The inlined CSS and the deferred links replace the first link;
+        # the others are removed.
+        _, _, indent = doc.line_span(links[0][0])
+        css = critical_css(site, page, [href for _, href in links])
+        deferred = [indent + '<style>\n' + css + '\n' + indent + '</style>\n'] if css else []
+        for _, href in links:
+            deferred.append(
+                f'{indent}<link rel="preload" href="{href}" as="style" '
+                f'onload="this.onload=null;this.rel=\'stylesheet\'">\n'
+                f'{indent}<noscript><link rel="stylesheet" href="{href}"></noscript>\n')
+        edits = []
+        last = 0
+        for i, (link, _) in enumerate(links):
+            start, end, _ = doc.line_span(link)
+            start = max(start, last)
+            edits.append((start, end, ''.join(deferred) if i == 0 else ''))
+            last = end
+        site.splice(page, edits)
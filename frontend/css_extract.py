@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Dist stage: lift inline <style> blocks into fingerprinted stylesheets.
+
+Rules used by several pages go into shared ``css/shared.<hash>.css`` chunks
+(one per set of pages using them, like a bundler's split chunks); the rest
+of each page's CSS goes into ``css/<page>.<hash>.css``.  Rules that already
+exist in a local stylesheet the page links are dropped.  The pages get
+<link> tags instead of the inline blocks, so the CSS is cached by the
+browser across pages and deploys.
+
+Moving a rule to an earlier stylesheet changes its cascade position, so a
+rule is only moved when every earlier rule it could conflict with (see
+css_rules.conflict_keys) has been moved ahead of it as well.
+"""
+
+import os
+
+from build_engine import FRONTEND_DIR
+from css_rules import conflict_keys, split_statements, statement_key
+
+# Shared chunks smaller than this stay inline in the page stylesheets.
+SHARED_CHUNK_MIN_BYTES = 1024
+
+
+def stylesheet_links(doc):
+    """``[(link element, href), ...]`` of the page's <link rel="stylesheet">."""
+    links = []
+    for link in doc.find('link'):
+        attrs = doc.attrs(link)
+        if attrs.get('rel', '').lower() == 'stylesheet' and attrs.get('href'):
+            links.append((link, attrs['href']))
+    return links
+
+
+def _extractable(doc, style):
+    """Plain <style> blocks only: one with a media query (or any other
+    attribute) has to stay a <style> to keep its meaning."""
+    attrs = doc.attrs(style)
+    return not attrs or attrs == {'type': 'text/css'}
+
+
+def linked_local_sheets(doc, before):
+    """Paths (relative to frontend/) of local stylesheets linked before ``before``."""
+    sheets = []
+    for link, href in stylesheet_links(doc):
+        if link.start >= before:
+            break
+        href = href.split('?')[0]
+        if '//' in href or href.startswith('/'):
+            continue
+        if os.path.isfile(os.path.join(FRONTEND_DIR, href)):
+            sheets.append(href)
+    return sheets
+
+
+def _external_duplicates(statements, doc, before):
+    """Indexes of statements already provided, unchanged, by linked sheets."""
+    external = []
+    for href in linked_local_sheets(doc, before):
+        with open(os.path.join(FRONTEND_DIR, href), 'r', encoding='utf-8') as f:
+            external.extend(split_statements(f.read()))
+    if not external:
+        return set()
+
+    positions = {}
+    for idx, stmt in enumerate(external):
+        positions[statement_key(stmt)] = idx
+    later_conflicts = [set() for _ in external]
+    seen = set()
+    for idx in range(len(external) - 1, -1, -1):
+        later_conflicts[idx] = set(seen)
+        seen |= conflict_keys(external[idx])
+
+    duplicates = set()
+    kept_conflicts = set()
+    for idx, stmt in enumerate(statements):
+        ext_idx = positions.get(statement_key(stmt))
+        conflicts = conflict_keys(stmt)
+        if (ext_idx is not None and not conflicts & kept_conflicts
+                and not conflicts & later_conflicts[ext_idx]):
+            duplicates.add(idx)
+        else:
+            kept_conflicts |= conflicts
+    return duplicates
+
+
+def _plan_chunks(page_statements):
+    """Group statements shared by several pages into ordered chunks.
+
+    Returns ``[(pages, [statement, ...]), ...]`` in first-appearance order.
+    """
+    users = {}
+    first_seen = {}
+    for page_idx, (page, statements) in enumerate(page_statements.items()):
+        for stmt_idx, stmt in enumerate(statements):
+            key = statement_key(stmt)
+            users.setdefault(key, set()).add(page)
+            first_seen.setdefault(key, ((page_idx, stmt_idx), stmt))
+
+    groups = {}
+    for key, pages in users.items():
+        if len(pages) > 1:
+            groups.setdefault(frozenset(pages), []).append(key)
+
+    chunks = []
+    for pages, keys in groups.items():
+        keys.sort(key=lambda k: first_seen[k][0])
+        statements = [first_seen[k][1] for k in keys]
+        if sum(len(s) for s in statements) >= SHARED_CHUNK_MIN_BYTES:
+            chunks.append((first_seen[keys[0]][0], pages, statements))
+    chunks.sort(key=lambda c: c[0])
+    return [(pages, statements) for _, pages, statements in chunks]
+
+
+def _split_page(statements, order, external):
+    """Return the statements that must stay in the page's own stylesheet."""
+    kept = []
+    moved = []  # (order, conflict keys) of statements served by a chunk
+    kept_conflicts = set()
+    for idx, stmt in enumerate(statements):
+        conflicts = conflict_keys(stmt)
+        position = order.get(statement_key(stmt))
+        if idx in external and position is None:
+            continue
+        if (position is not None and not conflicts & kept_conflicts
+                and all(p < position for p, c in moved if conflicts & c)):
+            moved.append((position, conflicts))
+            continue
+        kept.append(stmt)
+        kept_conflicts |= conflicts
+    return kept
+
+
+def extract_stage(site):
+    blocks = {}
+    page_statements = {}
+    for page in site.pages:
+        doc = site.document(page)
+        styles = [el for el in doc.find('style') if _extractable(doc, el)]
+        if styles:
+            blocks[page] = styles
+            page_statements[page] = [stmt for el in styles for stmt in split_statements(doc.inner(el))]
+
+    chunks = _plan_chunks(page_statements)
+    order = {}
+    for chunk_idx, (_, statements) in enumerate(chunks):
+        for stmt_idx, stmt in enumerate(statements):
+            order[statement_key(stmt)] = (chunk_idx, stmt_idx)
+    chunk_hrefs = [site.add_asset('css', 'shared', 'css', '\n\n'.join(statements) + '\n')
+                   for _, statements in chunks]
+
+    for page, styles in blocks.items():
+        doc = site.document(page)
+        statements = page_statements[page]
+        page_order = {key: pos for key, pos in order.items()
+                      if page in chunks[pos[0]][0]}
+        external = _external_duplicates(statements, doc, styles[0].start)
+        kept = _split_page(statements, page_order, external)
+
+        hrefs = [href for href, (pages, _) in zip(chunk_hrefs, chunks) if page in pages]
+        if kept:
+            stem = os.path.splitext(page)[0]
+            hrefs.append(site.add_asset('css', stem, 'css', '\n\n'.join(kept) + '\n'))
+
+        # The links replace the first block; the others are removed.
+        edits = []
+        last = 0
+        for i, style in enumerate(styles):
+            start, end, indent = doc.line_span(style)
+            start = max(start, last)
+            text = ''.join(f'{indent}<link rel="stylesheet" href="{href}">\n' for href in hrefs) if i == 0 else ''
+            edits.append((start, end, text))
+            last = end
+        site.splice(page, edits)
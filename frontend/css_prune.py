@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Dist stage: drop CSS rules that nothing on the page can match.
+
+The usage index of a page is built from its static markup plus every token
+of its inline scripts (css_rules.script_usage), so classes only ever added
+by ``displayAnalysis`` / ``displayTestResults`` templates or ``classList``
+calls are kept.  Runs before css_extract, so the extracted stylesheets are
+already pruned.  Prints the bytes removed per page.
+"""
+
+from css_rules import (filter_statements, markup_usage, script_usage, split_block,
+                       split_statements)
+
+
+def page_usage(doc):
+    usage = markup_usage(doc.html)
+    for script in doc.inline_scripts():
+        script_usage(doc.inner(script), usage)
+    return usage
+
+
+def _rule_sizes(statements):
+    """``(rules, bytes)`` of the style rules in ``statements``, @media included."""
+    rules = size = 0
+    for stmt in statements:
+        prelude, body = split_block(stmt)
+        if body is not None and prelude.lower().startswith(('@media', '@supports')):
+            inner_rules, inner_size = _rule_sizes(split_statements(body))
+            rules += inner_rules
+            size += inner_size
+        else:
+            rules += 1
+            size += len(stmt.encode('utf-8'))
+    return rules, size
+
+
+def prune_page(doc):
+    """Return ``(edits, bytes_removed, rules_removed)`` for the page's
+    <style> blocks; ``edits`` are ``(start, end, css)`` for Document.splice."""
+    usage = page_usage(doc)
+    edits = []
+    removed_bytes = removed_rules = 0
+    for style in doc.find('style'):
+        css = doc.inner(style)
+        body = css.rstrip(' \t')  # keep the indentation of </style>
+        statements = split_statements(body)
+        kept = filter_statements(statements, usage)
+        if kept == statements:
+            continue
+        rules_before, bytes_before = _rule_sizes(statements)
+        rules_after, bytes_after = _rule_sizes(kept)
+        removed_rules += rules_before - rules_after
+        removed_bytes += bytes_before - bytes_after
+        edits.append((style.inner_start, style.inner_start + len(body), '\n' + '\n\n'.join(kept) + '\n'))
+    return edits, removed_bytes, removed_rules
+
+
+def prune_stage(site):
+    total = 0
+    for page in sorted(site.pages):
+        edits, removed_bytes, removed_rules = prune_page(site.document(page))
+        if removed_bytes:
+            site.splice(page, edits)
+            total += removed_bytes
+            print(f"✂️  {page}: removed {removed_rules} unused rules, {removed_bytes} bytes")
+    if total:
+        print(f"✂️  Unused CSS removed: {total} bytes in total")
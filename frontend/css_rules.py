@@ -0,0 +1,440 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Small CSS helpers shared by the build stages.
+
+Only what the stages need: splitting a stylesheet into top-level statements
+(style rules and whole at-rule blocks), a whitespace-insensitive key for
+deduping them, the set of things a statement can conflict on, and a rough
+"could this selector match this markup" test used to filter rules.
+
+``parse_rules`` builds an offset-based rule tree (selectors, declarations,
+nested @media) and ``patch_css`` merges a stylesheet of overrides into
+another one, rewriting only the declarations that change.
+"""
+
+import re
+
+_COMMENT_RE = re.compile(r'/\*.*?\*/', re.S)
+_WS_RE = re.compile(r'\s+')
+_PUNCT_WS_RE = re.compile(r'\s*([{};,>])\s*')
+_PROPERTY_RE = re.compile(r'(?:^|[;{])\s*(-?[a-zA-Z][-a-zA-Z0-9]*)\s*:')
+_VENDOR_PREFIX_RE = re.compile(r'^-[a-z]+-')
+# Properties whose shorthand family is not their first name segment.
+_FAMILY_ALIASES = {
+    'top': 'inset', 'right': 'inset', 'bottom': 'inset', 'left': 'inset',
+    'row-gap': 'gap', 'column-gap': 'gap', 'grid-gap': 'gap',
+    'columns': 'column', 'line-height': 'font',
+    'align': 'place', 'justify': 'place',
+}
+
+
+def strip_comments(css):
+    return _COMMENT_RE.sub('', css)
+
+
+def split_statements(css):
+    """Split ``css`` into top-level statements, in source order.
+
+    Braces inside strings are ignored; comments are dropped.
+    """
+    css = strip_comments(css)
+    statements = []
+    depth = 0
+    quote = None
+    start = 0
+    i = 0
+    while i < len(css):
+        ch = css[i]
+        if quote:
+            if ch == '\\':
+                i += 1
+            elif ch == quote:
+                quote = None
+        elif ch in '"\'':
+            quote = ch
+        elif ch == '{':
+            depth += 1
+        elif ch == '}':
+            depth -= 1
+            if depth == 0:
+                statements.append(css[start:i + 1].strip())
+                start = i + 1
+        elif ch == ';' and depth == 0:
+            statements.append(css[start:i + 1].strip())
+            start = i + 1
+        i += 1
+    tail = css[start:].strip()
+    if tail:
+        statements.append(tail)
+    return [s for s in statements if s]
+
+
+def statement_key(statement):
+    """Whitespace-insensitive identity of a statement, used for dedupe."""
+    key = _WS_RE.sub(' ', statement).strip()
+    return _PUNCT_WS_RE.sub(r'\1', key).replace(';}', '}')
+
+
+def conflict_keys(statement):
+    """Names a statement may fight over in the cascade.
+
+    Style rules (also inside @media) conflict on the property families they
+    declare (see ``property_family``).
+    @keyframes / @font-face only conflict with a block of the same name.
+    Two statements that share no key can be reordered safely.
+    """
+    head = statement.split('{', 1)[0].strip()
+    lowered = head.lower()
+    if lowered.startswith(('@keyframes', '@-webkit-keyframes', '@font-face', '@import', '@charset')):
+        return {_WS_RE.sub(' ', lowered)}
+    if '{' not in statement:
+        return {lowered}
+    return {property_family(m.group(1).lower()) for m in _PROPERTY_RE.finditer(statement.split('{', 1)[1])}
+
+
+def property_family(prop):
+    """Shorthand family of a property: ``margin-top`` and ``margin`` are both
+    ``margin``, so a longhand and its shorthand conflict.  Families are taken
+    broadly (``text-align`` and ``text-decoration`` share ``text``); a false
+    conflict only keeps two rules in order."""
+    prop = _VENDOR_PREFIX_RE.sub('', prop)
+    if prop in _FAMILY_ALIASES:
+        return _FAMILY_ALIASES[prop]
+    family = prop.split('-', 1)[0]
+    return _FAMILY_ALIASES.get(family, family)
+
+
+def split_block(statement):
+    """``(prelude, body)`` of a block statement, or ``(statement, None)``."""
+    if '{' not in statement:
+        return statement, None
+    prelude, rest = statement.split('{', 1)
+    return prelude.strip(), rest.rsplit('}', 1)[0]
+
+
+def split_selectors(prelude):
+    """Split a selector list on top-level commas (not inside ``:not(a, b)``)."""
+    selectors, depth, start = [], 0, 0
+    for i, ch in enumerate(prelude):
+        if ch in '([':
+            depth += 1
+        elif ch in ')]':
+            depth -= 1
+        elif ch == ',' and depth == 0:
+            selectors.append(prelude[start:i].strip())
+            start = i + 1
+    selectors.append(prelude[start:].strip())
+    return [s for s in selectors if s]
+
+
+_TAG_RE = re.compile(r'<([a-zA-Z][-a-zA-Z0-9]*)')
+_CLASS_ATTR_RE = re.compile(r'\bclass\s*=\s*(["\'])(.*?)\1', re.S)
+_ID_ATTR_RE = re.compile(r'\bid\s*=\s*(["\'])(.*?)\1', re.S)
+_PSEUDO_RE = re.compile(r'::?[-a-zA-Z]+(\((?:[^()]|\([^()]*\))*\))?')
+_ATTR_SEL_RE = re.compile(r'\[[^\]]*\]')
+_COMBINATOR_RE = re.compile(r'\s*[>+~]\s*|\s+')
+_SIMPLE_SEL_RE = re.compile(r'([.#]?)(-?[_a-zA-Z][-_a-zA-Z0-9]*)')
+
+
+_SCRIPT_TOKEN_RE = re.compile(r'-?[_a-zA-Z][-_a-zA-Z0-9]*')
+
+
+def new_usage():
+    return {'tag': set(), 'class': set(), 'id': set(), 'prefix': set()}
+
+
+def markup_usage(html, usage=None):
+    """Collect the tag names, classes and ids that ``html`` uses."""
+    usage = usage or new_usage()
+    usage['tag'].update(tag.lower() for tag in _TAG_RE.findall(html))
+    for _, value in _CLASS_ATTR_RE.findall(html):
+        usage['class'].update(value.split())
+    for _, value in _ID_ATTR_RE.findall(html):
+        usage['id'].update(value.split())
+    return usage
+
+
+def script_usage(js, usage=None):
+    """Collect every name ``js`` could put into a class, id or tag.
+
+    Class names built in JS (template literals, ``classList.toggle('x')``,
+    ``'status-' + s``) are not parsed out precisely: every identifier-like
+    token counts, and tokens ending in ``-`` count as class prefixes.
+    """
+    usage = usage or new_usage()
+    for token in set(_SCRIPT_TOKEN_RE.findall(js)):
+        if token.endswith('-'):
+            usage['prefix'].add(token)
+        else:
+            usage['class'].add(token)
+            usage['id'].add(token)
+            usage['tag'].add(token.lower())
+    return usage
+
+
+def selector_used(selector, usage):
+    """Could ``selector`` match something built from ``usage``?
+
+    Pseudo-classes and attribute selectors are ignored, so this errs on the
+    side of keeping a rule.
+    """
+    bare = _ATTR_SEL_RE.sub('', _PSEUDO_RE.sub('', selector))
+    for compound in _COMBINATOR_RE.split(bare.strip()):
+        for prefix, name in _SIMPLE_SEL_RE.findall(compound):
+            if (prefix == '.' and name not in usage['class']
+                    and not any(name.startswith(p) for p in usage['prefix'])):
+                return False
+            if prefix == '#' and name not in usage['id']:
+                return False
+            if not prefix and name.lower() not in usage['tag']:
+                return False
+    return True
+
+
+_KEYFRAMES_NAME_RE = re.compile(r'@(?:-webkit-)?keyframes\s+([-_a-zA-Z0-9]+)', re.I)
+_GROUPING_AT_RULES = ('@media', '@supports')
+
+
+def filter_statements(statements, usage):
+    """Keep the statements whose selectors ``usage`` can match.
+
+    @media / @supports blocks are filtered recursively, @font-face is kept
+    and @keyframes only when a kept rule refers to its name.
+    """
+    kept = []
+    keyframes = []
+    for stmt in statements:
+        prelude, body = split_block(stmt)
+        lowered = prelude.lower()
+        if body is None or lowered.startswith('@font-face'):
+            kept.append(stmt)
+        elif lowered.startswith(_GROUPING_AT_RULES):
+            statements_inside = split_statements(body)
+            inner = filter_statements(statements_inside, usage)
+            if inner == statements_inside:
+                kept.append(stmt)
+            elif inner:
+                kept.append(prelude + ' {\n' + '\n'.join(inner) + '\n}')
+        elif _KEYFRAMES_NAME_RE.match(prelude):
+            keyframes.append((len(kept), stmt))
+        elif lowered.startswith('@'):
+            kept.append(stmt)
+        elif any(selector_used(s, usage) for s in split_selectors(prelude)):
+            kept.append(stmt)
+
+    text = '\n'.join(kept)
+    inserted = 0
+    for position, stmt in keyframes:
+        name = _KEYFRAMES_NAME_RE.match(stmt).group(1)
+        if re.search(r'(?<![-\w])%s(?![-\w])' % re.escape(name), text):
+            kept.insert(position + inserted, stmt)
+            inserted += 1
+    return kept
+
+
+# ---------------------------------------------------------------- rule tree
+
+class Declaration:
+    """``prop: value`` inside a style rule, ``css[start:end]``; ``value``
+    spans ``css[value_start:value_end]`` and ``end`` is past its ';' if any."""
+
+    __slots__ = ('prop', 'value', 'start', 'value_start', 'value_end', 'end', 'terminated')
+
+    def __init__(self, prop, value, start, value_start, value_end, end, terminated):
+        self.prop = prop
+        self.start = start
+        self.value = value
+        self.value_start = value_start
+        self.value_end = value_end
+        self.end = end
+        self.terminated = terminated
+
+
+class Rule:
+    """A statement of a stylesheet, as offsets into the parsed text.
+
+    Style rules have ``declarations``, @media / @supports blocks have
+    ``children`` (a nested rule list); other statements (@keyframes,
+    @font-face, @import ...) have neither and are handled as a whole.
+    """
+
+    __slots__ = ('prelude', 'start', 'end', 'body_start', 'body_end', 'children', 'declarations')
+
+    def __init__(self, prelude, start, end, body_start, body_end):
+        self.prelude = prelude
+        self.start = start
+        self.end = end
+        self.body_start = body_start
+        self.body_end = body_end
+        self.children = None
+        self.declarations = None
+
+    @property
+    def key(self):
+        return statement_key(self.prelude)
+
+
+def _skip_blank(css, i, end):
+    """Index of the first character at or after ``i`` that is neither
+    whitespace nor part of a comment."""
+    while i < end:
+        if css[i].isspace():
+            i += 1
+        elif css.startswith('/*', i):
+            close = css.find('*/', i + 2, end)
+            i = end if close == -1 else close + 2
+        else:
+            break
+    return i
+
+
+def _scan(css, i, end, stops):
+    """Index of the first of ``stops`` at or after ``i`` outside strings,
+    comments, parentheses and nested blocks (``end`` if there is none)."""
+    depth = 0
+    while i < end:
+        ch = css[i]
+        if ch in '"\'':
+            i += 1
+            while i < end and css[i] != ch:
+                i += 2 if css[i] == '\\' else 1
+        elif css.startswith('/*', i):
+            close = css.find('*/', i + 2, end)
+            i = end if close == -1 else close + 1
+        elif depth == 0 and ch in stops:
+            return i
+        elif ch in '({':
+            depth += 1
+        elif ch in ')}':
+            depth -= 1
+        i += 1
+    return end
+
+
+def parse_declarations(css, start, end):
+    declarations = []
+    i = _skip_blank(css, start, end)
+    while i < end:
+        stop = _scan(css, i, end, ';')
+        colon = css.find(':', i, stop)
+        if colon != -1:
+            prop = strip_comments(css[i:colon]).strip()
+            value_start = _skip_blank(css, colon + 1, stop)
+            value_end = value_start + len(css[value_start:stop].rstrip())
+            terminated = stop < end
+            declarations.append(Declaration(prop if prop.startswith('--') else prop.lower(),
+                                            css[value_start:value_end], i, value_start, value_end,
+                                            stop + 1 if terminated else value_end, terminated))
+        i = _skip_blank(css, stop + 1, end)
+    return declarations
+
+
+def parse_rules(css, start=0, end=None):
+    """Parse ``css[start:end]`` into a list of Rules (nested for @media)."""
+    end = len(css) if end is None else end
+    rules = []
+    i = _skip_blank(css, start, end)
+    while i < end:
+        stop = _scan(css, i, end, '{;')
+        if stop == end or css[stop] == ';':
+            # Block-less statement (@import ...) or trailing garbage.
+            rule = Rule(strip_comments(css[i:stop]).strip(), i, min(stop + 1, end), stop, stop)
+        else:
+            close = _scan(css, stop + 1, end, '}')
+            rule = Rule(strip_comments(css[i:stop]).strip(), i, min(close + 1, end), stop + 1, close)
+            lowered = rule.prelude.lower()
+            if lowered.startswith(_GROUPING_AT_RULES):
+                rule.children = parse_rules(css, rule.body_start, rule.body_end)
+            elif not lowered.startswith('@'):
+                rule.declarations = parse_declarations(css, rule.body_start, rule.body_end)
+        rules.append(rule)
+        i = _skip_blank(css, rule.end, end)
+    return rules
+
+
+def _indent_at(css, pos):
+    line_start = css.rfind('\n', 0, pos) + 1
+    prefix = css[line_start:pos]
+    return prefix if not prefix.strip() else ''
+
+
+def _reindent(text, old_indent, new_indent):
+    lines = text.split('\n')
+    for n in range(1, len(lines)):
+        line = lines[n]
+        if line.startswith(old_indent):
+            line = line[len(old_indent):]
+        lines[n] = new_indent + line if line else line
+    return '\n'.join(lines)
+
+
+def _merge_declarations(css, target, rule, edits):
+    existing = {decl.prop: decl for decl in target.declarations}
+    added = []
+    for decl in rule.declarations:
+        current = existing.get(decl.prop)
+        if current is None:
+            added.append(decl)
+        elif _WS_RE.sub(' ', current.value) != _WS_RE.sub(' ', decl.value):
+            edits.append((current.value_start, current.value_end, decl.value))
+    if not added:
+        return
+    if target.declarations:
+        last = target.declarations[-1]
+        pos, indent = last.end, _indent_at(css, _skip_blank(css, target.body_start, target.body_end))
+        text = '' if last.terminated else ';'
+    else:
+        pos, indent, text = target.body_start, _indent_at(css, target.start) + '    ', ''
+    text += ''.join(f'\n{indent}{decl.prop}: {decl.value};' for decl in added)
+    edits.append((pos, pos, text))
+
+
+def _merge_rules(css, rules, patch, patch_rules, edits, container_end):
+    by_key = {rule.key: rule for rule in rules}
+    anchor = None
+    for rule in patch_rules:
+        target = by_key.get(rule.key)
+        if target is not None and (target.children is None) == (rule.children is None):
+            if rule.children is not None:
+                _merge_rules(css, target.children, patch, rule.children, edits, target.body_end)
+            elif rule.declarations is not None and target.declarations is not None:
+                _merge_declarations(css, target, rule, edits)
+            elif statement_key(css[target.start:target.end]) != statement_key(patch[rule.start:rule.end]):
+                edits.append((target.start, target.end, patch[rule.start:rule.end]))
+            anchor = target
+            continue
+        # New rule: after the last rule the patch matched, so it keeps its
+        # place in the cascade relative to the rules around it.
+        after = anchor or (rules[-1] if rules else None)
+        text = patch[rule.start:rule.end]
+        if after is None:
+            edits.append((container_end, container_end, text + '\n'))
+        else:
+            indent = _indent_at(css, after.start)
+            edits.append((after.end, after.end,
+                          '\n\n' + indent + _reindent(text, _indent_at(patch, rule.start), indent)))
+
+
+def patch_css(css, patch):
+    """Merge the rules of the stylesheet ``patch`` into ``css``.
+
+    A patch rule whose selector (or @media query) exists in ``css``
+    overrides the declarations it names and adds the ones it lacks; the
+    target's other declarations are kept.  @media / @supports blocks merge
+    recursively; other at-rules are replaced whole.  Rules that do not exist
+    yet are inserted after the last rule the patch matched.  Only changed
+    declarations are rewritten, the rest of ``css`` is copied verbatim, and
+    ``css`` itself is returned when the patch is already applied.
+    """
+    edits = []
+    _merge_rules(css, parse_rules(css), patch, parse_rules(patch), edits, len(css))
+    if not edits:
+        return css
+    parts = []
+    last = 0
+    for start, end, text in sorted(edits, key=lambda e: (e[0], e[1])):
+        parts.append(css[last:start])
+        parts.append(text)
+        last = end
+    parts.append(css[last:])
+    return ''.join(parts)
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Design tokens: one stylesheet holding the palette of every page.
+
+``design-tokens.json`` is the single source of the CSS custom properties
+(``--primary`` ...).  Its ``tokens`` are compiled into a ``:root`` rule and
+each entry of ``themes`` into a ``:root.theme-<name>`` rule holding the
+tokens the theme overrides, selected by putting ``class="theme-<name>"``
+on <html>:
+
+    python design_tokens.py          # regenerate css/tokens.css
+
+The generated pages link ``css/tokens.css`` (templates/layout.html).  In the
+dist build, ``tokens_stage`` emits the fingerprinted
+``css/tokens.<hash>.css``, points every page that uses a token at it, and
+drops the inline ``:root`` declarations it makes redundant, so a palette
+tweak only invalidates that one small file in browser caches.
+"""
+
+import json
+import os
+import re
+import sys
+
+from build_engine import FRONTEND_DIR, atomic_write
+from css_rules import parse_rules
+from minify import minify_css
+
+TOKENS_PATH = os.path.join(FRONTEND_DIR, 'design-tokens.json')
+TOKENS_CSS = 'css/tokens.css'
+# Matches the source stylesheet and its fingerprinted dist copies.
+TOKENS_CSS_PREFIX = 'css/tokens.'
+THEME_CLASS_PREFIX = 'theme-'
+# Editing the token source must invalidate the dist build.
+STAGE_INPUTS = [TOKENS_PATH]
+
+_VAR_RE = re.compile(r'var\(\s*--([-_a-zA-Z0-9]+)')
+
+
+def load_tokens(path=TOKENS_PATH):
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return data.get('tokens', {}), data.get('themes', {})
+
+
+def _rule(selector, tokens):
+    lines = ''.join(f'    --{name}: {value};\n' for name, value in tokens.items())
+    return f'{selector} {{\n{lines}}}\n'
+
+
+def compile_tokens(tokens, themes):
+    rules = [_rule(':root', tokens)]
+    for name, overrides in themes.items():
+        rules.append(_rule(f':root.{THEME_CLASS_PREFIX}{name}', overrides))
+    return (f'/* Generated by design_tokens.py from {os.path.basename(TOKENS_PATH)}; do not edit. */\n'
+            + '\n'.join(rules))
+
+
+def _line_extent(text, start, end):
+    """``text[start:end]`` widened to whole lines when nothing else is on them."""
+    line_start = text.rfind('\n', 0, start) + 1
+    if not text[line_start:start].strip():
+        start = line_start
+    line_end = text.find('\n', end)
+    if line_end != -1 and not text[end:line_end].strip():
+        end = line_end + 1
+    return start, end
+
+
+def redundant_root_edits(doc, tokens):
+    """Edits removing the inline ``:root`` declarations whose value is the
+    token's; a ``:root`` rule left without declarations is removed whole."""
+    edits = []
+    for style in doc.find('style'):
+        css = doc.inner(style)
+        for rule in parse_rules(css):
+            if rule.key != ':root' or not rule.declarations:
+                continue
+            same = [decl for decl in rule.declarations
+                    if decl.prop.startswith('--') and ' '.join(decl.value.split()) == tokens.get(decl.prop[2:])]
+            if len(same) == len(rule.declarations):
+                spans = [_line_extent(css, rule.start, rule.end)]
+            else:
+                spans = [_line_extent(css, decl.start, decl.end) for decl in same]
+            edits.extend((style.inner_start + start, style.inner_start + end, '') for start, end in spans)
+    return edits
+
+
+def _link_edit(doc, href, names):
+    """Edit pointing the page at ``href``: its tokens.css link is rewritten,
+    or, when the page uses a token without linking the sheet, a link is
+    added before its first stylesheet."""
+    sheets = []
+    for el in doc.find('link', 'style'):
+        if el.tag == 'style' or doc.attrs(el).get('rel', '').lower() == 'stylesheet':
+            sheets.append(el)
+    for el in sheets:
+        if el.tag == 'link' and doc.attrs(el).get('href', '').startswith(TOKENS_CSS_PREFIX):
+            return el.start, el.end, f'<link rel="stylesheet" href="{href}">'
+    if not sheets or not any(match.group(1) in names for match in _VAR_RE.finditer(doc.html)):
+        return None
+    start, _, indent = doc.line_span(sheets[0])
+    return start, start, f'{indent}<link rel="stylesheet" href="{href}">\n'
+
+
+def tokens_stage(site):
+    tokens, themes = load_tokens()
+    href = site.add_asset('css', 'tokens', 'css', minify_css(compile_tokens(tokens, themes)) + '\n')
+    names = set(tokens)
+    for overrides in themes.values():
+        names.update(overrides)
+    for page in site.pages:
+        doc = site.document(page)
+        link = _link_edit(doc, href, names)
+        if link is None:
+            continue
+        # Declarations only go when the page is linked to the tokens.
+        site.splice(page, [link] + redundant_root_edits(doc, tokens))
+
+
+def write_tokens_css():
+    """Regenerate css/tokens.css; returns True when it changed."""
+    css = compile_tokens(*load_tokens())
+    path = os.path.join(FRONTEND_DIR, TOKENS_CSS)
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            if f.read() == css:
+                return False
+    except FileNotFoundError:
+        pass
+    atomic_write(path, css)
+    return True
+
+
+if __name__ == '__main__':
+    try:
+        changed = write_tokens_css()
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    print(f"✅ {TOKENS_CSS} {'regenerated' if changed else 'is up to date'}")
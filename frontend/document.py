@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Parse-once document model shared by the build stages.
+
+``Document(html)`` scans a page once and records, as offsets into the one
+``html`` string, the regions the stages care about:
+
+* raw-text elements (<style>, <script>, <pre>, <textarea>) with their inner
+  content range; their content is skipped, never scanned for tags;
+* <link> tags;
+* the <head> / <body> open and close tags (kept as separate markers, so a
+  fragment can be re-scanned on its own, see ``splice``).
+
+Comments are skipped, so a commented-out <style> is never picked up.
+Nothing is copied until a stage asks for a region's text.
+
+``splice(edits)`` applies several replacements in one pass and shifts the
+offsets of every region after them.  Only the inserted text is scanned, and
+not even that when it replaces the content of a <style>/<script>, so
+rewriting a style block costs O(block), not a re-parse of the page.
+"""
+
+import re
+
+RAW_TAGS = ('style', 'script', 'pre', 'textarea')
+VOID_TAGS = ('link',)
+MARKER_TAGS = ('head', 'body')
+
+_MARKUP_RE = re.compile(
+    r'<!--.*?(?:-->|\Z)'
+    r'|<(/?)([a-zA-Z][-a-zA-Z0-9]*)((?:[^>"\']|"[^"]*"|\'[^\']*\')*)>', re.S)
+_CLOSE_RES = {tag: re.compile(r'</%s\s*>' % tag, re.I) for tag in RAW_TAGS}
+_ATTR_RE = re.compile(r'([^\s=/>]+)(?:\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s>]+)))?')
+
+
+class Element:
+    """A region of the page: ``html[start:end]``; for raw-text elements the
+    content is ``html[inner_start:inner_end]``.  Markers use ``tag`` 'body'
+    / '/body' etc."""
+
+    __slots__ = ('tag', 'start', 'end', 'inner_start', 'inner_end', 'attrs_start', 'attrs_end')
+
+    def __init__(self, tag, start, end, inner_start, inner_end, attrs_start, attrs_end):
+        self.tag = tag
+        self.start = start
+        self.end = end
+        self.inner_start = inner_start
+        self.inner_end = inner_end
+        self.attrs_start = attrs_start
+        self.attrs_end = attrs_end
+
+    def __repr__(self):
+        return f'<Element {self.tag} {self.start}:{self.end}>'
+
+
+def tokenize(html, pos=0, endpos=None):
+    """Elements of ``html[pos:endpos]``, in document order, with offsets
+    into ``html``."""
+    endpos = len(html) if endpos is None else endpos
+    elements = []
+    while True:
+        match = _MARKUP_RE.search(html, pos, endpos)
+        if match is None:
+            return elements
+        pos = match.end()
+        if match.group(2) is None:
+            continue  # comment
+        closing, tag = match.group(1), match.group(2).lower()
+        attrs = (match.start(3), match.end(3))
+        if tag in MARKER_TAGS:
+            elements.append(Element(closing + tag, match.start(), pos, pos, pos, *attrs))
+        elif closing:
+            continue
+        elif tag in RAW_TAGS:
+            close = _CLOSE_RES[tag].search(html, pos, endpos)
+            inner_end = close.start() if close else endpos
+            end = close.end() if close else endpos
+            elements.append(Element(tag, match.start(), end, pos, inner_end, *attrs))
+            pos = end
+        elif tag in VOID_TAGS:
+            elements.append(Element(tag, match.start(), pos, pos, pos, *attrs))
+
+
+class Document:
+
+    def __init__(self, html):
+        self.html = html
+        self.elements = tokenize(html)
+
+    # ------------------------------------------------------------ queries
+
+    def find(self, *tags):
+        return [el for el in self.elements if el.tag in tags]
+
+    def first(self, tag):
+        return next((el for el in self.elements if el.tag == tag), None)
+
+    def outer(self, el):
+        return self.html[el.start:el.end]
+
+    def inner(self, el):
+        return self.html[el.inner_start:el.inner_end]
+
+    def attrs(self, el):
+        """Attributes of ``el``'s opening tag as a dict (lower-case names)."""
+        result = {}
+        for match in _ATTR_RE.finditer(self.html, el.attrs_start, el.attrs_end):
+            value = next((v for v in match.groups()[1:] if v is not None), '')
+            result.setdefault(match.group(1).lower(), value)
+        return result
+
+    def body_range(self):
+        """``(start, end)`` of the body element, or None without <body>.
+        A missing </body> extends the body to the end of the page."""
+        start = self.first('body')
+        if start is None:
+            return None
+        end = next((el for el in self.elements if el.tag == '/body' and el.start >= start.end), None)
+        return start.start, end.end if end else len(self.html)
+
+    def line_span(self, el):
+        """``(start, end, indent)``: ``el`` plus the blanks before it and the
+        blanks and line break after it, for removing it as a whole line."""
+        html = self.html
+        start, end = el.start, el.end
+        while start and html[start - 1] in ' \t':
+            start -= 1
+        while end < len(html) and html[end] in ' \t':
+            end += 1
+        if html.startswith('\n', end):
+            end += 1
+        return start, end, html[start:el.start]
+
+    def inline_scripts(self):
+        return [el for el in self.find('script') if 'src' not in self.attrs(el)]
+
+    # ------------------------------------------------------------ edits
+
+    def splice(self, edits):
+        """Apply ``[(start, end, text), ...]`` (non-overlapping) in one pass.
+
+        Elements an edit overlaps are dropped, unless the edit lies inside a
+        raw-text element's content, and the inserted text is scanned for new
+        elements (content of a raw-text element is not).
+        """
+        edits = sorted(edits, key=lambda e: (e[0], e[1]))
+        html = self.html
+        parts = []
+        last = 0
+        spans = []  # (old start, old end, new start, new end)
+        delta = 0
+        for start, end, text in edits:
+            if start < last:
+                raise ValueError('overlapping edits')
+            parts.append(html[last:start])
+            parts.append(text)
+            spans.append((start, end, start + delta, start + delta + len(text)))
+            delta += len(text) - (end - start)
+            last = end
+        parts.append(html[last:])
+        self.html = ''.join(parts)
+
+        def moved(pos, insert_before):
+            # ``insert_before``: whether text inserted exactly at ``pos``
+            # goes before it (true for element starts and content ends).
+            shift = 0
+            for start, end, new_start, new_end in spans:
+                if end < pos or (end == pos and (start < end or insert_before)):
+                    shift += (new_end - new_start) - (end - start)
+                else:
+                    break
+            return pos + shift
+
+        def in_content(el, start, end):
+            return el.tag in RAW_TAGS and el.inner_start <= start and end <= el.inner_end
+
+        elements = []
+        rescan = []
+        for start, end, new_start, new_end in spans:
+            if not any(in_content(el, start, end) for el in self.elements):
+                rescan.append((new_start, new_end))
+        for el in self.elements:
+            if any(not (end <= el.start or start >= el.end or in_content(el, start, end))
+                   for start, end, _, _ in spans):
+                continue
+            el.start, el.end = moved(el.start, True), moved(el.end, False)
+            if el.tag in RAW_TAGS:
+                el.inner_start, el.inner_end = moved(el.inner_start, False), moved(el.inner_end, True)
+            else:
+                el.inner_start = el.inner_end = el.end
+            el.attrs_start, el.attrs_end = moved(el.attrs_start, True), moved(el.attrs_end, True)
+            elements.append(el)
+        for new_start, new_end in rescan:
+            elements.extend(tokenize(self.html, new_start, new_end))
+        elements.sort(key=lambda el: el.start)
+        self.elements = elements
+        return self
@@ -0,0 +1,132 @@
+// Export worker: builds the analyzer exports (Cypress / JSON / CSV) off the
+// main thread. The file is written in small chunks that are folded into a
+// Blob as they fill up, so the worker never holds the whole output as one
+// string, and progress is posted while it runs.
+//
+//   in:  { format: 'cypress', codes }
+//        { format: 'json', website, timestamp, features, aiTests, customTests }
+//        { format: 'csv', customTests }
+//   out: { type: 'progress', done, total } ... then { type: 'done', blob }
+//        or { type: 'error', message }
+
+const CHUNK_SIZE = 64 * 1024;      // strings are joined into chunks of this size
+const BLOB_FOLD_SIZE = 1024 * 1024; // pending chunks are folded into the Blob past this
+const PROGRESS_INTERVAL = 100;      // ms between progress messages
+
+const MIME_TYPES = {
+  cypress: 'text/javascript',
+  json: 'application/json',
+  csv: 'text/csv'
+};
+
+// Accumulates the output: a Blob of what is done plus the pending strings.
+function createBlobWriter(type, total) {
+  let blob = new Blob([], { type });
+  let chunk = [];
+  let chunkSize = 0;
+  let pending = [];
+  let pendingSize = 0;
+  let done = 0;
+  let lastProgress = 0;
+
+  function flushChunk() {
+    if (!chunkSize) return;
+    pending.push(chunk.join(''));
+    pendingSize += chunkSize;
+    chunk = [];
+    chunkSize = 0;
+    if (pendingSize >= BLOB_FOLD_SIZE) foldPending();
+  }
+
+  function foldPending() {
+    // A Blob built from a Blob references its data instead of copying it
+    blob = new Blob([blob, ...pending], { type });
+    pending = [];
+    pendingSize = 0;
+  }
+
+  return {
+    write(text) {
+      chunk.push(text);
+      chunkSize += text.length;
+      if (chunkSize >= CHUNK_SIZE) flushChunk();
+    },
+    // Count one exported item and report progress now and then
+    item() {
+      done++;
+      const now = Date.now();
+      if (now - lastProgress >= PROGRESS_INTERVAL) {
+        lastProgress = now;
+        self.postMessage({ type: 'progress', done, total });
+      }
+    },
+    close() {
+      flushChunk();
+      foldPending();
+      self.postMessage({ type: 'progress', done: total, total });
+      return blob;
+    }
+  };
+}
+
+function exportCypress({ codes }, out) {
+  codes.forEach((code, i) => {
+    if (i) out.write('\n\n// ===== NEXT TEST =====\n\n');
+    out.write(code);
+    out.item();
+  });
+}
+
+// Same text as JSON.stringify(data, null, 2), one array element at a time
+function exportJSON({ website, timestamp, features, aiTests, customTests }, out) {
+  const indent = json => json.replace(/\n/g, '\n    ');
+  const writeArray = (key, items, last) => {
+    out.write(`  ${JSON.stringify(key)}: `);
+    if (!items.length) {
+      out.write('[]');
+    } else {
+      out.write('[\n');
+      items.forEach((item, i) => {
+        out.write('    ' + indent(JSON.stringify(item, null, 2)) + (i < items.length - 1 ? ',\n' : '\n'));
+        out.item();
+      });
+      out.write('  ]');
+    }
+    out.write(last ? '\n' : ',\n');
+  };
+
+  out.write('{\n');
+  out.write(`  "website": ${JSON.stringify(website)},\n`);
+  out.write(`  "timestamp": ${JSON.stringify(timestamp)},\n`);
+  writeArray('features', features, false);
+  writeArray('aiTests', aiTests, false);
+  writeArray('customTests', customTests, true);
+  out.write('}');
+}
+
+function exportCSV({ customTests }, out) {
+  const field = value => `"${String(value ?? '').replace(/"/g, '""')}"`;
+  out.write('Name,Type,Priority,Steps,Code\n');
+  customTests.forEach(t => {
+    out.write([t.name, t.type, t.priority, t.steps, t.code].map(field).join(',') + '\n');
+    out.item();
+  });
+}
+
+const EXPORTERS = {
+  cypress: [exportCypress, job => job.codes.length],
+  json: [exportJSON, job => job.features.length + job.aiTests.length + job.customTests.length],
+  csv: [exportCSV, job => job.customTests.length]
+};
+
+self.onmessage = ({ data: job }) => {
+  try {
+    if (!EXPORTERS[job.format]) throw new Error(`Unknown export format: ${job.format}`);
+    const [run, count] = EXPORTERS[job.format];
+    const out = createBlobWriter(MIME_TYPES[job.format], count(job));
+    run(job, out);
+    self.postMessage({ type: 'done', blob: out.close() });
+  } catch (error) {
+    self.postMessage({ type: 'error', message: error.message });
+  }
+};
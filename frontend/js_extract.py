@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Dist stage: move the inline page scripts into cached, deferred files.
+
+Every page carries its runtime as one parser-blocking inline <script>, and
+helpers such as ``logout`` or ``goTo`` are repeated on several pages.  This
+stage splits each inline script into its top-level function declarations
+and the rest of its code:
+
+* a function declared identically on several pages goes into a shared
+  ``js/shared.<hash>.js`` chunk (one per set of pages using it, like
+  css_extract's chunks, and only once it reaches SHARED_CHUNK_MIN_BYTES);
+* the rest of each page's script goes into ``js/<page>.<hash>.js``.
+
+The inline block is replaced by ``<script src=... defer>`` tags, shared
+chunks first.  They stay classic scripts rather than ES modules: the pages
+call their functions from inline ``onclick`` attributes, and a module would
+hide its top-level functions and ``let`` variables from them.  Deferred
+classic scripts share one global scope and run in order, before
+DOMContentLoaded, like the inline code they replace.
+
+Function declarations are hoisted, so loading a page's shared functions
+before the rest of its code changes nothing.  A function is only shared when
+its page declares that name once and the script has no "use strict"
+prologue (which the moved function would lose).
+
+Rarely used features listed in LAZY_CHUNKS are split off into on-demand ES
+modules (``js/<page>-<chunk>.<hash>.js``).  Each function is replaced by a
+stub that loads its chunk with dynamic ``import()`` on the first call and
+forwards the arguments (a submit event is prevented right away, since the
+real handler only runs once the chunk is in).  The chunks are prefetched
+with ``<link rel="modulepreload">`` once the browser is idle.  Module code
+runs in strict mode and sees the page's global functions and ``let``
+variables, so the moved functions keep working unchanged.
+"""
+
+import json
+import os
+import re
+
+from minify import _is_word, _regex_allowed, _scan_regex, _scan_string, _scan_template, minify_js
+
+# Shared chunks smaller than this stay in the page scripts.
+SHARED_CHUNK_MIN_BYTES = 512
+
+# Page -> {chunk name: [top-level functions loaded on demand]}.  Only code
+# the page's startup (the analyze flow) never calls belongs here.
+LAZY_CHUNKS = {
+    'website-analyzer.html': {
+        'export': ['exportCypressTests', 'exportAsJSON', 'exportAsCSV', 'runExport', 'downloadBlob'],
+        'run': ['executeTests', 'handleTestRunEvent', 'displayTestResults', 'resetTestResults',
+                'appendTestResult', 'updateTestCounters', 'finishTestResults'],
+        'custom-tests': ['addCustomTestCase', 'deleteCustomTestCase'],
+    },
+}
+
+# Loader prepended to a page script with lazy chunks; %s is the JSON list
+# of chunk URLs.
+_LAZY_RUNTIME = """
+const __lazyChunks = %s;
+const __lazyModules = {};
+function __lazy(chunk, name, args) {
+    if (args[0] instanceof Event && args[0].type === 'submit') args[0].preventDefault();
+    if (!__lazyModules[chunk]) {
+        __lazyModules[chunk] = import(new URL(__lazyChunks[chunk], document.baseURI).href)
+            .catch(error => { delete __lazyModules[chunk]; throw error; });
+    }
+    return __lazyModules[chunk].then(module => module[name](...args));
+}
+(window.requestIdleCallback || (callback => setTimeout(callback, 2000)))(() => {
+    __lazyChunks.forEach(href => {
+        const link = document.createElement('link');
+        link.rel = 'modulepreload';
+        link.href = href;
+        document.head.appendChild(link);
+    });
+});
+"""
+
+_USE_STRICT_RE = re.compile(r'\s*(?://[^\n]*\s*|/\*.*?\*/\s*)*["\']use strict["\']', re.S)
+_CLASSIC_TYPES = ('text/javascript', 'application/javascript', '')
+# Tokens after which a line break cannot end the previous statement.
+_CONTINUES = set('=(,:?&|+-*/%<>![{.~^')
+
+
+def js_tokens(js):
+    """Yield ``(start, end)`` of every token of ``js``; comments and
+    whitespace are skipped, strings, template and regex literals are
+    single tokens."""
+    recent = []
+    i, n = 0, len(js)
+    while i < n:
+        ch = js[i]
+        if ch in ' \t\r\n':
+            i += 1
+            continue
+        if js.startswith('//', i):
+            j = js.find('\n', i)
+            i = n if j == -1 else j
+            continue
+        if js.startswith('/*', i):
+            j = js.find('*/', i + 2)
+            i = n if j == -1 else j + 2
+            continue
+        if ch in '"\'':
+            j = _scan_string(js, i)
+        elif ch == '`':
+            j = _scan_template(js, i)
+        elif ch == '/' and _regex_allowed(recent):
+            j = _scan_regex(js, i)
+        elif _is_word(ch):
+            j = i + 1
+            while j < n and _is_word(js[j]):
+                j += 1
+        else:
+            j = i + 1
+        recent = recent[-2:] + [js[i:j]]
+        yield i, min(j, n)
+        i = j
+
+
+def split_functions(js):
+    """Split ``js`` into ``[(name, text), ...]``: its top-level function
+    declarations (``name`` set) and the code between them (``name`` None),
+    in source order; joining the texts gives ``js`` back."""
+    pieces = []
+    tokens = list(js_tokens(js))
+    depth = 0
+    last = 0  # end of the previous piece
+    prev = None  # previous token at depth 0, with its end offset
+    idx = 0
+    while idx < len(tokens):
+        start, end = tokens[idx]
+        token = js[start:end]
+        if depth == 0 and token in ('function', 'async') and _statement_start(js, prev, start):
+            func = _function_at(js, tokens, idx)
+            if func is not None:
+                name, end_idx = func
+                func_end = tokens[end_idx][1]
+                pieces.append((None, js[last:start]))
+                pieces.append((name, js[start:func_end]))
+                last = func_end
+                prev = ('}', func_end)
+                idx = end_idx + 1
+                continue
+        if token in ('(', '[', '{'):
+            depth += 1
+        elif token in (')', ']', '}'):
+            depth -= 1
+        if depth == 0:
+            prev = (token, end)
+        idx += 1
+    pieces.append((None, js[last:]))
+    return [(name, text) for name, text in pieces if name or text]
+
+
+def _statement_start(js, prev, start):
+    if prev is None:
+        return True
+    token, end = prev
+    if token in (';', '}'):
+        return True
+    return '\n' in js[end:start] and token[-1] not in _CONTINUES
+
+
+def _function_at(js, tokens, idx):
+    """``(name, index of the closing brace token)`` of the function
+    declaration starting at token ``idx``, or None."""
+    words = [js[s:e] for s, e in tokens[idx:idx + 4]]
+    if words[:2] == ['async', 'function']:
+        idx += 1
+        words = words[1:]
+    if len(words) < 3 or words[0] != 'function':
+        return None
+    skip = 2 if words[1] == '*' else 1  # generator functions
+    name_idx = idx + skip
+    if name_idx >= len(tokens):
+        return None
+    name = js[tokens[name_idx][0]:tokens[name_idx][1]]
+    if not _is_word(name[0]):
+        return None
+    depth = 0
+    in_body = False
+    for i in range(name_idx + 1, len(tokens)):
+        token = js[tokens[i][0]:tokens[i][1]]
+        if token == '{' and depth == 0:
+            in_body = True
+        if token in ('(', '[', '{'):
+            depth += 1
+        elif token in (')', ']', '}'):
+            depth -= 1
+            if depth == 0 and in_body:
+                return name, i
+    return None
+
+
+def _plan_chunks(page_functions):
+    """Functions declared identically by several pages, grouped by the set
+    of pages: ``[(pages, [text, ...]), ...]`` in first-appearance order."""
+    users = {}
+    first_seen = {}
+    for page_idx, (page, functions) in enumerate(page_functions.items()):
+        for func_idx, text in enumerate(functions):
+            users.setdefault(text, set()).add(page)
+            first_seen.setdefault(text, (page_idx, func_idx))
+    groups = {}
+    for text, pages in users.items():
+        if len(pages) > 1:
+            groups.setdefault(frozenset(pages), []).append(text)
+    chunks = []
+    for pages, texts in groups.items():
+        texts.sort(key=lambda t: first_seen[t])
+        if sum(len(t) for t in texts) >= SHARED_CHUNK_MIN_BYTES:
+            chunks.append((first_seen[texts[0]], pages, texts))
+    chunks.sort(key=lambda c: c[0])
+    return [(pages, texts) for _, pages, texts in chunks]
+
+
+def _page_scripts(doc):
+    """The page's inline classic scripts."""
+    return [script for script in doc.inline_scripts()
+            if doc.inner(script).strip()
+            and doc.attrs(script).get('type', 'text/javascript').lower() in _CLASSIC_TYPES]
+
+
+def _split_lazy(site, stem, page_pieces, lazy):
+    """Move the ``lazy`` functions (name -> chunk) into on-demand module
+    chunks; returns ``page_pieces`` with stubs in their place and the loader
+    in front of the first script that lost a function."""
+    if not lazy:
+        return page_pieces
+    chunk_names = sorted(set(lazy.values()), key=list(lazy.values()).index)
+    modules = {chunk: [] for chunk in chunk_names}
+    result = []
+    for pieces in page_pieces:
+        kept = []
+        for name, text in pieces:
+            chunk = lazy.get(name)
+            if chunk is None:
+                kept.append((name, text))
+                continue
+            modules[chunk].append('export ' + text)
+            kept.append((None, f"function {name}(...args){{return __lazy({chunk_names.index(chunk)},'{name}',args);}}"))
+        result.append(kept)
+    hrefs = [site.add_asset('js', f'{stem}-{chunk}', 'js', '\n'.join(modules[chunk]) + '\n')
+             for chunk in chunk_names]
+    runtime = minify_js(_LAZY_RUNTIME % json.dumps(hrefs)) + '\n'
+    for kept, pieces in zip(result, page_pieces):
+        if kept != pieces:
+            kept.insert(0, (None, runtime))
+            break
+    return result
+
+
+def extract_stage(site):
+    page_scripts = {}
+    page_pieces = {}
+    page_lazy = {}
+    shareable = {}
+    for page in site.pages:
+        doc = site.document(page)
+        scripts = _page_scripts(doc)
+        if not scripts:
+            continue
+        page_scripts[page] = scripts
+        pieces = [split_functions(doc.inner(script)) for script in scripts]
+        page_pieces[page] = pieces
+        names = [name for script_pieces in pieces for name, _ in script_pieces if name]
+        lazy = {name: chunk for chunk, functions in LAZY_CHUNKS.get(page, {}).items()
+                for name in functions if names.count(name) == 1}
+        page_lazy[page] = lazy
+        strict = any(_USE_STRICT_RE.match(doc.inner(script)) for script in scripts)
+        shareable[page] = [] if strict else [
+            text for script_pieces in pieces for name, text in script_pieces
+            if name and names.count(name) == 1 and name not in lazy]
+
+    chunks = _plan_chunks(shareable)
+    chunk_hrefs = [site.add_asset('js', 'shared', 'js', '\n'.join(texts) + '\n') for _, texts in chunks]
+
+    for page, scripts in page_scripts.items():
+        doc = site.document(page)
+        shared = set()
+        hrefs = []
+        for href, (pages, texts) in zip(chunk_hrefs, chunks):
+            if page in pages:
+                shared.update(texts)
+                hrefs.append(href)
+        stem = os.path.splitext(page)[0]
+        pieces_list = _split_lazy(site, stem, page_pieces[page], page_lazy[page])
+        edits = []
+        for script, pieces in zip(scripts, pieces_list):
+            code = ''.join(text for name, text in pieces if not (name and text in shared)).strip()
+            tags = [f'<script src="{href}" defer></script>' for href in hrefs]
+            if code:
+                href = site.add_asset('js', stem, 'js', code + '\n')
+                tags.append(f'<script src="{href}" defer></script>')
+            edits.append((script.start, script.end, ''.join(tags)))
+            hrefs = []  # the shared chunks are loaded once, before the first script
+        site.splice(page, edits)
@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Dist stages: pure-Python minification and per-page size budgets.
+
+The minifiers are deliberately conservative; they only remove what cannot
+change behaviour:
+
+* CSS: comments and insignificant whitespace.
+* JS: comments, indentation, blank lines and spaces around punctuation.
+  Strings, template literals and regex literals are copied verbatim, and
+  line breaks that automatic semicolon insertion may rely on are kept.
+* HTML: comments and runs of whitespace between tags (collapsed, as the
+  browser would render them).  <pre>/<textarea> are left alone; inline
+  <style>/<script> go through the CSS/JS minifiers.
+
+``budget_stage`` fails the build when a page is larger than its budget.
+"""
+
+import re
+
+from build_engine import BuildError
+from document import RAW_TAGS, Document
+
+# Max size in bytes of each dist page (HTML only, after every stage).
+PAGE_BUDGETS = {
+    'test-creation.html': 100 * 1024,
+    'website-analyzer.html': 24 * 1024,
+}
+DEFAULT_PAGE_BUDGET = 32 * 1024
+
+
+class BudgetExceeded(BuildError):
+    pass
+
+
+# ---------------------------------------------------------------- CSS
+
+_CSS_TOKEN_RE = re.compile(r'"(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\'|/\*.*?\*/|\s+|[^"\'/\s]+|/', re.S)
+_CSS_TIGHT_AFTER = set('{};:,>')
+_CSS_TIGHT_BEFORE = set('{};,>)')
+
+
+def minify_css(css):
+    out = []
+    tokens = _CSS_TOKEN_RE.findall(css)
+    for i, token in enumerate(tokens):
+        if token.startswith('/*'):
+            continue
+        if token.isspace():
+            prev = out[-1][-1] if out else ''
+            nxt = next((t for t in tokens[i + 1:] if not t.startswith('/*') and not t.isspace()), '')
+            if not prev or not nxt or prev in _CSS_TIGHT_AFTER or nxt[0] in _CSS_TIGHT_BEFORE:
+                continue
+            if out[-1] != ' ':
+                out.append(' ')
+            continue
+        out.append(token)
+    return ''.join(out).replace(';}', '}').strip()
+
+
+# ---------------------------------------------------------------- JS
+
+# Line breaks after these can never end a statement.
+_JS_JOIN_AFTER = set('{;,([=:?&|')
+_JS_JOIN_BEFORE = set('}),];.:?')
+_REGEX_PREV_KEYWORDS = {'return', 'typeof', 'case', 'do', 'else', 'in', 'of', 'new', 'delete',
+                        'void', 'throw', 'instanceof', 'yield', 'await'}
+
+
+def _scan_string(js, i):
+    quote = js[i]
+    j = i + 1
+    while j < len(js) and js[j] != quote:
+        if js[j] == '\\':
+            j += 1
+        elif js[j] == '\n':
+            break
+        j += 1
+    return j + 1
+
+
+def _scan_template(js, i):
+    """End index of the template literal starting at ``js[i] == '`'``."""
+    j = i + 1
+    while j < len(js):
+        ch = js[j]
+        if ch == '\\':
+            j += 2
+            continue
+        if ch == '`':
+            return j + 1
+        if ch == '$' and js.startswith('${', j):
+            j = _scan_code_block(js, j + 2)
+            continue
+        j += 1
+    return j
+
+
+def _scan_code_block(js, i):
+    """Skip JS code inside ``${ ... }``; returns the index after the '}'."""
+    depth = 1
+    j = i
+    while j < len(js):
+        ch = js[j]
+        if ch in '"\'':
+            j = _scan_string(js, j)
+            continue
+        if ch == '`':
+            j = _scan_template(js, j)
+            continue
+        if ch == '{':
+            depth += 1
+        elif ch == '}':
+            depth -= 1
+            if depth == 0:
+                return j + 1
+        j += 1
+    return j
+
+
+def _scan_regex(js, i):
+    j = i + 1
+    in_class = False
+    while j < len(js) and js[j] != '\n':
+        ch = js[j]
+        if ch == '\\':
+            j += 2
+            continue
+        if ch == '[':
+            in_class = True
+        elif ch == ']':
+            in_class = False
+        elif ch == '/' and not in_class:
+            j += 1
+            while j < len(js) and (js[j].isalnum() or js[j] == '_'):
+                j += 1
+            return j
+        j += 1
+    return j
+
+
+def _is_word(ch):
+    return ch.isalnum() or ch in '_$'
+
+
+def _needs_space(prev, first):
+    """Must a space separate two adjacent tokens?"""
+    return (_is_word(prev) and _is_word(first)) or (prev in '+-/' and first == prev)
+
+
+def _regex_allowed(out):
+    """Can a '/' at this point start a regex literal (vs. a division)?"""
+    text = ''.join(out[-3:]).rstrip()
+    if not text:
+        return True
+    if text[-1] in '(,=:[!&|?{};+-*%<>~^':
+        return True
+    word = re.search(r'[A-Za-z_$][\w$]*$', text)
+    return bool(word) and word.group(0) in _REGEX_PREV_KEYWORDS
+
+
+def minify_js(js):
+    out = []
+    pending = ''  # whitespace seen since the last token: '', ' ' or '\n'
+    i = 0
+    n = len(js)
+
+    def emit(token):
+        nonlocal pending
+        if pending and out:
+            prev, first = out[-1][-1], token[0]
+            if pending == '\n' and prev not in _JS_JOIN_AFTER and first not in _JS_JOIN_BEFORE:
+                out.append('\n')
+            elif _needs_space(prev, first):
+                out.append(' ')
+        pending = ''
+        out.append(token)
+
+    while i < n:
+        ch = js[i]
+        if ch in ' \t\r\n':
+            j = i
+            while j < n and js[j] in ' \t\r\n':
+                j += 1
+            pending = '\n' if '\n' in js[i:j] or pending == '\n' else ' '
+            i = j
+        elif js.startswith('//', i):
+            j = js.find('\n', i)
+            i = n if j == -1 else j
+        elif js.startswith('/*', i):
+            j = js.find('*/', i + 2)
+            # A multi-line comment separates statements like a line break.
+            if '\n' in js[i:j]:
+                pending = '\n'
+            elif not pending:
+                pending = ' '
+            i = n if j == -1 else j + 2
+        elif ch in '"\'':
+            j = _scan_string(js, i)
+            emit(js[i:j])
+            i = j
+        elif ch == '`':
+            j = _scan_template(js, i)
+            emit(js[i:j])
+            i = j
+        elif ch == '/' and _regex_allowed(out):
+            j = _scan_regex(js, i)
+            emit(js[i:j])
+            i = j
+        else:
+            j = i + 1
+            if _is_word(ch):
+                while j < n and _is_word(js[j]):
+                    j += 1
+            emit(js[i:j])
+            i = j
+    return ''.join(out).strip()
+
+
+# ---------------------------------------------------------------- HTML
+
+_HTML_COMMENT_RE = re.compile(r'<!--(?!\[if).*?-->', re.S)
+_TAG_OR_TEXT_RE = re.compile(r'<[^>]*>|[^<]+|<', re.S)
+_WS_RUN_RE = re.compile(r'\s+')
+_JS_TYPE_RE = re.compile(r'\btype\s*=\s*["\']?(?!module\b|text/javascript\b|application/javascript\b)', re.I)
+
+
+def _collapse_text(text):
+    return _WS_RUN_RE.sub(lambda m: '\n' if '\n' in m.group(0) else ' ', text)
+
+
+def _minify_markup(html):
+    html = _HTML_COMMENT_RE.sub('', html)
+    return ''.join(part if part.startswith('<') else _collapse_text(part)
+                   for part in _TAG_OR_TEXT_RE.findall(html))
+
+
+def minify_edits(doc):
+    """Document.splice edits minifying the page: the markup between the
+    raw-text elements, and the content of inline <style>/<script>."""
+    html = doc.html
+    edits = []
+    last = 0
+    raw = [el for el in doc.elements if el.tag in RAW_TAGS]
+    for el in raw:
+        edits.append((last, el.start, _minify_markup(html[last:el.start])))
+        body = doc.inner(el)
+        if el.tag == 'style':
+            edits.append((el.inner_start, el.inner_end, minify_css(body)))
+        elif (el.tag == 'script' and body.strip()
+              and not _JS_TYPE_RE.search(html, el.attrs_start, el.attrs_end)):
+            edits.append((el.inner_start, el.inner_end, minify_js(body)))
+        last = el.end
+    edits.append((last, len(html), _minify_markup(html[last:])))
+    # Strip the page as a whole: leading / trailing markup only.
+    start, end, text = edits[0]
+    edits[0] = (start, end, text.lstrip())
+    start, end, text = edits[-1]
+    edits[-1] = (start, end, text.rstrip() + '\n')
+    return edits
+
+
+def minify_html(html):
+    doc = Document(html)
+    return doc.splice(minify_edits(doc)).html
+
+
+# ---------------------------------------------------------------- stages
+
+def minify_stage(site):
+    # Runs before css_extract, so extracted assets are fingerprinted minified.
+    for page in site.pages:
+        site.splice(page, minify_edits(site.document(page)))
+
+
+def budget_stage(site):
+    over = []
+    for page, html in sorted(site.pages.items()):
+        size = len(html.encode('utf-8'))
+        budget = PAGE_BUDGETS.get(page, DEFAULT_PAGE_BUDGET)
+        if size > budget:
+            over.append(f"{page}: {size} bytes > budget {budget} bytes")
+    if over:
+        raise BudgetExceeded('Page size budget exceeded:\n  ' + '\n  '.join(over))
@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Precompressed ``.gz`` / ``.br`` siblings for dist files.
+
+build_dist asks ``encoders`` which siblings a file should get and only
+calls the (slow, maximum-level) compressor when the file's hash changed or
+the sibling is missing.  Brotli is optional: without the ``brotli`` package
+only ``.gz`` files are produced.
+"""
+
+import gzip
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+COMPRESSIBLE_EXTS = ('.html', '.css', '.js', '.mjs', '.json', '.svg', '.txt')
+# Below this the headers cost more than compression saves.
+MIN_SIZE = 256
+
+
+def _gzip(data):
+    # mtime=0 keeps the output byte-identical for identical input.
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def _brotli(data):
+    return brotli.compress(data, quality=11)
+
+
+def encoders(rel, size):
+    """``[(suffix, compress), ...]`` to apply to the dist file ``rel``."""
+    if size < MIN_SIZE or not rel.lower().endswith(COMPRESSIBLE_EXTS):
+        return []
+    result = [('.gz', _gzip)]
+    if brotli is not None:
+        result.append(('.br', _brotli))
+    return result
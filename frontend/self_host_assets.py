@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Dist stage: self-host and subset Google Fonts / Font Awesome.
+
+The pages link ``fonts.googleapis.com`` and cdnjs' full Font Awesome
+``all.min.css``, which block first paint and break offline QA.  This stage
+replaces those links with local, fingerprinted files:
+
+* Google Fonts: only the @font-face blocks of weights the site's CSS (and
+  Tailwind ``font-*`` classes) actually uses; the woff2 files are copied to
+  ``dist/fonts/``.  Text fonts are not glyph-subset (API content can contain
+  any character); their unicode-range split already limits downloads.
+* Font Awesome: only the ``fa-*`` rules for icons found in the markup and
+  scripts (``getFeatureIcon``, nav ...), the @font-face of the styles in use,
+  and, when fontTools is installed, webfonts subset to those glyphs.
+
+The upstream files come from ``frontend/vendor/``, filled once on a machine
+with network access:
+
+    python self_host_assets.py --fetch
+
+Links whose files are not in the vendor cache are left untouched.
+"""
+
+import argparse
+import io
+import json
+import os
+import re
+import sys
+import urllib.parse
+import urllib.request
+
+from build_engine import FRONTEND_DIR, atomic_write, content_hash
+from css_rules import split_block, split_selectors, split_statements
+from document import Document
+from minify import minify_css
+
+try:
+    from fontTools import subset as font_subset
+    from fontTools.ttLib import TTFont
+except ImportError:  # optional dependency
+    font_subset = None
+
+VENDOR_DIR = os.path.join(FRONTEND_DIR, 'vendor')
+VENDOR_INDEX = os.path.join(VENDOR_DIR, 'index.json')
+# Changing the vendor cache must invalidate the dist build.
+STAGE_INPUTS = [VENDOR_INDEX]
+
+# Google serves woff2 only to browsers it recognises.
+FETCH_USER_AGENT = ('Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+                    '(KHTML, like Gecko) Chrome/120.0 Safari/537.36')
+
+_CDN_URL_RE = re.compile(r'https://(?:fonts\.googleapis\.com/css2?\?|cdnjs\.cloudflare\.com/ajax/libs/font-awesome/)', re.I)
+_URL_RE = re.compile(r'url\(\s*([\'"]?)([^\'")]+)\1\s*\)')
+_ICON_RE = re.compile(r'(?<![-\w])fa-[a-z0-9]+(?:-[a-z0-9]+)*')
+_FA_CLASS_RE = re.compile(r'\.(fa-[a-z0-9-]+)')
+_FONT_WEIGHT_RE = re.compile(r'font-weight\s*:\s*([a-z0-9]+)', re.I)
+_CONTENT_RE = re.compile(r'content\s*:\s*["\']\\([0-9a-fA-F]+)["\']')
+
+_NAMED_WEIGHTS = {'normal': 400, 'bold': 700}
+_TAILWIND_WEIGHTS = {
+    'font-thin': 100, 'font-extralight': 200, 'font-light': 300, 'font-normal': 400,
+    'font-medium': 500, 'font-semibold': 600, 'font-bold': 700, 'font-extrabold': 800,
+    'font-black': 900,
+}
+# Elements the browser renders bold by default.
+_BOLD_TAGS_RE = re.compile(r'<(?:b|strong|th|h[1-6])\b', re.I)
+
+# Font Awesome style class -> webfont it needs.
+_FA_STYLE_FONTS = {
+    'fa-solid-900': ('fa', 'fas', 'fa-solid'),
+    'fa-regular-400': ('far', 'fa-regular'),
+    'fa-brands-400': ('fab', 'fa-brands'),
+}
+
+
+# ---------------------------------------------------------------- vendor cache
+
+def load_vendor_index():
+    try:
+        with open(VENDOR_INDEX, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def _vendor_read(name):
+    with open(os.path.join(VENDOR_DIR, name), 'rb') as f:
+        return f.read()
+
+
+def _download(url):
+    request = urllib.request.Request(url, headers={'User-Agent': FETCH_USER_AGENT})
+    with urllib.request.urlopen(request, timeout=30) as response:
+        return response.read()
+
+
+def _vendor_name(url):
+    path = urllib.parse.urlparse(url).path
+    ext = os.path.splitext(path)[1] or '.css'
+    return content_hash(url, 12) + ext
+
+
+def fetch(urls):
+    """Download ``urls`` and the fonts they reference into vendor/."""
+    os.makedirs(VENDOR_DIR, exist_ok=True)
+    index = load_vendor_index()
+    for url in urls:
+        print(f"⬇️  {url}")
+        css = _download(url)
+        entry = {'file': _vendor_name(url), 'resources': {}}
+        atomic_write(os.path.join(VENDOR_DIR, entry['file']), css)
+        for _, ref in _URL_RE.findall(css.decode('utf-8')):
+            absolute = urllib.parse.urljoin(url, ref.split('#')[0].split('?')[0])
+            if absolute in entry['resources'] or absolute.startswith('data:'):
+                continue
+            name = _vendor_name(absolute)
+            atomic_write(os.path.join(VENDOR_DIR, name), _download(absolute))
+            entry['resources'][absolute] = name
+        index[url] = entry
+    atomic_write(VENDOR_INDEX, json.dumps(index, indent=2, sort_keys=True) + '\n')
+
+
+# ---------------------------------------------------------------- usage scan
+
+def page_texts(site, page):
+    """The page's HTML and every js asset it loads, directly or through
+    another script (lazy chunks), since icon classes and bold markup may only
+    appear in scripts once js_extract moved them out of the page."""
+    texts = [site.pages[page]]
+    scripts = [name for name in site.assets if name.endswith('.js')]
+    seen = set()
+    i = 0
+    while i < len(texts):
+        for name in scripts:
+            if name not in seen and name in texts[i]:
+                seen.add(name)
+                texts.append(site.assets[name])
+        i += 1
+    return texts
+
+
+def used_icons(pages):
+    icons = set()
+    for html in pages:
+        icons.update(_ICON_RE.findall(html))
+    return icons
+
+
+def used_weights(site, pages):
+    weights = {400}
+    texts = list(pages) + [c for name, c in site.assets.items() if name.endswith('.css')]
+    for text in texts:
+        for value in _FONT_WEIGHT_RE.findall(text):
+            value = value.lower()
+            if value.isdigit():
+                weights.add(int(value))
+            elif value in _NAMED_WEIGHTS:
+                weights.add(_NAMED_WEIGHTS[value])
+    for html in pages:
+        weights.update(w for cls, w in _TAILWIND_WEIGHTS.items()
+                       if re.search(r'(?<![-\w])%s(?![-\w])' % cls, html))
+        if _BOLD_TAGS_RE.search(html):
+            weights.add(700)
+    return weights
+
+
+# ---------------------------------------------------------------- rewriting
+
+def _rewrite_urls(site, css, base_url, entry, glyphs=None):
+    """Point url(...) references at fingerprinted copies in dist/fonts/."""
+    def repl(match):
+        absolute = urllib.parse.urljoin(base_url, match.group(2))
+        name = entry['resources'].get(absolute.split('#')[0].split('?')[0])
+        if name is None:
+            return match.group(0)
+        data = _vendor_read(name)
+        stem = os.path.splitext(os.path.basename(urllib.parse.urlparse(absolute).path))[0]
+        if glyphs and font_subset is not None:
+            data = subset_font(data, glyphs)
+        href = site.add_asset('fonts', stem, os.path.splitext(name)[1].lstrip('.'), data)
+        return f'url(../{href})'
+    return _URL_RE.sub(repl, css)
+
+
+def subset_font(data, codepoints):
+    """Subset a font file to ``codepoints``, keeping its format."""
+    font = TTFont(io.BytesIO(data))
+    flavor = font.flavor
+    subsetter = font_subset.Subsetter(font_subset.Options())
+    subsetter.populate(unicodes=codepoints)
+    subsetter.subset(font)
+    font.flavor = flavor
+    out = io.BytesIO()
+    font.save(out)
+    return out.getvalue()
+
+
+def google_fonts_css(site, url, entry, weights):
+    statements = []
+    for stmt in split_statements(_vendor_read(entry['file']).decode('utf-8')):
+        if stmt.lower().startswith('@font-face'):
+            match = _FONT_WEIGHT_RE.search(stmt)
+            if match and match.group(1).isdigit() and int(match.group(1)) not in weights:
+                continue
+        statements.append(stmt)
+    return _rewrite_urls(site, '\n'.join(statements), url, entry)
+
+
+def _icon_rule_used(prelude, icons):
+    for selector in split_selectors(prelude):
+        classes = _FA_CLASS_RE.findall(selector)
+        if all(cls in icons for cls in classes):
+            return True
+    return False
+
+
+def _filter_icon_rules(statements, icons):
+    kept = []
+    for stmt in statements:
+        prelude, body = split_block(stmt)
+        lowered = prelude.lower()
+        if body is None or lowered.startswith('@font-face') or lowered.startswith('@keyframes'):
+            kept.append(stmt)
+        elif lowered.startswith(('@media', '@supports')):
+            inner = _filter_icon_rules(split_statements(body), icons)
+            if inner:
+                kept.append(prelude + '{' + ''.join(inner) + '}')
+        elif lowered.startswith('@') or _icon_rule_used(prelude, icons):
+            kept.append(stmt)
+    return kept
+
+
+def icons_css(site, url, entry, icons):
+    statements = _filter_icon_rules(
+        split_statements(_vendor_read(entry['file']).decode('utf-8')), icons)
+    needed_fonts = {font for font, classes in _FA_STYLE_FONTS.items() if icons & set(classes)}
+    kept = []
+    for stmt in statements:
+        if stmt.lower().startswith('@font-face'):
+            font = next((f for f in _FA_STYLE_FONTS if f in stmt), None)
+            if font is None or font not in needed_fonts:
+                continue
+        kept.append(stmt)
+    css = '\n'.join(kept)
+    glyphs = {int(cp, 16) for cp in _CONTENT_RE.findall(css)}
+    return _rewrite_urls(site, css, url, entry, glyphs=glyphs)
+
+
+def _cdn_links(doc):
+    """``[(link element, url), ...]`` of the Google Fonts / Font Awesome links."""
+    links = []
+    for link in doc.find('link'):
+        href = doc.attrs(link).get('href', '')
+        if _CDN_URL_RE.match(href):
+            links.append((link, href.replace('&amp;', '&')))
+    return links
+
+
+def self_host_stage(site):
+    index = load_vendor_index()
+    users = {}
+    for page in site.pages:
+        for _, url in _cdn_links(site.document(page)):
+            users.setdefault(url, []).append(page)
+
+    local = {}
+    missing = []
+    for url, pages in sorted(users.items()):
+        entry = index.get(url)
+        if entry is None:
+            missing.append(url)
+            continue
+        htmls = [text for p in pages for text in page_texts(site, p)]
+        if 'font-awesome' in url:
+            css = icons_css(site, url, entry, {'fa'} | used_icons(htmls))
+            local[url] = site.add_asset('css', 'icons', 'css', minify_css(css))
+        else:
+            css = google_fonts_css(site, url, entry, used_weights(site, htmls))
+            local[url] = site.add_asset('css', 'fonts', 'css', minify_css(css))
+
+    for page in site.pages:
+        doc = site.document(page)
+        edits = []
+        for link, url in _cdn_links(doc):
+            href = local.get(url)
+            if href is not None:
+                start, end, indent = doc.line_span(link)
+                edits.append((max(start, edits[-1][1]) if edits else start, end,
+                              f'{indent}<link rel="stylesheet" href="{href}">\n'))
+        site.splice(page, edits)
+
+    if missing:
+        print(f"⚠️  {len(missing)} font/icon stylesheet(s) not in vendor/, still loaded from the CDN "
+              f"(run: python self_host_assets.py --fetch)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Self-host Google Fonts / Font Awesome')
+    parser.add_argument('--fetch', action='store_true',
+                        help='download every font/icon stylesheet the pages link into vendor/')
+    args = parser.parse_args(argv)
+    if not args.fetch:
+        parser.print_help()
+        return 0
+
+    urls = set()
+    for name in sorted(os.listdir(FRONTEND_DIR)):
+        if name.endswith('.html'):
+            with open(os.path.join(FRONTEND_DIR, name), 'r', encoding='utf-8') as f:
+                urls.update(url for _, url in _cdn_links(Document(f.read())))
+    fetch(sorted(urls))
+    print(f"✅ {len(urls)} stylesheet(s) cached in {os.path.relpath(VENDOR_DIR, FRONTEND_DIR)}/")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
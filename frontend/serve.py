@@ -0,0 +1,481 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Static file server for frontend/ (or frontend/dist/) built on asyncio.
+
+A drop-in for ``frontend-server.js`` during development and QA, with the
+caching the Node server lacks:
+
+* strong ETags taken from the build manifest (the hash build_engine already
+  recorded for the page / dist file), so no file is read to compute them;
+  files the manifest does not know are hashed once per (size, mtime);
+* ``304 Not Modified`` for If-None-Match / If-Modified-Since;
+* single ``Range`` requests (``206`` / ``416``), honouring If-Range;
+* ``.br`` / ``.gz`` siblings written by the dist build, picked by
+  Accept-Encoding;
+* bodies sent with ``loop.sendfile`` (zero-copy where the platform allows),
+  except for hot files, which are served from an in-memory LRU capped at
+  ``--cache-bytes``.
+
+With ``--watch`` the pages are rebuilt as their sources change (watch.py)
+and every HTML page gets a small script that listens on ``/__livereload``
+(Server-Sent Events): CSS-only changes are swapped in place, anything else
+reloads the page.
+
+Usage:
+    python serve.py                     # serve frontend/ on :8080
+    python serve.py --dist -p 8000      # serve frontend/dist/
+    python serve.py --cache-bytes 0     # disable the in-memory cache
+    python serve.py --watch             # rebuild + live reload while editing
+"""
+
+import argparse
+import asyncio
+import collections
+import email.utils
+import json
+import mimetypes
+import os
+import re
+import sys
+import urllib.parse
+
+import watch
+from build_engine import DIST_DIR, FRONTEND_DIR, MANIFEST_PATH, Manifest, _stat_key, content_hash
+
+DEFAULT_PORT = 8080
+DEFAULT_CACHE_BYTES = 16 * 1024 * 1024
+# A file is loaded into the LRU on its HOT_AFTER-th request.
+HOT_AFTER = 2
+MAX_HEADER_BYTES = 16 * 1024
+KEEP_ALIVE_TIMEOUT = 15
+SSE_HEARTBEAT = 15
+LIVE_RELOAD_PATH = '/__livereload'
+
+# Same rule as frontend-server.js: fingerprinted assets never change.
+FINGERPRINTED = re.compile(r'\.[0-9a-f]{8}\.(css|js|woff2|woff|ttf)$')
+# Precompressed siblings written by the dist build, in order of preference.
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+CONTENT_TYPES = {
+    '.html': 'text/html; charset=utf-8',
+    '.css': 'text/css; charset=utf-8',
+    '.js': 'application/javascript; charset=utf-8',
+    '.mjs': 'application/javascript; charset=utf-8',
+    '.json': 'application/json; charset=utf-8',
+    '.svg': 'image/svg+xml',
+    '.woff2': 'font/woff2',
+    '.woff': 'font/woff',
+    '.ttf': 'font/ttf',
+}
+
+REASONS = {
+    200: 'OK', 206: 'Partial Content', 304: 'Not Modified', 400: 'Bad Request',
+    404: 'Not Found', 405: 'Method Not Allowed', 416: 'Range Not Satisfiable',
+}
+
+_RANGE_RE = re.compile(r'bytes=(\d*)-(\d*)$')
+_STYLE_OPEN_RE = re.compile(rb'<style\b', re.I)
+
+# Injected before </body> in watch mode.  The page's own <style> blocks are
+# tagged data-live-style by the server so they can be told apart from those
+# added at runtime (e.g. by the Tailwind CDN script).
+LIVE_RELOAD_SCRIPT = b"""<script>
+(function () {
+    var page = decodeURIComponent(location.pathname.split('/').pop()) || 'index.html';
+    var source = new EventSource('/__livereload');
+    source.addEventListener('reload', function () { location.reload(); });
+    source.addEventListener('css', function (e) {
+        var data = JSON.parse(e.data);
+        var styles = data.styles[page];
+        if (styles) {
+            var blocks = document.querySelectorAll('style[data-live-style]');
+            if (blocks.length !== styles.length) { location.reload(); return; }
+            blocks.forEach(function (block, i) { block.textContent = styles[i]; });
+        }
+        document.querySelectorAll('link[rel="stylesheet"]').forEach(function (link) {
+            var href = link.getAttribute('href').split('?')[0].replace(/^\\.?\\//, '');
+            if (data.sheets.indexOf(href) === -1) return;
+            // Swap once the new sheet is loaded so the page never flashes unstyled.
+            var fresh = link.cloneNode();
+            fresh.href = href + '?v=' + Date.now();
+            fresh.onload = function () { link.remove(); };
+            link.after(fresh);
+        });
+    });
+})();
+</script>
+"""
+
+
+def content_type(path):
+    ext = os.path.splitext(path)[1].lower()
+    if ext in CONTENT_TYPES:
+        return CONTENT_TYPES[ext]
+    return mimetypes.guess_type(path)[0] or 'application/octet-stream'
+
+
+class ETags:
+    """Strong validators for the files under ``root``.
+
+    The manifest is re-read whenever build_engine rewrites it, so a running
+    server picks up new builds.  A manifest hash is only trusted while the
+    file's (size, mtime) still match what the build recorded.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self.known = {}
+        self.manifest_stat = None
+        self.computed = {}
+
+    def _reload(self):
+        stat = _stat_key(MANIFEST_PATH)
+        if stat == self.manifest_stat:
+            return
+        self.manifest_stat = stat
+        manifest = Manifest()
+        if self.root == os.path.realpath(DIST_DIR):
+            entries = manifest.dist.get('files', {})
+        elif self.root == os.path.realpath(FRONTEND_DIR):
+            entries = manifest.pages
+        else:
+            entries = {}
+        self.known = {os.path.join(self.root, rel): (info.get('stat'), info.get('hash'))
+                      for rel, info in entries.items() if info.get('hash')}
+
+    def get(self, path, stat):
+        self._reload()
+        recorded = self.known.get(path)
+        if recorded and recorded[0] == stat:
+            return recorded[1]
+        cached = self.computed.get(path)
+        if cached and cached[0] == stat:
+            return cached[1]
+        with open(path, 'rb') as f:
+            digest = content_hash(f.read())
+        self.computed[path] = (stat, digest)
+        return digest
+
+
+class FileCache:
+    """LRU of file contents, keyed by path and checked against (size, mtime)."""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.entries = collections.OrderedDict()
+        self.hits = collections.Counter()
+
+    def get(self, path, stat):
+        entry = self.entries.get(path)
+        if entry is None:
+            return None
+        if entry[0] != stat:
+            self._drop(path)
+            return None
+        self.entries.move_to_end(path)
+        return entry[1]
+
+    def note_request(self, path, stat):
+        """Count a request; returns the contents once the file is hot."""
+        if not self.max_bytes or stat[0] > self.max_bytes // 4:
+            return None
+        self.hits[path] += 1
+        if self.hits[path] < HOT_AFTER:
+            return None
+        with open(path, 'rb') as f:
+            data = f.read()
+        if len(data) != stat[0]:
+            return None  # changed while reading; try again next time
+        del self.hits[path]
+        self.entries[path] = (stat, data)
+        self.size += len(data)
+        while self.size > self.max_bytes:
+            self._drop(next(iter(self.entries)))
+        return data
+
+    def _drop(self, path):
+        _, data = self.entries.pop(path)
+        self.size -= len(data)
+
+
+def parse_range(header, size):
+    """``(start, end)`` inclusive for a single byte range, None to ignore
+    the header, or False when it cannot be satisfied."""
+    match = _RANGE_RE.match(header.strip())
+    if not match or not (match.group(1) or match.group(2)):
+        return None
+    if not match.group(1):
+        length = int(match.group(2))
+        if length == 0:
+            return False
+        return max(0, size - length), size - 1
+    start = int(match.group(1))
+    end = int(match.group(2)) if match.group(2) else size - 1
+    if start >= size or end < start:
+        return False
+    return start, min(end, size - 1)
+
+
+def inject_live_reload(html):
+    count = iter(range(1 << 30))
+    html = _STYLE_OPEN_RE.sub(lambda m: b'<style data-live-style="%d"' % next(count), html)
+    end = html.rfind(b'</body>')
+    if end == -1:
+        return html + LIVE_RELOAD_SCRIPT
+    return html[:end] + LIVE_RELOAD_SCRIPT + html[end:]
+
+
+def _etag_matches(header, etag):
+    if header.strip() == '*':
+        return True
+    # Weak comparison, as RFC 9110 requires for If-None-Match.
+    return etag in (tag.strip().removeprefix('W/') for tag in header.split(','))
+
+
+class StaticServer:
+
+    def __init__(self, root, cache_bytes=DEFAULT_CACHE_BYTES, verbose=False, live_reload=False):
+        self.root = os.path.realpath(root)
+        self.etags = ETags(self.root)
+        self.cache = FileCache(cache_bytes)
+        self.verbose = verbose
+        self.live_reload = live_reload
+        self.listeners = set()
+
+    def notify(self, event):
+        """Push a watch.py event to every connected browser."""
+        for queue in self.listeners:
+            queue.put_nowait(event)
+
+    def resolve(self, target):
+        """Filesystem path for a request target, or None."""
+        path = urllib.parse.unquote(urllib.parse.urlsplit(target).path)
+        parts = [p for p in path.split('/') if p]
+        # No dotfiles (.build-manifest.json, .bench-history.json ...).
+        if any(p.startswith('.') for p in parts):
+            return None
+        full = os.path.realpath(os.path.join(self.root, *parts))
+        if full != self.root and not full.startswith(self.root + os.sep):
+            return None
+        if os.path.isdir(full):
+            full = os.path.join(full, 'index.html')
+        return full if os.path.isfile(full) else None
+
+    def negotiate(self, path, stat, accept_encoding):
+        """Best precompressed sibling: ``(path, stat, encoding)``."""
+        accepted = {token.split(';')[0].strip().lower() for token in accept_encoding.split(',')}
+        for encoding, suffix in ENCODINGS:
+            if encoding not in accepted:
+                continue
+            sibling = _stat_key(path + suffix)
+            # Skip siblings older than the file (left over from a hand edit).
+            if sibling and os.stat(path + suffix).st_mtime_ns >= stat[1]:
+                return path + suffix, sibling, encoding
+        return path, stat, None
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                try:
+                    raw = await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'), KEEP_ALIVE_TIMEOUT)
+                except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+                    return
+                except asyncio.LimitOverrunError:
+                    await self.send_error(writer, 400)
+                    return
+                keep_alive = await self.respond(raw.decode('latin-1'), writer)
+                if not keep_alive:
+                    return
+        except ConnectionError:
+            pass  # client went away mid-response
+        finally:
+            writer.close()
+
+    async def respond(self, raw, writer):
+        lines = raw.split('\r\n')
+        try:
+            method, target, version = lines[0].split(' ')
+        except ValueError:
+            await self.send_error(writer, 400)
+            return False
+        headers = {}
+        for line in lines[1:]:
+            name, sep, value = line.partition(':')
+            if sep:
+                headers[name.strip().lower()] = value.strip()
+        connection = headers.get('connection', '').lower()
+        keep_alive = connection != 'close' if version == 'HTTP/1.1' else connection == 'keep-alive'
+
+        if method not in ('GET', 'HEAD'):
+            await self.send_error(writer, 405, {'Allow': 'GET, HEAD'})
+            return False
+        if self.live_reload and urllib.parse.urlsplit(target).path == LIVE_RELOAD_PATH:
+            await self.event_stream(writer)
+            return False
+        path = self.resolve(target)
+        if path is None:
+            await self.send_error(writer, 404)
+            return keep_alive
+
+        status = await self.send_file(writer, method, path, headers, keep_alive)
+        if self.verbose:
+            print(f"{method} {target} {status}")
+        return keep_alive
+
+    async def send_file(self, writer, method, path, headers, keep_alive):
+        stat = _stat_key(path)
+        etag_hash = self.etags.get(path, stat)
+        range_header = headers.get('range')
+
+        live = self.live_reload and path.endswith('.html')
+
+        # Ranges and pages with the live-reload script are served from the
+        # identity encoding only.
+        encoding = None
+        body_path, body_stat = path, stat
+        if not range_header and not live:
+            body_path, body_stat, encoding = self.negotiate(path, stat, headers.get('accept-encoding', ''))
+        etag = f'"{etag_hash}-{encoding}"' if encoding else f'"{etag_hash}"'
+        if live:
+            etag = f'"{etag_hash}-live"'
+        mtime = stat[1] / 1e9
+
+        response = {
+            'Content-Type': content_type(path),
+            'Cache-Control': ('public, max-age=31536000, immutable'
+                              if FINGERPRINTED.search(path) else 'no-cache'),
+            'ETag': etag,
+            'Last-Modified': email.utils.formatdate(mtime, usegmt=True),
+            'Accept-Ranges': 'bytes',
+            'Vary': 'Accept-Encoding',
+        }
+        if encoding:
+            response['Content-Encoding'] = encoding
+
+        if 'if-none-match' in headers:
+            not_modified = _etag_matches(headers['if-none-match'], etag)
+        else:
+            not_modified = self._not_modified_since(headers.get('if-modified-since'), mtime)
+        if not_modified:
+            del response['Content-Type']
+            await self.send_head(writer, 304, response, keep_alive)
+            return 304
+
+        data = None
+        if live:
+            with open(path, 'rb') as f:
+                data = inject_live_reload(f.read())
+        size = len(data) if live else body_stat[0]
+        start, end, status = 0, size - 1, 200
+        if range_header and headers.get('if-range', etag) == etag:
+            byte_range = parse_range(range_header, size)
+            if byte_range is False:
+                response['Content-Range'] = f'bytes */{size}'
+                await self.send_error(writer, 416, response, keep_alive)
+                return 416
+            if byte_range:
+                start, end = byte_range
+                status = 206
+                response['Content-Range'] = f'bytes {start}-{end}/{size}'
+        response['Content-Length'] = str(end - start + 1)
+
+        await self.send_head(writer, status, response, keep_alive)
+        if method == 'HEAD' or size == 0:
+            return status
+
+        if data is None:
+            data = self.cache.get(body_path, body_stat) or self.cache.note_request(body_path, body_stat)
+        if data is not None:
+            writer.write(data[start:end + 1])
+            await writer.drain()
+        else:
+            with open(body_path, 'rb') as f:
+                await asyncio.get_running_loop().sendfile(writer.transport, f, start, end - start + 1)
+        return status
+
+    @staticmethod
+    def _not_modified_since(header, mtime):
+        if not header:
+            return False
+        try:
+            since = email.utils.parsedate_to_datetime(header).timestamp()
+        except (TypeError, ValueError):
+            return False
+        return int(mtime) <= since
+
+    async def event_stream(self, writer):
+        """Server-Sent Events connection to one browser tab."""
+        await self.send_head(writer, 200, {'Content-Type': 'text/event-stream',
+                                           'Cache-Control': 'no-cache'}, False)
+        queue = asyncio.Queue()
+        self.listeners.add(queue)
+        try:
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), SSE_HEARTBEAT)
+                except asyncio.TimeoutError:
+                    writer.write(b': ping\n\n')  # notices closed tabs
+                else:
+                    payload = json.dumps(event)
+                    writer.write(f"event: {event['type']}\ndata: {payload}\n\n".encode('utf-8'))
+                await writer.drain()
+        finally:
+            self.listeners.discard(queue)
+
+    async def send_head(self, writer, status, headers, keep_alive):
+        lines = [f'HTTP/1.1 {status} {REASONS[status]}',
+                 f'Date: {email.utils.formatdate(usegmt=True)}',
+                 f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+        lines.extend(f'{name}: {value}' for name, value in headers.items())
+        writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1'))
+        await writer.drain()
+
+    async def send_error(self, writer, status, headers=None, keep_alive=False):
+        body = f'<h1>{status} - {REASONS[status]}</h1>'.encode('utf-8')
+        headers = dict(headers or {})
+        headers.update({'Content-Type': 'text/html; charset=utf-8', 'Content-Length': str(len(body))})
+        await self.send_head(writer, status, headers, keep_alive)
+        writer.write(body)
+        await writer.drain()
+
+
+async def serve(root, host, port, cache_bytes, verbose, live=False, dist=False):
+    server = StaticServer(root, cache_bytes, verbose, live_reload=live)
+    listener = await asyncio.start_server(server.handle, host, port, limit=MAX_HEADER_BYTES)
+    if live:
+        asyncio.get_running_loop().create_task(watch.watch(dist=dist, notify=server.notify))
+    print(f"🌐 Serving {os.path.relpath(server.root, os.path.dirname(FRONTEND_DIR))}/ at http://localhost:{port}")
+    print(f"📝 Home: http://localhost:{port}")
+    print(f"📝 Auth: http://localhost:{port}/auth.html")
+    print(f"📝 Dashboard: http://localhost:{port}/dashboard.html")
+    async with listener:
+        await listener.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Static file server for frontend/')
+    parser.add_argument('-p', '--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--root', default=FRONTEND_DIR, help='directory to serve (default: frontend/)')
+    parser.add_argument('--dist', action='store_true', help='serve frontend/dist/ (build_engine.py --dist)')
+    parser.add_argument('--cache-bytes', type=int, default=DEFAULT_CACHE_BYTES,
+                        help='byte cap of the in-memory cache of hot files (0 disables it)')
+    parser.add_argument('--watch', action='store_true', help='rebuild on changes and live-reload the browser')
+    parser.add_argument('-v', '--verbose', action='store_true', help='log every request')
+    args = parser.parse_args(argv)
+
+    root = DIST_DIR if args.dist else args.root
+    if not os.path.isdir(root):
+        print(f"❌ {root} does not exist (run: python build_engine.py --dist)")
+        return 1
+    try:
+        asyncio.run(serve(root, args.host, args.port, args.cache_bytes, args.verbose,
+                          live=args.watch, dist=args.dist))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
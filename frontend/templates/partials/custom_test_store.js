@@ -0,0 +1,222 @@
+        // customTestCases persisted in IndexedDB (store "customTestCases",
+        // keyed by id).  Edits are queued and written together, in one
+        // transaction per animation frame.  Stored test cases are read back
+        // a page at a time as the list is scrolled, not all at startup; code
+        // that needs all of them awaits allCustomTestCases().
+        //
+        // With sync turned on (checkbox in the list tab, kept in
+        // localStorage), new and deleted test cases are mirrored to
+        // /api/v2/testcases in the background: unsynced records carry
+        // `syncPending`, deleted synced ones leave a tombstone in
+        // "customTestDeletes".
+        const CUSTOM_TEST_PAGE_SIZE = 50;
+        const CUSTOM_TEST_SYNC_KEY = 'customTestSync';
+        const CUSTOM_TEST_SYNC_URL = 'http://localhost:3000/api/v2/testcases';
+        const customTestWrites = new Map();  // id -> record to put, or null to delete
+        const deletedCustomTestIds = new Set();
+        let customTestFlushFrame = 0;
+        let customTestTotal = 0;  // stored + added - deleted, while pages load
+        let customTestsLoadedUpTo = null;  // last id read from the store
+        let customTestsComplete = false;
+        let customTestsLoading = null;
+        let customTestSyncTimer = 0;
+        let customTestSyncRunning = false;
+
+        function initCustomTestStore() {
+            idbTransaction('customTestCases', 'readonly', store => store.count())
+                .then(count => {
+                    customTestTotal += count;
+                    updateCustomTestCount();
+                })
+                .catch(error => console.warn('Custom test store unavailable:', error));
+
+            // Load the next page whenever the end of the list comes near.
+            const sentinel = document.getElementById('customTestCasesMore');
+            const observer = new IntersectionObserver(entries => {
+                if (!entries[0].isIntersecting || customTestsComplete) return;
+                loadCustomTestPage().then(() => {
+                    // Observing again re-checks whether it is still in view.
+                    observer.unobserve(sentinel);
+                    if (!customTestsComplete) observer.observe(sentinel);
+                });
+            }, { rootMargin: '600px' });
+            loadCustomTestPage().then(() => observer.observe(sentinel));
+
+            const toggle = document.getElementById('customTestSyncToggle');
+            toggle.checked = localStorage.getItem(CUSTOM_TEST_SYNC_KEY) === 'on';
+            toggle.addEventListener('change', () => {
+                localStorage.setItem(CUSTOM_TEST_SYNC_KEY, toggle.checked ? 'on' : 'off');
+                scheduleCustomTestSync();
+            });
+            window.addEventListener('online', scheduleCustomTestSync);
+            // Animation frames stop in hidden tabs: write right away instead.
+            document.addEventListener('visibilitychange', () => {
+                if (document.hidden) flushCustomTestWrites();
+            });
+            window.addEventListener('pagehide', flushCustomTestWrites);
+            scheduleCustomTestSync();
+        }
+
+        function updateCustomTestCount() {
+            document.getElementById('customTestCount').textContent = customTestTotal;
+        }
+
+        function storeCustomTestCase(testCase) {
+            customTestTotal++;
+            updateCustomTestCount();
+            queueCustomTestWrite(testCase.id, { ...testCase, syncPending: 1 });
+        }
+
+        function unstoreCustomTestCase(id) {
+            customTestTotal--;
+            updateCustomTestCount();
+            deletedCustomTestIds.add(id);
+            queueCustomTestWrite(id, null);
+        }
+
+        function queueCustomTestWrite(id, record) {
+            customTestWrites.set(id, record);
+            if (!customTestFlushFrame) customTestFlushFrame = requestAnimationFrame(flushCustomTestWrites);
+        }
+
+        async function flushCustomTestWrites() {
+            cancelAnimationFrame(customTestFlushFrame);
+            customTestFlushFrame = 0;
+            if (!customTestWrites.size) return;
+            const writes = [...customTestWrites];
+            customTestWrites.clear();
+            try {
+                await idbTransaction(['customTestCases', 'customTestDeletes'], 'readwrite', ([store, deletes]) => {
+                    writes.forEach(([id, record]) => {
+                        if (record) {
+                            store.put(record, id);
+                            return;
+                        }
+                        store.get(id).onsuccess = e => {
+                            const serverId = e.target.result?.serverId;
+                            if (serverId) deletes.put({ id, serverId }, id);
+                            store.delete(id);
+                        };
+                    });
+                });
+            } catch (error) {
+                console.warn('Could not save custom test cases:', error);
+                return;
+            }
+            scheduleCustomTestSync();
+        }
+
+        function loadCustomTestPage() {
+            if (customTestsComplete) return Promise.resolve();
+            if (!customTestsLoading) {
+                customTestsLoading = readCustomTestPage().finally(() => { customTestsLoading = null; });
+            }
+            return customTestsLoading;
+        }
+
+        async function readCustomTestPage() {
+            let records;
+            try {
+                const range = customTestsLoadedUpTo === null ? null : IDBKeyRange.lowerBound(customTestsLoadedUpTo, true);
+                records = await idbTransaction('customTestCases', 'readonly', store => store.getAll(range, CUSTOM_TEST_PAGE_SIZE));
+            } catch (error) {
+                console.warn('Could not load custom test cases:', error);
+                customTestsComplete = true;
+                return;
+            }
+            if (records.length < CUSTOM_TEST_PAGE_SIZE) customTestsComplete = true;
+            if (!records.length) return;
+            customTestsLoadedUpTo = records[records.length - 1].id;
+
+            // Stored test cases go before the ones added since (higher ids);
+            // the ones already shown or deleted meanwhile are skipped.
+            const known = new Set(customTestCases.map(tc => tc.id));
+            const page = records
+                .filter(record => !known.has(record.id) && !deletedCustomTestIds.has(record.id))
+                .map(({ syncPending, serverId, ...testCase }) => testCase);
+            if (!page.length) return;
+            let at = customTestCases.findIndex(tc => tc.id > page[0].id);
+            if (at === -1) at = customTestCases.length;
+            customTestCases.splice(at, 0, ...page);
+            for (let i = page.length - 1; i >= 0; i--) insertCustomTestCaseNode(page[i], at + i);
+        }
+
+        // Every custom test case, reading the pages not loaded yet.
+        async function allCustomTestCases() {
+            while (!customTestsComplete) await loadCustomTestPage();
+            return customTestCases;
+        }
+
+        function scheduleCustomTestSync() {
+            if (localStorage.getItem(CUSTOM_TEST_SYNC_KEY) !== 'on' || customTestSyncTimer) return;
+            customTestSyncTimer = setTimeout(() => {
+                customTestSyncTimer = 0;
+                syncCustomTestCases();
+            }, 2000);
+        }
+
+        // Push pending test cases, then tombstones, to /api/v2/testcases;
+        // stops at the first failure and retries on the next write or when
+        // the browser comes back online.
+        async function syncCustomTestCases() {
+            const token = localStorage.getItem('token');
+            if (customTestSyncRunning || !token || !navigator.onLine) return;
+            customTestSyncRunning = true;
+            const headers = { 'Authorization': `Bearer ${token}`, 'Content-Type': 'application/json' };
+            try {
+                for (;;) {
+                    const pending = await idbTransaction('customTestCases', 'readonly',
+                        store => store.index('syncPending').getAll(1, CUSTOM_TEST_PAGE_SIZE));
+                    if (!pending.length) break;
+                    for (const record of pending) {
+                        const response = await fetch(CUSTOM_TEST_SYNC_URL, {
+                            method: 'POST',
+                            headers,
+                            body: JSON.stringify(toServerTestCase(record))
+                        });
+                        if (!response.ok) throw new Error(`POST ${response.status}`);
+                        const { testCaseId } = await response.json();
+                        await idbTransaction(['customTestCases', 'customTestDeletes'], 'readwrite', ([store, deletes]) => {
+                            store.get(record.id).onsuccess = e => {
+                                const stored = e.target.result;
+                                if (!stored) {
+                                    // Deleted while it was being sent.
+                                    deletes.put({ id: record.id, serverId: testCaseId }, record.id);
+                                    return;
+                                }
+                                delete stored.syncPending;
+                                stored.serverId = testCaseId;
+                                store.put(stored, record.id);
+                            };
+                        });
+                    }
+                }
+
+                const tombstones = await idbTransaction('customTestDeletes', 'readonly', store => store.getAll());
+                for (const { id, serverId } of tombstones) {
+                    const response = await fetch(`${CUSTOM_TEST_SYNC_URL}/${serverId}`, { method: 'DELETE', headers });
+                    if (!response.ok && response.status !== 404) throw new Error(`DELETE ${response.status}`);
+                    await idbTransaction('customTestDeletes', 'readwrite', store => { store.delete(id); });
+                }
+            } catch (error) {
+                console.warn('Custom test sync failed, will retry:', error.message);
+            } finally {
+                customTestSyncRunning = false;
+            }
+        }
+
+        // A custom test case as /api/v2/testcases expects it: one step per
+        // line of its steps, then the Cypress code as the last step's note.
+        function toServerTestCase(testCase) {
+            const steps = testCase.steps.split('\n').map(line => line.trim()).filter(Boolean)
+                .map((action, i) => ({ stepNum: i + 1, action }));
+            steps.push({ stepNum: steps.length + 1, action: 'Run the Cypress code', note: testCase.code });
+            return {
+                name: testCase.name,
+                module: 'Website Analyzer',
+                type: testCase.type,
+                priority: testCase.priority,
+                tags: ['custom', 'cypress'],
+                steps
+            };
+        }
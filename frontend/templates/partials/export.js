@@ -0,0 +1,53 @@
+        async function exportCypressTests() {
+            const custom = await allCustomTestCases();
+            const codes = [...(analyzedData?.testCases || []).map(t => t.code), ...custom.map(t => t.code)];
+            await runExport({ format: 'cypress', codes }, 'cypress-tests.js');
+        }
+
+        async function exportAsJSON() {
+            await runExport({
+                format: 'json',
+                website: document.getElementById('websiteUrl').value,
+                timestamp: new Date().toISOString(),
+                features: analyzedData?.features || [],
+                aiTests: analyzedData?.testCases || [],
+                customTests: await allCustomTestCases()
+            }, 'analysis.json');
+        }
+
+        async function exportAsCSV() {
+            await runExport({ format: 'csv', customTests: await allCustomTestCases() }, 'analysis.csv');
+        }
+
+        // The file is built by js/export-worker.js, off the main thread, and
+        // comes back as a Blob; #exportProgress shows how far it got.
+        function runExport(job, filename) {
+            const progress = document.getElementById('exportProgress');
+            return new Promise((resolve, reject) => {
+                const worker = new Worker('js/export-worker.js');
+                const finish = () => {
+                    worker.terminate();
+                    progress.hidden = true;
+                };
+                worker.onmessage = ({ data }) => {
+                    if (data.type === 'progress') {
+                        progress.max = data.total || 1;
+                        progress.value = data.done;
+                        progress.hidden = false;
+                        return;
+                    }
+                    finish();
+                    if (data.type === 'done') {
+                        downloadBlob(data.blob, filename);
+                        resolve();
+                    } else {
+                        reject(new Error(data.message));
+                    }
+                };
+                worker.onerror = event => {
+                    finish();
+                    reject(new Error(event.message));
+                };
+                worker.postMessage(job);
+            }).catch(error => alert('Lỗi: ' + error.message));
+        }
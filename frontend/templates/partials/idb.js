@@ -0,0 +1,56 @@
+        // The page's IndexedDB database: one object store (out-of-line keys)
+        // per entry of APP_DB_STORES, with an index on each listed field.
+        // Bump APP_DB_VERSION when adding a store or an index.
+        const APP_DB_NAME = 'ai-cypress';
+        const APP_DB_VERSION = 2;
+        const APP_DB_STORES = {
+            analyses: [],
+            customTestCases: ['syncPending'],
+            customTestDeletes: []
+        };
+        let appDbPromise = null;
+
+        function openAppDb() {
+            if (!appDbPromise) {
+                appDbPromise = new Promise((resolve, reject) => {
+                    const request = indexedDB.open(APP_DB_NAME, APP_DB_VERSION);
+                    request.onupgradeneeded = () => {
+                        const db = request.result;
+                        Object.entries(APP_DB_STORES).forEach(([name, indexes]) => {
+                            const store = db.objectStoreNames.contains(name)
+                                ? request.transaction.objectStore(name) : db.createObjectStore(name);
+                            indexes.forEach(field => {
+                                if (!store.indexNames.contains(field)) store.createIndex(field, field);
+                            });
+                        });
+                    };
+                    request.onsuccess = () => {
+                        // Let another tab upgrade the database.
+                        request.result.onversionchange = () => {
+                            request.result.close();
+                            appDbPromise = null;
+                        };
+                        resolve(request.result);
+                    };
+                    request.onerror = () => reject(request.error);
+                }).catch(error => {
+                    appDbPromise = null;
+                    throw error;
+                });
+            }
+            return appDbPromise;
+        }
+
+        // Run `fn(store)` in one transaction on `storeName` (`fn([stores])`
+        // for an array of names); resolves, once the transaction commits,
+        // with the result of the request `fn` returns.
+        async function idbTransaction(storeName, mode, fn) {
+            const db = await openAppDb();
+            return new Promise((resolve, reject) => {
+                const tx = db.transaction(storeName, mode);
+                const request = fn(Array.isArray(storeName)
+                    ? storeName.map(name => tx.objectStore(name)) : tx.objectStore(storeName));
+                tx.oncomplete = () => resolve(request ? request.result : undefined);
+                tx.onerror = tx.onabort = () => reject(tx.error);
+            });
+        }
@@ -0,0 +1,6 @@
+        function showTab(e, tabId) {
+            document.querySelectorAll('.{{ tab_pane_class }}').forEach(tab => tab.classList.remove('active'));
+            document.querySelectorAll('.{{ tab_button_class }}').forEach(btn => btn.classList.remove('active'));
+            document.getElementById(tabId).classList.add('active');
+            e.currentTarget.classList.add('active');
+        }
@@ -0,0 +1,151 @@
+        // Windowed list: only the rows in view (plus `overscan` rows on each
+        // side) exist in the DOM.  Rows are absolutely positioned wrappers
+        // recycled as the page scrolls; their heights are measured once
+        // rendered (estimated before), so rows may differ in height.
+        class VirtualList {
+            constructor(container, { renderRow, estimate = 100, gap = 0, overscan = 4, onResize = null }) {
+                this.container = container;
+                this.renderRow = renderRow;
+                this.estimate = estimate;
+                this.gap = gap;
+                this.overscan = overscan;
+                this.onResize = onResize;
+                this.count = 0;
+                this.heights = new Float64Array(0);
+                this.measured = new Uint8Array(0);
+                this.offsets = new Float64Array(1);
+                this.rows = new Map();
+                this.pool = [];
+                this.frame = 0;
+                this.width = 0;
+                container.textContent = '';
+                container.style.position = 'relative';
+                container.style.display = 'block';
+                this.schedule = () => {
+                    if (!this.frame) this.frame = requestAnimationFrame(() => { this.frame = 0; this.update(); });
+                };
+                // Scroll events do not bubble; capturing sees every scroller.
+                document.addEventListener('scroll', this.schedule, { capture: true, passive: true });
+                window.addEventListener('resize', this.schedule, { passive: true });
+                // Also fires when the container goes from display:none to visible.
+                new ResizeObserver(() => {
+                    const width = container.clientWidth;
+                    if (width && width !== this.width) {
+                        this.width = width;
+                        this.measured.fill(0);
+                        if (this.onResize) this.onResize(width);
+                    }
+                    this.schedule();
+                }).observe(container);
+            }
+
+            setCount(count) {
+                this.count = count;
+                this.heights = new Float64Array(count).fill(this.estimate);
+                this.measured = new Uint8Array(count);
+                for (const row of this.rows.values()) this.release(row);
+                this.rows.clear();
+                this.layout();
+                this.schedule();
+            }
+
+            // Grow the list to `count` rows (e.g. as streamed items arrive),
+            // keeping the rendered rows and the heights measured so far.
+            grow(count) {
+                if (count <= this.count) return;
+                const heights = new Float64Array(count).fill(this.estimate);
+                const measured = new Uint8Array(count);
+                heights.set(this.heights);
+                measured.set(this.measured);
+                this.count = count;
+                this.heights = heights;
+                this.measured = measured;
+                this.layout();
+                this.schedule();
+            }
+
+            // Re-render row `index` (e.g. after expanding it) and re-measure it.
+            refresh(index) {
+                const row = this.rows.get(index);
+                if (row) this.renderRow(index, row.firstChild);
+                this.measured[index] = 0;
+                this.schedule();
+            }
+
+            layout() {
+                const offsets = new Float64Array(this.count + 1);
+                for (let i = 0; i < this.count; i++) offsets[i + 1] = offsets[i] + this.heights[i] + this.gap;
+                this.offsets = offsets;
+                this.container.style.height = Math.max(0, offsets[this.count] - this.gap) + 'px';
+            }
+
+            // Index of the row at `y` pixels from the top of the list.
+            indexAt(y) {
+                let lo = 0, hi = this.count - 1;
+                while (lo < hi) {
+                    const mid = (lo + hi + 1) >> 1;
+                    if (this.offsets[mid] <= y) lo = mid; else hi = mid - 1;
+                }
+                return lo;
+            }
+
+            release(row) {
+                row.hidden = true;
+                this.pool.push(row);
+            }
+
+            acquire() {
+                let row = this.pool.pop();
+                if (!row) {
+                    row = document.createElement('div');
+                    row.style.cssText = 'position: absolute; top: 0; left: 0; right: 0;';
+                    row.appendChild(document.createElement('div'));
+                    this.container.appendChild(row);
+                }
+                row.hidden = false;
+                return row;
+            }
+
+            update() {
+                const rect = this.container.getBoundingClientRect();
+                if (!this.count || !rect.width) return;
+                const top = Math.max(0, -rect.top);
+                const bottom = Math.max(top, Math.min(rect.height, window.innerHeight - rect.top));
+                const first = Math.max(0, this.indexAt(top) - this.overscan);
+                const last = Math.min(this.count - 1, this.indexAt(bottom) + this.overscan);
+
+                for (const [index, row] of this.rows) {
+                    if (index < first || index > last) {
+                        this.rows.delete(index);
+                        this.release(row);
+                    }
+                }
+                for (let i = first; i <= last; i++) {
+                    if (!this.rows.has(i)) {
+                        const row = this.acquire();
+                        this.renderRow(i, row.firstChild);
+                        this.rows.set(i, row);
+                    }
+                }
+
+                // Measure the new rows in one pass (a single layout), then
+                // position every row.
+                let changed = false;
+                for (const [index, row] of this.rows) {
+                    if (this.measured[index]) continue;
+                    const height = row.offsetHeight;
+                    if (!height) continue;
+                    this.measured[index] = 1;
+                    if (height !== this.heights[index]) {
+                        this.heights[index] = height;
+                        changed = true;
+                    }
+                }
+                if (changed) this.layout();
+                for (const [index, row] of this.rows) {
+                    row.style.transform = `translateY(${this.offsets[index]}px)`;
+                }
+                // Measured heights can move other rows into view.
+                if (changed) this.schedule();
+            }
+        }
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Minimal template engine for the page generators.
+
+Templates live in ``frontend/templates/`` and are compiled to Python code
+objects, which are cached as marshalled bytecode in ``.template-cache/``
+(keyed by the template source and the Python version), so an unchanged
+template is never parsed again.
+
+Syntax (a small Jinja-like subset):
+
+    {{ expr }}                      any Python expression over the context
+    {% set name = expr %}
+    {% if expr %} ... {% elif expr %} ... {% else %} ... {% endif %}
+    {% for target in expr %} ... {% endfor %}
+    {% include "partials/navbar.html" %}
+    {% extends "layout.html" %}     + {% block name %} ... {% endblock %}
+
+A line holding nothing but a ``{% ... %}`` tag is dropped from the output
+entirely.  Includes share the including template's context.
+
+``dependencies(name)`` lists every template a page pulls in; generators
+export it as PAGE_INPUTS so the build rebuilds exactly the pages that use
+an edited partial.
+"""
+
+import marshal
+import os
+import re
+import sys
+
+from build_engine import FRONTEND_DIR, atomic_write, content_hash
+
+TEMPLATE_DIR = os.path.join(FRONTEND_DIR, 'templates')
+CACHE_DIR = os.path.join(FRONTEND_DIR, '.template-cache')
+# Bump when the generated code changes shape, to invalidate the cache.
+ENGINE_VERSION = 1
+
+_TAG_RE = re.compile(r'(?m)(^[ \t]*)?(\{\{.*?\}\}|\{%.*?%\})([ \t]*\n)?', re.S)
+_DEP_RE = re.compile(r'\{%\s*(?:include|extends)\s+"([^"]+)"\s*%\}')
+
+
+class TemplateError(Exception):
+    pass
+
+
+def template_path(name):
+    return os.path.join(TEMPLATE_DIR, *name.split('/'))
+
+
+def _read(name):
+    try:
+        with open(template_path(name), 'r', encoding='utf-8') as f:
+            return f.read()
+    except FileNotFoundError:
+        raise TemplateError(f'template not found: {name}') from None
+
+
+# ---------------------------------------------------------------- compiler
+
+def _tokens(source):
+    """``('text', str)`` / ``('expr', str)`` / ``('tag', str)`` tokens."""
+    pos = 0
+    for match in _TAG_RE.finditer(source):
+        indent, tag, newline = match.group(1), match.group(2), match.group(3)
+        standalone = tag.startswith('{%') and indent is not None and newline is not None
+        start = match.start(2) if not standalone else match.start()
+        yield 'text', source[pos:start]
+        if tag.startswith('{{'):
+            yield 'expr', tag[2:-2].strip()
+        else:
+            yield 'tag', tag[2:-2].strip()
+        pos = match.end() if standalone else match.end(2)
+    yield 'text', source[pos:]
+
+
+def compile_source(source, name):
+    """Python source of a template; runs in a namespace holding the context,
+    ``_w`` (output), ``_blocks`` and ``_include``."""
+    lines = []  # (top-level output?, line)
+    stack = []  # open tags: 'if', 'for' or the block name
+    extends = None
+
+    def emit(line, output=False):
+        lines.append((output and not stack, '    ' * len(stack) + line))
+
+    for kind, value in _tokens(source):
+        if kind == 'text':
+            if value:
+                emit(f'_w({value!r})', output=True)
+            continue
+        if kind == 'expr':
+            emit(f'_w(str({value}))', output=True)
+            continue
+
+        keyword, _, arg = value.partition(' ')
+        arg = arg.strip()
+        if keyword in ('if', 'for'):
+            emit(f'{keyword} {arg}:')
+            stack.append(keyword)
+            emit('pass')
+        elif keyword in ('elif', 'else'):
+            if not stack or stack[-1] != 'if':
+                raise TemplateError(f'{name}: {{% {keyword} %}} outside {{% if %}}')
+            stack.pop()
+            emit(f'elif {arg}:' if keyword == 'elif' else 'else:')
+            stack.append('if')
+            emit('pass')
+        elif keyword == 'block':
+            emit(f'def _block_{arg}():')
+            stack.append('block ' + arg)
+            emit('pass')
+        elif keyword in ('endif', 'endfor', 'endblock'):
+            if not stack or stack[-1].split()[0] != keyword[3:]:
+                raise TemplateError(f'{name}: unexpected {{% {keyword} %}}')
+            opened = stack.pop()
+            if opened.startswith('block '):
+                block = opened.split()[1]
+                emit(f'_blocks.setdefault({block!r}, _block_{block})')
+                emit(f'_blocks[{block!r}]()', output=True)
+        elif keyword == 'set':
+            emit(arg)
+        elif keyword == 'include':
+            emit(f'_include({_literal(arg, name)!r})', output=True)
+        elif keyword == 'extends':
+            extends = _literal(arg, name)
+        else:
+            raise TemplateError(f'{name}: unknown tag {{% {keyword} %}}')
+    if stack:
+        raise TemplateError(f'{name}: unclosed {{% {stack[-1]} %}}')
+
+    if extends:
+        # Only register the blocks and set variables; the parent renders.
+        lines = [(False, line) for output, line in lines if not output]
+        lines.append((False, f'_extends = {extends!r}'))
+    return '\n'.join(line for _, line in lines) + '\n'
+
+
+def _literal(arg, name):
+    if len(arg) < 2 or arg[0] != '"' or arg[-1] != '"':
+        raise TemplateError(f'{name}: template names must be "quoted" literals, got {arg}')
+    return arg[1:-1]
+
+
+# ---------------------------------------------------------------- cache
+
+_compiled = {}
+
+
+def _cache_key(source):
+    return content_hash(f'{ENGINE_VERSION}:{sys.version_info[:2]}:{source}')
+
+
+def load(name):
+    """Code object of template ``name``, from memory, disk cache or a compile."""
+    source = _read(name)
+    key = _cache_key(source)
+    cached = _compiled.get(name)
+    if cached and cached[0] == key:
+        return cached[1]
+
+    stem = name.replace('/', '__')
+    cache_file = os.path.join(CACHE_DIR, f'{stem}.{key}.bin')
+    try:
+        with open(cache_file, 'rb') as f:
+            code = marshal.load(f)
+    except (FileNotFoundError, EOFError, ValueError, TypeError):
+        code = compile(compile_source(source, name), template_path(name), 'exec')
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        for old in os.listdir(CACHE_DIR):
+            if old.startswith(stem + '.'):
+                os.unlink(os.path.join(CACHE_DIR, old))
+        atomic_write(cache_file, marshal.dumps(code))
+    _compiled[name] = (key, code)
+    return code
+
+
+# ---------------------------------------------------------------- render
+
+def _run(name, namespace):
+    namespace.pop('_extends', None)
+    exec(load(name), namespace)
+    parent = namespace.get('_extends')
+    if parent:
+        _run(parent, namespace)
+
+
+def render(name, **context):
+    out = []
+    namespace = dict(context)
+    namespace.update(_w=out.append, _blocks={},
+                     _include=lambda partial: _run(partial, namespace))
+    _run(name, namespace)
+    return ''.join(out)
+
+
+def dependencies(name):
+    """Frontend-relative paths of ``name`` and every template it pulls in."""
+    seen = []
+    todo = [name]
+    while todo:
+        current = todo.pop()
+        if current in seen:
+            continue
+        seen.append(current)
+        todo.extend(_DEP_RE.findall(_read(current)))
+    return sorted(os.path.relpath(template_path(n), FRONTEND_DIR).replace(os.sep, '/') for n in seen)
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The generator modules are flat scripts in frontend/.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
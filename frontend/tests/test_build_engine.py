@@ -0,0 +1,85 @@
+import os
+
+import pytest
+
+import build_engine
+from build_engine import UNITS, Manifest, build_page, split_units, unit_hashes, write_page
+
+PAGE = '''<!DOCTYPE html>
+<html>
+<head>
+    <title>Page</title>
+    <style>
+        .a { color: red; }
+    </style>
+</head>
+<body>
+    <p>hello</p>
+    <script src="lib.js"></script>
+    <script>
+        console.log('hi');
+    </script>
+</body>
+</html>
+'''
+
+
+@pytest.fixture
+def frontend(tmp_path, monkeypatch):
+    monkeypatch.setattr(build_engine, 'FRONTEND_DIR', str(tmp_path))
+    return tmp_path
+
+
+def test_split_units():
+    units = split_units(PAGE)
+    assert set(units) == set(UNITS)
+    assert '.a { color: red; }' in units['style']
+    assert "console.log('hi');" in units['script']
+    assert '<p>hello</p>' in units['body'] and 'console.log' not in units['body']
+    assert '<title>Page</title>' in units['head'] and '.a {' not in units['head']
+
+
+def test_unit_hashes_change_per_unit():
+    before = unit_hashes(PAGE)
+    after = unit_hashes(PAGE.replace("'hi'", "'bye'"))
+    assert [name for name in UNITS if before[name] != after[name]] == ['script']
+
+
+def test_write_page_skips_unchanged_pages(frontend):
+    manifest = Manifest(str(frontend / 'manifest.json'))
+    assert write_page('page.html', PAGE, manifest=manifest) == list(UNITS)
+    stat = os.stat(frontend / 'page.html').st_mtime_ns
+
+    assert write_page('page.html', PAGE, manifest=manifest) == []
+    assert os.stat(frontend / 'page.html').st_mtime_ns == stat
+
+    assert write_page('page.html', PAGE.replace('red', 'blue'), manifest=manifest) == ['style']
+    assert (frontend / 'page.html').read_text() == PAGE.replace('red', 'blue')
+
+
+def test_write_page_rewrites_a_hand_edited_page(frontend):
+    manifest = Manifest(str(frontend / 'manifest.json'))
+    write_page('page.html', PAGE, manifest=manifest)
+    (frontend / 'page.html').write_text('edited by hand, longer than before' * 20)
+    assert write_page('page.html', PAGE, manifest=manifest) == list(UNITS)
+    assert (frontend / 'page.html').read_text() == PAGE
+
+
+def test_manifest_persists_between_builds(frontend):
+    path = str(frontend / 'manifest.json')
+    manifest = Manifest(path)
+    write_page('page.html', PAGE, generator='gen.py', manifest=manifest)
+    manifest.save()
+
+    reloaded = Manifest(path)
+    entry = reloaded.get('page.html')
+    assert entry['units'] == unit_hashes(PAGE)
+    assert entry['generator'] == 'gen.py'
+    assert write_page('page.html', PAGE, manifest=reloaded) == []
+
+
+def test_hand_written_page_is_only_indexed_once(frontend):
+    (frontend / 'page.html').write_text(PAGE)
+    manifest = Manifest(str(frontend / 'manifest.json'))
+    assert build_page('page.html', manifest) == ('indexed', list(UNITS))
+    assert build_page('page.html', manifest) == ('unchanged', [])
@@ -0,0 +1,48 @@
+from css_rules import patch_css
+
+CSS = '''
+        .card {
+            color: red;
+            padding: 1rem;
+        }
+
+        @media (max-width: 768px) {
+            .card {
+                padding: 0.5rem;
+            }
+        }
+'''
+
+PATCH = '''
+        .card {
+            color: blue;
+            margin: 0;
+        }
+
+        .badge {
+            font-weight: 700;
+        }
+
+        @media (max-width: 768px) {
+            .card {
+                padding: 0;
+            }
+        }
+'''
+
+
+def test_patch_css_merges_declarations():
+    css = patch_css(CSS, PATCH)
+    assert 'color: blue;' in css and 'color: red;' not in css
+    assert 'padding: 1rem;' in css and 'margin: 0;' in css
+    assert '.badge {' in css
+    assert 'padding: 0.5rem;' not in css
+
+
+def test_patch_css_is_idempotent():
+    once = patch_css(CSS, PATCH)
+    assert patch_css(once, PATCH) is once
+
+
+def test_patch_css_unchanged_returns_input():
+    assert patch_css(CSS, '.card { color: red; }') is CSS
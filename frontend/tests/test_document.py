@@ -0,0 +1,45 @@
+from document import Document
+
+PAGE = ('<html><head><title>t</title><style>a { color: red; }</style></head>'
+        '<body><p>hi</p><script>var x = 1;</script></body></html>')
+
+
+def _regions(doc):
+    return [(el.tag, doc.outer(el)) for el in doc.elements]
+
+
+def test_splice_shifts_later_elements():
+    doc = Document(PAGE)
+    style = doc.first('style')
+    doc.splice([(style.inner_start, style.inner_end, 'a { color: blue; margin: 0; }')])
+    assert doc.inner(doc.first('style')) == 'a { color: blue; margin: 0; }'
+    assert doc.inner(doc.first('script')) == 'var x = 1;'
+    assert _regions(doc) == _regions(Document(doc.html))
+
+
+def test_splice_several_edits_in_any_order():
+    doc = Document(PAGE)
+    script = doc.first('script')
+    head = doc.first('head')
+    doc.splice([(script.inner_start, script.inner_end, 'var longer = 2;'),
+                (head.end, head.end, '<link rel="stylesheet" href="a.css">')])
+    assert doc.inner(doc.first('script')) == 'var longer = 2;'
+    assert doc.attrs(doc.first('link')) == {'rel': 'stylesheet', 'href': 'a.css'}
+    assert _regions(doc) == _regions(Document(doc.html))
+
+
+def test_splice_removing_an_element():
+    doc = Document(PAGE)
+    style = doc.first('style')
+    doc.splice([(style.start, style.end, '')])
+    assert doc.first('style') is None
+    assert doc.body_range() == Document(doc.html).body_range()
+    assert _regions(doc) == _regions(Document(doc.html))
+
+
+def test_splice_inside_raw_text_is_not_rescanned():
+    doc = Document(PAGE)
+    script = doc.first('script')
+    doc.splice([(script.inner_start, script.inner_end, 'var s = "<style>";')])
+    assert len(doc.find('style')) == 1
+    assert doc.inner(doc.first('script')) == 'var s = "<style>";'
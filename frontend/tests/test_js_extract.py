@@ -0,0 +1,23 @@
+import pytest
+
+from js_extract import split_functions
+
+SCRIPTS = [
+    'const x = 1;\nfunction a() { return {b: 1}; }\nasync function c(d) { await d; }\nx();',
+    'function f() {}\nfunction g() {}',
+    'const h = function () { return "function i() {}"; };\n/* function j() {} */',
+    'if (ok) { function k() {} }\nlet re = /function l() {}/;',
+    '',
+]
+
+
+@pytest.mark.parametrize('js', SCRIPTS)
+def test_split_functions_round_trip(js):
+    assert ''.join(text for _, text in split_functions(js)) == js
+
+
+def test_split_functions_names_top_level_declarations():
+    names = [name for name, _ in split_functions(SCRIPTS[0]) if name]
+    assert names == ['a', 'c']
+    assert [name for name, _ in split_functions(SCRIPTS[2]) if name] == []
+    assert [name for name, _ in split_functions(SCRIPTS[3]) if name] == []
@@ -0,0 +1,33 @@
+import pytest
+
+from minify import minify_js
+
+
+@pytest.mark.parametrize('js, expected', [
+    # A line break that may end a statement is kept (ASI).
+    ('var a = 1\nvar b = 2', 'var a=1\nvar b=2'),
+    ('return\nvalue', 'return\nvalue'),
+    ('a\n++b', 'a\n++b'),
+    ('a = b\n(c)', 'a=b\n(c)'),
+    # ... and dropped where it cannot.
+    ('call(a,\n     b)', 'call(a,b)'),
+    ('x = {\n  a: 1\n}', 'x={a:1}'),
+])
+def test_minify_js_keeps_statement_breaks(js, expected):
+    assert minify_js(js) == expected
+
+
+@pytest.mark.parametrize('js, expected', [
+    ('x = /ab+c/g.test(s)', 'x=/ab+c/g.test(s)'),
+    ('if (x) /re/.test(y)', 'if(x)/re/.test(y)'),
+    ('var r = /[/]/; // c', 'var r=/[/]/;'),
+    ('var r = /a\\/ b/;', 'var r=/a\\/ b/;'),
+    ('x = a / b / c', 'x=a/b/c'),
+])
+def test_minify_js_regex_literals(js, expected):
+    assert minify_js(js) == expected
+
+
+def test_minify_js_keeps_strings_and_templates():
+    js = "let s = 'a // b /* c */';\nlet t = `x  ${ y }  z`;"
+    assert minify_js(js) == "let s='a // b /* c */';let t=`x  ${ y }  z`;"
@@ -0,0 +1,52 @@
+import os
+
+import pytest
+
+import templating
+
+
+@pytest.fixture
+def templates(tmp_path, monkeypatch):
+    monkeypatch.setattr(templating, 'TEMPLATE_DIR', str(tmp_path / 'templates'))
+    monkeypatch.setattr(templating, 'CACHE_DIR', str(tmp_path / 'cache'))
+    monkeypatch.setattr(templating, '_compiled', {})
+    os.makedirs(templating.TEMPLATE_DIR)
+
+    def write(name, text):
+        with open(os.path.join(templating.TEMPLATE_DIR, name), 'w', encoding='utf-8') as f:
+            f.write(text)
+    return write
+
+
+def test_edited_template_is_recompiled(templates):
+    templates('page.html', 'Hello {{ who }}\n')
+    assert templating.render('page.html', who='a') == 'Hello a\n'
+    templates('page.html', 'Bye {{ who }}\n')
+    assert templating.render('page.html', who='a') == 'Bye a\n'
+    # Only the current version stays in the disk cache.
+    assert len(os.listdir(templating.CACHE_DIR)) == 1
+
+
+def test_edited_partial_is_recompiled(templates):
+    templates('page.html', '{% include "part.html" %}')
+    templates('part.html', 'one')
+    assert templating.render('page.html') == 'one'
+    templates('part.html', 'two')
+    assert templating.render('page.html') == 'two'
+
+
+def test_disk_cache_is_used_across_processes(templates, monkeypatch):
+    templates('page.html', '{{ 1 + 1 }}')
+    assert templating.render('page.html') == '2'
+    monkeypatch.setattr(templating, '_compiled', {})
+    monkeypatch.setattr(templating, 'compile_source', None)
+    assert templating.render('page.html') == '2'
+
+
+def test_engine_version_bump_invalidates_cache(templates, monkeypatch):
+    templates('page.html', 'x')
+    templating.render('page.html')
+    (old,) = os.listdir(templating.CACHE_DIR)
+    monkeypatch.setattr(templating, 'ENGINE_VERSION', templating.ENGINE_VERSION + 1)
+    assert templating.render('page.html') == 'x'
+    assert os.listdir(templating.CACHE_DIR) != [old]
@@ -1,126 +1,57 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
-
-# Read file
-with open('website-analyzer.html', 'r', encoding='utf-8') as f:
-    content = f.read()
-
-# Find CSS boundaries
-css_start = content.find('<style>') + 7  # Start after <style>
-css_end = content.find('</style>')
-
-# Keep everything before and after CSS
-before = content[:css_start]
-after = content[css_end:]
-
-# New CSS
-new_css = '''
+"""Patch the <style> block of a frontend page with ``css_patch``.
+
+``css_patch`` only lists the rules this script overrides or adds; they are
+merged rule by rule into the page's stylesheet (css_rules.patch_css), so
+rules added by the other generators survive and a re-run changes nothing.
+The page is streamed chunk by chunk through a small state machine, so only
+the style block is held in memory whatever the page size, and the result is
+written to a temp file that is renamed over the page only once it is
+complete.
+
+Usage:
+    python update_css.py                 # website-analyzer.html
+    python update_css.py "*.html"        # batch: every page, in a process pool
+    python update_css.py -j 4 a.html b.html
+"""
+
+import argparse
+import glob
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from build_engine import FRONTEND_DIR, atomic_open
+from css_rules import patch_css
+from document import _ATTR_RE, _CLOSE_RES, _MARKUP_RE, RAW_TAGS
+
+CHUNK_SIZE = 64 * 1024
+# Longest partial tag held back between chunks.
+MAX_TAG_SIZE = 4096
+# Longest closing tag ("</textarea >", "-->") that may straddle two chunks.
+MAX_CLOSE_SIZE = 16
+
+_COMMENT_END_RE = re.compile(r'-->')
+
+# Rules this script overrides or adds.  They are merged into the page's
+# stylesheet (css_rules.patch_css): declarations not named here, and rules
+# other generators added, are kept.  ``unset`` drops a declaration's effect.
+css_patch = '''
         :root {
-            --primary: #52b788;
-            --primary-dark: #1b4332;
-            --primary-soft: #b7e4c7;
-            --bg-body: #f7fffb;
-            --text-main: #2d6a4f;
-            --text-muted: #6b9080;
             --text-primary: #1b4332;
-            --glass-white: rgba(255, 255, 255, 0.8);
-            --border-soft: rgba(82, 183, 136, 0.15);
-            --success: #40916c;
-            --danger: #d62828;
-            --sidebar-width: 280px;
-        }
-
-        * {
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-            font-family: 'Plus Jakarta Sans', sans-serif;
         }
 
-        body {
-            background: linear-gradient(135deg, #f0fdf4 0%, #d1fae5 100%);
-            color: var(--text-main);
-            min-height: 100vh;
-            display: flex;
-            overflow-x: hidden;
-        }
-
-        /* ===== SIDEBAR ===== */
         .sidebar {
-            width: var(--sidebar-width);
-            height: 100vh;
-            background: white;
-            border-right: 1px solid var(--border-soft);
-            position: fixed;
-            display: flex;
-            flex-direction: column;
-            box-shadow: 0 10px 30px rgba(27, 67, 50, 0.08);
-            z-index: 1000;
-        }
-
-        .sidebar-brand {
-            padding: 2rem 1.5rem;
-            font-size: 1.4rem;
-            font-weight: 800;
-            color: var(--primary-dark);
-            display: flex;
-            align-items: center;
-            gap: 10px;
-            border-bottom: 1px solid var(--border-soft);
-        }
-
-        .sidebar-brand i {
-            font-size: 1.6rem;
-            color: var(--primary);
-        }
-
-        .sidebar-menu {
-            flex: 1;
-            padding: 1.5rem 0.8rem;
-            overflow-y: auto;
-        }
-
-        .menu-item {
-            display: flex;
-            align-items: center;
-            padding: 1rem 1.2rem;
-            color: var(--text-muted);
-            text-decoration: none;
-            border-radius: 12px;
-            margin-bottom: 0.5rem;
-            transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1);
-            font-weight: 500;
-            font-size: 0.95rem;
-        }
-
-        .menu-item i {
-            margin-right: 12px;
-            width: 20px;
-            text-align: center;
-            font-size: 1.1rem;
-        }
-
-        .menu-item:hover {
-            background: linear-gradient(135deg, rgba(82, 183, 136, 0.1), rgba(82, 183, 136, 0.05));
-            color: var(--primary);
-            transform: translateX(5px);
+            overflow-y: unset;
         }
 
         .menu-item.active {
-            background: linear-gradient(135deg, var(--primary), var(--success));
-            color: white;
             box-shadow: 0 4px 12px rgba(82, 183, 136, 0.3);
         }
 
-        /* ===== MAIN CONTENT ===== */
-        .main-content {
-            flex: 1;
-            margin-left: var(--sidebar-width);
-            padding: 2rem;
-            max-width: calc(100vw - var(--sidebar-width));
-            overflow-x: hidden;
-        }
-
         .page-header {
             margin-bottom: 3rem;
         }
@@ -132,102 +63,47 @@ new_css = '''
             -webkit-background-clip: text;
             -webkit-text-fill-color: transparent;
             margin: 0 0 0.5rem 0;
+            color: unset;
         }
 
         .page-subtitle {
-            color: var(--text-muted);
             font-size: 1rem;
             margin: 0;
+            margin-top: unset;
         }
 
-        /* ===== SEARCH CARD ===== */
         .search-card {
-            display: flex;
-            gap: 1rem;
             margin-bottom: 3rem;
             background: linear-gradient(135deg, rgba(255, 255, 255, 0.8), rgba(255, 255, 255, 0.6));
-            backdrop-filter: blur(10px);
-            padding: 1.5rem;
-            border-radius: 16px;
-            border: 1px solid rgba(255, 255, 255, 0.5);
             box-shadow: 0 8px 32px rgba(0, 0, 0, 0.08);
         }
 
-        .search-input {
-            flex: 1;
-            padding: 1rem 1.5rem;
-            border: 2px solid transparent;
-            border-radius: 12px;
-            background: rgba(255, 255, 255, 0.7);
-            font-size: 1rem;
-            font-family: inherit;
-            transition: all 0.3s ease;
-        }
-
-        .search-input:focus {
-            outline: none;
-            background: white;
-            border-color: var(--primary);
-            box-shadow: 0 4px 16px rgba(82, 183, 136, 0.15);
-        }
-
         .search-btn {
-            padding: 1rem 2rem;
             background: linear-gradient(135deg, var(--primary), #2d7a5e);
-            color: white;
-            border: none;
-            border-radius: 12px;
             font-size: 1.1rem;
-            cursor: pointer;
-            transition: all 0.3s ease;
-            box-shadow: 0 4px 16px rgba(82, 183, 136, 0.3);
-            white-space: nowrap;
+            font-weight: unset;
         }
 
-        .search-btn:hover {
-            transform: translateY(-2px);
-            box-shadow: 0 8px 24px rgba(82, 183, 136, 0.4);
-        }
-
-        /* ===== LOADING STATE ===== */
         .loading-container {
-            text-align: center;
-            padding: 4rem 2rem;
             background: linear-gradient(135deg, rgba(255, 255, 255, 0.8), rgba(255, 255, 255, 0.6));
-            backdrop-filter: blur(10px);
-            border-radius: 16px;
-            border: 1px solid rgba(255, 255, 255, 0.5);
+            box-shadow: unset;
         }
 
         .loading-container p {
             margin-top: 1.5rem;
-            color: var(--text-muted);
-            font-weight: 500;
         }
 
         .spinner {
-            width: 50px;
-            height: 50px;
-            border: 4px solid rgba(82, 183, 136, 0.2);
-            border-top-color: var(--primary);
-            border-radius: 50%;
-            animation: spin 0.8s linear infinite;
             margin: 0 auto;
         }
 
-        @keyframes spin {
-            to { transform: rotate(360deg); }
-        }
-
-        /* ===== INFO CARD ===== */
         .info-card {
             background: linear-gradient(135deg, #ffffff 0%, rgba(255, 255, 255, 0.95) 100%);
             border: 1px solid rgba(82, 183, 136, 0.2);
             border-radius: 16px;
-            padding: 2rem;
-            margin-bottom: 2rem;
             box-shadow: 0 8px 32px rgba(0, 0, 0, 0.06);
             backdrop-filter: blur(10px);
+            color: unset;
         }
 
         .info-card-header h2 {
@@ -245,48 +121,22 @@ new_css = '''
         }
 
         .info-stats {
-            display: grid;
-            grid-template-columns: repeat(3, 1fr);
-            gap: 2rem;
-            margin-top: 2rem;
-            padding-top: 2rem;
             border-top: 1px solid rgba(82, 183, 136, 0.1);
         }
 
-        .stat-item {
-            text-align: center;
-        }
-
         .stat-number {
-            font-size: 2.5rem;
-            font-weight: 900;
             background: linear-gradient(135deg, var(--primary), #2d7a5e);
             -webkit-background-clip: text;
             -webkit-text-fill-color: transparent;
+            margin-bottom: unset;
         }
 
         .stat-label {
             color: var(--text-muted);
-            font-size: 0.9rem;
             margin-top: 0.5rem;
-            font-weight: 600;
-        }
-
-        /* ===== CONTENT GRID ===== */
-        .content-grid {
-            display: grid;
-            grid-template-columns: 1fr 1fr;
-            gap: 2rem;
-            margin-bottom: 2rem;
-        }
-
-        .content-column {
-            display: flex;
-            flex-direction: column;
-            gap: 2rem;
+            opacity: unset;
         }
 
-        /* ===== SECTION BLOCK ===== */
         .section-block {
             background: linear-gradient(135deg, #ffffff 0%, rgba(255, 255, 255, 0.98) 100%);
             border: 1px solid rgba(0, 0, 0, 0.05);
@@ -294,30 +144,20 @@ new_css = '''
             padding: 2rem;
             box-shadow: 0 4px 16px rgba(0, 0, 0, 0.05);
             transition: all 0.3s ease;
+            backdrop-filter: unset;
         }
 
         .section-block:hover {
             box-shadow: 0 8px 32px rgba(0, 0, 0, 0.08);
             border-color: rgba(82, 183, 136, 0.15);
-        }
-
-        .section-block.sticky-top {
-            position: sticky;
-            top: 2rem;
+            transform: unset;
         }
 
         .section-title {
-            display: flex;
-            align-items: center;
-            gap: 0.75rem;
-            margin-bottom: 1.5rem;
-            padding-bottom: 1rem;
             border-bottom: 2px solid rgba(82, 183, 136, 0.1);
-        }
-
-        .section-title i {
-            font-size: 1.3rem;
-            color: var(--primary);
+            font-size: unset;
+            font-weight: unset;
+            color: unset;
         }
 
         .section-title h3 {
@@ -327,28 +167,9 @@ new_css = '''
             margin: 0;
         }
 
-        /* ===== FEATURES GRID ===== */
-        .features-grid {
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(150px, 1fr));
-            gap: 1rem;
-        }
-
         .feature-item {
-            background: linear-gradient(135deg, rgba(82, 183, 136, 0.08), rgba(82, 183, 136, 0.03));
-            border: 1px solid rgba(82, 183, 136, 0.2);
             border-radius: 12px;
-            padding: 1rem;
-            text-align: center;
             transition: all 0.3s ease;
-            cursor: pointer;
-        }
-
-        .feature-item:hover {
-            background: linear-gradient(135deg, rgba(82, 183, 136, 0.15), rgba(82, 183, 136, 0.08));
-            border-color: var(--primary);
-            transform: translateY(-4px);
-            box-shadow: 0 8px 16px rgba(82, 183, 136, 0.15);
         }
 
         .feature-item-icon {
@@ -362,32 +183,22 @@ new_css = '''
             color: var(--text-primary);
         }
 
-        /* ===== TEST CASES GRID ===== */
-        .test-cases-grid {
-            display: grid;
-            grid-template-columns: 1fr;
-            gap: 1rem;
-        }
-
         .test-case-item {
             background: linear-gradient(135deg, rgba(59, 130, 246, 0.05), rgba(59, 130, 246, 0.02));
             border: 1px solid rgba(59, 130, 246, 0.15);
             border-radius: 12px;
-            padding: 1.25rem;
             transition: all 0.3s ease;
         }
 
         .test-case-item:hover {
             background: linear-gradient(135deg, rgba(59, 130, 246, 0.1), rgba(59, 130, 246, 0.05));
             border-color: #3b82f6;
-            transform: translateX(4px);
+            box-shadow: unset;
         }
 
         .test-case-title {
-            font-weight: 700;
             color: var(--text-primary);
-            margin: 0;
-            margin-bottom: 0.5rem;
+            font-size: unset;
         }
 
         .test-case-description {
@@ -396,46 +207,29 @@ new_css = '''
             margin: 0;
         }
 
-        /* ===== ACTION BUTTONS ===== */
         .action-buttons {
-            display: grid;
-            gap: 0.75rem;
+            grid-template-columns: unset;
         }
 
         .btn-action {
-            padding: 1rem;
-            border: none;
-            border-radius: 12px;
-            font-size: 0.95rem;
-            font-weight: 700;
-            cursor: pointer;
-            display: flex;
-            align-items: center;
-            justify-content: center;
-            gap: 0.5rem;
             transition: all 0.3s ease;
+            text-decoration: unset;
         }
 
         .btn-action.primary {
             background: linear-gradient(135deg, var(--primary), #2d7a5e);
-            color: white;
-            box-shadow: 0 4px 16px rgba(82, 183, 136, 0.3);
-        }
-
-        .btn-action.primary:hover {
-            transform: translateY(-2px);
-            box-shadow: 0 8px 24px rgba(82, 183, 136, 0.4);
         }
 
         .btn-action.secondary {
             background: linear-gradient(135deg, #3b82f6, #1d4ed8);
             color: white;
             box-shadow: 0 4px 16px rgba(59, 130, 246, 0.3);
+            border: unset;
         }
 
         .btn-action.secondary:hover {
-            transform: translateY(-2px);
             box-shadow: 0 8px 24px rgba(59, 130, 246, 0.4);
+            background: unset;
         }
 
         .btn-action.tertiary {
@@ -449,18 +243,8 @@ new_css = '''
             box-shadow: 0 8px 24px rgba(139, 92, 246, 0.4);
         }
 
-        /* ===== RESULTS ===== */
-        .results-summary {
-            display: grid;
-            grid-template-columns: 1fr 1fr;
-            gap: 1rem;
-            margin-bottom: 1.5rem;
-        }
-
         .result-box {
-            padding: 1.25rem;
             border-radius: 12px;
-            text-align: center;
         }
 
         .result-box.success {
@@ -475,7 +259,7 @@ new_css = '''
 
         .result-number {
             font-size: 2rem;
-            font-weight: 900;
+            margin-bottom: unset;
         }
 
         .result-box.success .result-number {
@@ -486,37 +270,11 @@ new_css = '''
             color: #ef4444;
         }
 
-        .result-label {
-            color: var(--text-muted);
-            font-size: 0.9rem;
-            margin-top: 0.5rem;
-            font-weight: 600;
-        }
-
         .result-rate {
-            background: linear-gradient(135deg, rgba(82, 183, 136, 0.1), rgba(82, 183, 136, 0.05));
             border-radius: 12px;
-            padding: 1.5rem;
-            text-align: center;
-            border: 1px solid rgba(82, 183, 136, 0.2);
-            margin-bottom: 1.5rem;
-        }
-
-        .rate-number {
-            font-size: 2.5rem;
-            font-weight: 900;
-            color: var(--primary);
-        }
-
-        .rate-label {
-            color: var(--text-muted);
-            font-size: 0.9rem;
-            margin-top: 0.5rem;
-            font-weight: 600;
         }
 
         .results-list {
-            display: grid;
             gap: 0.75rem;
         }
 
@@ -531,206 +289,57 @@ new_css = '''
             gap: 0.5rem;
         }
 
-        /* ===== EXPORT BUTTONS ===== */
         .export-buttons {
-            display: grid;
-            gap: 0.75rem;
+            grid-template-columns: unset;
         }
 
         .btn-export {
-            padding: 0.75rem;
             background: linear-gradient(135deg, rgba(59, 130, 246, 0.1), rgba(59, 130, 246, 0.05));
             border: 1px solid rgba(59, 130, 246, 0.2);
             border-radius: 10px;
             color: #3b82f6;
-            font-weight: 700;
-            cursor: pointer;
             transition: all 0.3s ease;
-            display: flex;
-            align-items: center;
-            justify-content: center;
-            gap: 0.5rem;
         }
 
         .btn-export:hover {
             background: linear-gradient(135deg, rgba(59, 130, 246, 0.15), rgba(59, 130, 246, 0.08));
             border-color: #3b82f6;
-            transform: translateY(-2px);
         }
 
-        /* ===== CUSTOM TESTS TABS ===== */
         .custom-tabs {
-            display: flex;
-            gap: 1rem;
-            margin-bottom: 1.5rem;
             border-bottom: 2px solid rgba(82, 183, 136, 0.1);
         }
 
         .tab-button {
-            padding: 0.75rem 1rem;
-            background: none;
-            border: none;
-            color: var(--text-muted);
-            font-weight: 700;
-            cursor: pointer;
-            transition: all 0.3s ease;
-            border-bottom: 2px solid transparent;
-            margin-bottom: -2px;
-            display: flex;
-            align-items: center;
-            gap: 0.5rem;
-        }
-
-        .tab-button.active {
-            color: var(--primary);
-            border-bottom-color: var(--primary);
+            font-size: unset;
         }
 
         .tab-button:hover:not(.active) {
             color: var(--text-primary);
         }
 
-        .tab-pane {
-            display: none;
-        }
-
-        .tab-pane.active {
-            display: block;
-            animation: fadeIn 0.3s ease;
-        }
-
-        @keyframes fadeIn {
-            from { opacity: 0; transform: translateY(10px); }
-            to { opacity: 1; transform: translateY(0); }
-        }
-
-        /* ===== FORM ELEMENTS ===== */
-        .custom-form {
-            display: grid;
-            gap: 1.5rem;
-        }
-
-        .form-row {
-            display: grid;
-            grid-template-columns: 1fr 1fr 1fr;
-            gap: 1rem;
-        }
-
-        .form-group {
-            display: grid;
-            gap: 0.5rem;
-        }
-
         .form-group label {
-            font-weight: 700;
             color: var(--text-primary);
-            font-size: 0.9rem;
         }
 
         .form-group input,
         .form-group select,
         .form-group textarea {
-            padding: 0.75rem 1rem;
             border: 1px solid rgba(0, 0, 0, 0.1);
             border-radius: 8px;
-            font-size: 0.95rem;
-            font-family: inherit;
-            transition: all 0.3s ease;
-        }
-
-        .form-group input:focus,
-        .form-group select:focus,
-        .form-group textarea:focus {
-            outline: none;
-            border-color: var(--primary);
-            background: linear-gradient(135deg, rgba(255, 255, 255, 1), rgba(255, 255, 255, 0.95));
-            box-shadow: 0 4px 12px rgba(82, 183, 136, 0.15);
-        }
-
-        .form-group textarea {
-            resize: vertical;
-            min-height: 100px;
         }
 
         .btn-submit {
-            padding: 0.75rem 1.5rem;
             background: linear-gradient(135deg, var(--primary), #2d7a5e);
-            color: white;
-            border: none;
             border-radius: 10px;
-            font-weight: 700;
-            cursor: pointer;
             transition: all 0.3s ease;
-            display: flex;
-            align-items: center;
-            justify-content: center;
-            gap: 0.5rem;
-        }
-
-        .btn-submit:hover {
-            transform: translateY(-2px);
-            box-shadow: 0 8px 20px rgba(82, 183, 136, 0.3);
-        }
-
-        /* ===== FULL WIDTH ===== */
-        .full-width {
-            grid-column: 1 / -1;
-        }
-
-        /* ===== UTILITY CLASSES ===== */
-        .hidden {
-            display: none !important;
-        }
-
-        /* ===== RESPONSIVE ===== */
-        @media (max-width: 1024px) {
-            .content-grid {
-                grid-template-columns: 1fr;
-            }
-
-            .info-stats {
-                grid-template-columns: repeat(3, 1fr);
-                gap: 1rem;
-            }
-
-            .form-row {
-                grid-template-columns: 1fr;
-            }
-
-            .section-block.sticky-top {
-                position: static;
-            }
         }
 
         @media (max-width: 768px) {
-            .main-content {
-                padding: 1rem;
-                margin-left: 0;
-            }
-
             .sidebar {
-                width: 100%;
-                height: auto;
-                position: relative;
-                border-right: none;
-                border-bottom: 1px solid var(--border-soft);
-                flex-direction: row;
-                align-items: center;
-                padding: 1rem;
                 margin-bottom: 1rem;
             }
 
-            .sidebar-brand {
-                padding: 0;
-                border: none;
-                margin-bottom: 0;
-                margin-right: auto;
-            }
-
-            .sidebar-menu {
-                display: none;
-            }
-
             .page-title {
                 font-size: 2rem;
             }
@@ -739,60 +348,194 @@ new_css = '''
                 font-size: 0.9rem;
             }
 
-            .search-card {
-                flex-direction: column;
-            }
-
             .search-input,
             .search-btn {
                 width: 100%;
             }
 
-            .info-stats {
-                gap: 0.75rem;
-            }
-
             .stat-number {
                 font-size: 1.8rem;
             }
-
-            .features-grid {
-                grid-template-columns: repeat(auto-fit, minmax(100px, 1fr));
-            }
         }
 
         @media (max-width: 480px) {
-            .main-content {
-                padding: 0.75rem;
-            }
-
             .page-title {
                 font-size: 1.5rem;
             }
 
-            .search-card {
-                padding: 1rem;
-                gap: 0.5rem;
-            }
-
-            .section-block {
-                padding: 1rem;
-            }
-
-            .info-card {
-                padding: 1rem;
-            }
-
             .info-stats {
-                grid-template-columns: 1fr;
+                gap: unset;
             }
         }
     '''
 
-# Combine and write
-new_content = before + new_css + after
-with open('website-analyzer.html', 'w', encoding='utf-8') as f:
-    f.write(new_content)
 
-print("✅ CSS updated successfully!")
-print(f"New file size: {len(new_content)} bytes")
+class _Unchanged(Exception):
+    """Raised inside the atomic write to discard an identical rewrite."""
+
+
+def _plain_style(attrs):
+    """Whether a <style> tag with attribute text ``attrs`` applies to every
+    medium: one with a media query (or any other attribute) is left alone."""
+    names = {m.group(1).lower(): next((v for v in m.groups()[1:] if v is not None), '')
+             for m in _ATTR_RE.finditer(attrs)}
+    return not names or names == {'type': 'text/css'}
+
+
+def patch_style_block(path, patch, dest=None, chunk_size=CHUNK_SIZE):
+    """Stream ``path`` into ``dest`` (default: in place) with ``patch``
+    merged into its first plain <style> block.
+
+    The block is picked the way Document sees the page: comments and the
+    contents of <script> and other raw-text elements are skipped, and so
+    are <style> blocks with a media (or any other) attribute.
+
+    Returns ``(bytes_before, bytes_after, changed)``.  When rewriting in place
+    and the patch is already applied, the page is not touched.  Raises
+    ValueError when the page has no complete <style> block; the destination
+    is then left untouched.
+    """
+    dest = dest or path
+    size_before = os.path.getsize(path)
+    state = 'before'
+    buf = ''
+    searched = 0  # how far ``buf`` was searched for the closing tag
+    skip_re = None  # closing tag of the comment / element being skipped
+
+    try:
+        with open(path, 'r', encoding='utf-8', newline='') as src, atomic_open(dest) as out:
+            for chunk in iter(lambda: src.read(chunk_size), ''):
+                buf += chunk
+                while state in ('before', 'skip'):
+                    if state == 'skip':
+                        # Skipped markup is passed through up to its closing tag.
+                        match = skip_re.search(buf, searched)
+                        if not match:
+                            cut = max(0, len(buf) - MAX_CLOSE_SIZE)
+                            out.write(buf[:cut])
+                            buf = buf[cut:]
+                            searched = 0
+                            break
+                        out.write(buf[:match.end()])
+                        buf = buf[match.end():]
+                        searched = 0
+                        state = 'before'
+                    match = _MARKUP_RE.search(buf)
+                    if match is None:
+                        # Hold back a possibly incomplete tag for the next chunk.
+                        cut = buf.rfind('<')
+                        if cut == -1 or '>' in buf[cut:] or len(buf) - cut > MAX_TAG_SIZE:
+                            cut = len(buf)
+                        out.write(buf[:cut])
+                        buf = buf[cut:]
+                        break
+                    tag = match.group(2) and match.group(2).lower()
+                    if tag is None:
+                        if match.group().endswith('-->'):
+                            out.write(buf[:match.end()])
+                            buf = buf[match.end():]
+                            continue
+                        # A comment still open at the end of the chunk
+                        out.write(buf[:match.start() + 4])
+                        buf = buf[match.start() + 4:]
+                        skip_re, state = _COMMENT_END_RE, 'skip'
+                        continue
+                    out.write(buf[:match.end()])
+                    buf = buf[match.end():]
+                    if match.group(1) or tag not in RAW_TAGS:
+                        continue
+                    if tag == 'style' and _plain_style(match.group(3)):
+                        state = 'inside'
+                    else:
+                        skip_re, state = _CLOSE_RES[tag], 'skip'
+                if state == 'inside':
+                    # The old CSS is kept until </style>, then merged.
+                    match = _CLOSE_RES['style'].search(buf, searched)
+                    if match:
+                        old = buf[:match.start()]
+                        css = patch_css(old, patch)
+                        if css is old and dest == path:
+                            raise _Unchanged()
+                        out.write(css)
+                        buf = buf[match.start():]
+                        state = 'after'
+                    else:
+                        searched = max(0, len(buf) - MAX_CLOSE_SIZE)
+                if state == 'after':
+                    out.write(buf)
+                    buf = ''
+            if state != 'after':
+                raise ValueError(f"{path}: no complete <style> block found")
+    except _Unchanged:
+        return size_before, size_before, False
+    return size_before, os.path.getsize(dest), True
+
+
+def _update_page(path):
+    """Process-pool worker: restyle one page and report what happened."""
+    started = time.perf_counter()
+    result = {'page': path, 'before': None, 'after': None, 'changed': False, 'error': None}
+    try:
+        result['before'], result['after'], result['changed'] = patch_style_block(path, css_patch)
+    except (OSError, ValueError) as e:
+        result['error'] = str(e)
+    result['ms'] = (time.perf_counter() - started) * 1000
+    return result
+
+
+def resolve_pages(patterns):
+    """Expand page paths / glob patterns (relative to frontend/) to files."""
+    pages = []
+    for pattern in patterns:
+        if not os.path.isabs(pattern) and not os.path.exists(pattern):
+            pattern = os.path.join(FRONTEND_DIR, pattern)
+        matches = sorted(glob.glob(pattern)) if glob.has_magic(pattern) else [pattern]
+        pages.extend(p for p in matches if p not in pages)
+    return pages
+
+
+def update_pages(pages, jobs=None):
+    """Restyle ``pages`` in parallel; returns per-page results in input order."""
+    if len(pages) <= 1 or jobs == 1:
+        return [_update_page(p) for p in pages]
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        return list(pool.map(_update_page, pages))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Apply update_css.py's stylesheet patch to frontend pages")
+    parser.add_argument('pages', nargs='*', default=['website-analyzer.html'],
+                        help='pages or glob patterns relative to frontend/, e.g. "*.html" '
+                             '(default: website-analyzer.html)')
+    parser.add_argument('-j', '--jobs', type=int, default=None,
+                        help='worker processes for batch mode (default: CPU count)')
+    args = parser.parse_args(argv)
+
+    pages = resolve_pages(args.pages)
+    if not pages:
+        print('❌ No pages matched')
+        return 1
+
+    started = time.perf_counter()
+    results = update_pages(pages, jobs=args.jobs)
+    elapsed = (time.perf_counter() - started) * 1000
+
+    failed = 0
+    for r in results:
+        name = os.path.relpath(r['page'], FRONTEND_DIR)
+        if r['error']:
+            failed += 1
+            print(f"❌ {name}: {r['error']}")
+        else:
+            mark = 'updated' if r['changed'] else 'unchanged'
+            print(f"{'✅' if r['changed'] else '➖'} {name}: {r['before']} -> {r['after']} bytes, "
+                  f"{mark} ({r['ms']:.1f} ms)")
+
+    changed = sum(1 for r in results if r['changed'])
+    print(f"CSS applied to {len(results) - failed}/{len(results)} pages "
+          f"({changed} changed) in {elapsed:.1f} ms")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
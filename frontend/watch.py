@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Watch mode: rebuild pages as their inputs change.
+
+Watches the generator scripts and pages in frontend/, the templates/ the
+generators render, design-tokens.json (recompiled to css/tokens.css) and
+the static directories (css/, js/, assets/).  Linux uses inotify (through
+ctypes, no extra package); elsewhere the files are stat-polled every
+POLL_INTERVAL.
+Bursts of saves are debounced into one rebuild, and only the pages whose
+generator, page file or templates changed are rebuilt (in parallel when a
+shared partial affects several pages).
+
+Each rebuild produces a live-reload event for ``serve.py --watch``:
+
+* ``css``: only inline <style> blocks and/or stylesheets changed; the
+  browser swaps them in place without reloading;
+* ``reload``: anything else.
+
+With ``dist=True`` the dist build is re-run as well and every change is a
+full reload (dist assets are fingerprinted, so there is nothing to swap).
+
+Usage:
+    python build_engine.py --watch [--dist]   # rebuild only
+    python serve.py --watch [--dist]          # rebuild + live reload
+"""
+
+import asyncio
+import ctypes
+import ctypes.util
+import os
+import struct
+import time
+
+from build_engine import (FRONTEND_DIR, PAGE_GENERATORS, STATIC_DIRS, BuildError,
+                          Manifest, _stat_key, build_dist, build_pages, page_path, pages_using)
+import design_tokens
+from document import Document
+
+DEBOUNCE = 0.03
+POLL_INTERVAL = 0.1
+# Sub-directories watched recursively.
+WATCHED_DIRS = STATIC_DIRS + ('templates',)
+
+_IN_CLOSE_WRITE = 0x008
+_IN_MOVED_FROM = 0x040
+_IN_MOVED_TO = 0x080
+_IN_CREATE = 0x100
+_IN_DELETE = 0x200
+_IN_ISDIR = 0x40000000
+_IN_MASK = _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE
+_IN_EVENT = struct.Struct('iIII')
+
+
+def _relevant(path):
+    """Files whose change can affect a build (no editor swap files ...)."""
+    name = os.path.basename(path)
+    if name.startswith('.') or name.endswith(('~', '.swp', '.tmp')):
+        return False
+    rel = os.path.relpath(path, FRONTEND_DIR)
+    if os.sep not in rel:
+        return name.endswith(('.py', '.html')) or name == os.path.basename(design_tokens.TOKENS_PATH)
+    return rel.split(os.sep)[0] in WATCHED_DIRS
+
+
+def _watched_dirs():
+    yield FRONTEND_DIR
+    for directory in WATCHED_DIRS:
+        for root, dirs, _ in os.walk(os.path.join(FRONTEND_DIR, directory)):
+            dirs[:] = [d for d in dirs if not d.startswith('.')]
+            yield root
+
+
+def snapshot():
+    """``{path: stat}`` of every watched file."""
+    files = {}
+    for directory in _watched_dirs():
+        try:
+            names = os.listdir(directory)
+        except FileNotFoundError:
+            continue
+        for name in names:
+            path = os.path.join(directory, name)
+            if _relevant(path) and os.path.isfile(path):
+                files[path] = _stat_key(path)
+    return files
+
+
+class _Watcher:
+    """Collects changed paths; ``changes()`` yields them in debounced batches."""
+
+    def __init__(self):
+        self._pending = set()
+        self._event = asyncio.Event()
+
+    def _add(self, path):
+        if _relevant(path):
+            self._pending.add(path)
+            self._event.set()
+
+    async def changes(self):
+        while True:
+            await self._event.wait()
+            # Wait until no new event arrived for DEBOUNCE seconds.
+            while True:
+                self._event.clear()
+                try:
+                    await asyncio.wait_for(self._event.wait(), DEBOUNCE)
+                except asyncio.TimeoutError:
+                    break
+            batch, self._pending = self._pending, set()
+            yield batch
+
+    def close(self):
+        pass
+
+
+class InotifyWatcher(_Watcher):
+
+    def __init__(self):
+        super().__init__()
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+        self._dirs = {}
+        for directory in _watched_dirs():
+            self._watch(directory)
+        asyncio.get_running_loop().add_reader(self._fd, self._read)
+
+    def _watch(self, directory):
+        wd = self._add_watch(self._fd, os.fsencode(directory), _IN_MASK)
+        if wd >= 0:
+            self._dirs[wd] = directory
+
+    def _read(self):
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = _IN_EVENT.unpack_from(data, offset)
+            offset += _IN_EVENT.size
+            name = os.fsdecode(data[offset:offset + length].rstrip(b'\0'))
+            offset += length
+            directory = self._dirs.get(wd)
+            if directory is None or not name:
+                continue
+            path = os.path.join(directory, name)
+            if mask & _IN_ISDIR:
+                # New sub-directory of a static dir: watch it too.
+                if mask & _IN_CREATE and directory != FRONTEND_DIR:
+                    self._watch(path)
+                continue
+            self._add(path)
+
+    def close(self):
+        asyncio.get_running_loop().remove_reader(self._fd)
+        os.close(self._fd)
+
+
+class PollingWatcher(_Watcher):
+
+    def __init__(self):
+        super().__init__()
+        self._files = snapshot()
+        self._task = asyncio.get_running_loop().create_task(self._poll())
+
+    async def _poll(self):
+        while True:
+            await asyncio.sleep(POLL_INTERVAL)
+            files = snapshot()
+            for path in set(files) | set(self._files):
+                if files.get(path) != self._files.get(path):
+                    self._add(path)
+            self._files = files
+
+    def close(self):
+        self._task.cancel()
+
+
+def open_watcher():
+    """inotify when the platform has it, else stat polling."""
+    try:
+        return InotifyWatcher()
+    except (OSError, AttributeError):
+        return PollingWatcher()
+
+
+class LiveBuild:
+    """Turns batches of changed paths into rebuilds and live-reload events."""
+
+    def __init__(self, dist=False):
+        self.dist = dist
+        self.manifest = Manifest()
+        # Last stat handled per path: events for files we wrote ourselves,
+        # or that were saved without a change, are dropped.
+        self.seen = snapshot()
+
+    def _really_changed(self, path):
+        stat = _stat_key(path)
+        if self.seen.get(path) == stat:
+            return False
+        self.seen[path] = stat
+        return True
+
+    def rebuild(self, changed):
+        """Rebuild what ``changed`` affects; returns an event dict or None."""
+        pages, static, other = set(), [], []
+        for path in sorted(p for p in changed if self._really_changed(p)):
+            rel = os.path.relpath(path, FRONTEND_DIR).replace(os.sep, '/')
+            if rel.startswith('templates/'):
+                pages.update(pages_using(self.manifest, rel))
+            elif path == design_tokens.TOKENS_PATH:
+                if design_tokens.write_tokens_css():
+                    tokens_css = os.path.join(FRONTEND_DIR, design_tokens.TOKENS_CSS)
+                    self.seen[tokens_css] = _stat_key(tokens_css)
+                    static.append(design_tokens.TOKENS_CSS)
+                    print(f"🎨 {design_tokens.TOKENS_CSS} regenerated")
+            elif '/' in rel:
+                static.append(rel)
+            elif rel.endswith('.html'):
+                pages.add(rel)
+            else:
+                owned = pages_using(self.manifest, rel)
+                pages.update(owned)
+                if not owned:
+                    other.append(rel)
+        if not (pages or static or other):
+            return None
+
+        units = {}
+        # Skip deleted hand-written pages.
+        pages = sorted(p for p in pages if p in PAGE_GENERATORS or os.path.exists(page_path(p)))
+        for page, status, changed_units in build_pages(pages, self.manifest):
+            self.seen[page_path(page)] = _stat_key(page_path(page))
+            if changed_units:
+                units[page] = changed_units
+                print(f"🔨 {page}: {status} ({', '.join(changed_units)})")
+        self.manifest.save()
+        for rel in other:
+            # Shared modules (build_engine.py, the stages ...) are imported
+            # once; picking up their changes needs a restart.
+            print(f"ℹ️  {rel} changed; restart watch mode to use it")
+
+        if self.dist:
+            written, removed = build_dist(self.manifest)
+            self.manifest.save()
+            if written or removed:
+                print(f"📦 dist: {len(written)} written, {len(removed)} removed")
+                return {'type': 'reload'}
+            return None
+
+        if not units and not static:
+            return None
+        if all(set(changed_units) == {'style'} for changed_units in units.values()) \
+                and all(rel.endswith('.css') for rel in static):
+            styles = {}
+            for page in units:
+                with open(page_path(page), 'r', encoding='utf-8') as f:
+                    doc = Document(f.read())
+                styles[page] = [doc.inner(el) for el in doc.find('style')]
+            return {'type': 'css', 'styles': styles, 'sheets': static}
+        return {'type': 'reload'}
+
+
+async def watch(dist=False, notify=None):
+    """Rebuild on every change until cancelled; ``notify(event)`` is called
+    with each live-reload event."""
+    live = LiveBuild(dist)
+    watcher = open_watcher()
+    kind = 'inotify' if isinstance(watcher, InotifyWatcher) else f'polling every {POLL_INTERVAL * 1000:.0f} ms'
+    print(f"👀 Watching {os.path.basename(FRONTEND_DIR)}/ ({kind})")
+    try:
+        async for batch in watcher.changes():
+            started = time.perf_counter()
+            try:
+                event = live.rebuild(batch)
+            except BuildError as e:
+                print(f"❌ Build failed: {e}")
+                continue
+            except Exception as e:  # a broken generator must not stop the loop
+                print(f"❌ Rebuild error: {type(e).__name__}: {e}")
+                continue
+            if event is None:
+                continue
+            print(f"✅ Rebuilt in {(time.perf_counter() - started) * 1000:.1f} ms ({event['type']})")
+            if notify:
+                notify(event)
+    finally:
+        watcher.close()